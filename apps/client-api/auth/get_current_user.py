@@ -3,11 +3,17 @@ from urllib.parse import unquote
 from fastapi import Request, HTTPException
 from models.Auth import authmeschema
 from jwt_handler import decode_jwt_token  # Import the decoder
+from auth.session_cache import session_cache
 
 async def get_current_user(request: Request) -> authmeschema:
     cookie_str = request.cookies.get("token")
     if not cookie_str:
         raise HTTPException(status_code=401, detail="Not authenticated")
+
+    # Same cookie verified recently and its token hasn't expired
+    cached = session_cache.get(cookie_str)
+    if cached is not None:
+        return cached
     
     try:
         # 1. Decode the URL-encoded JSON string
@@ -26,6 +32,7 @@ async def get_current_user(request: Request) -> authmeschema:
         if payload.get("sub") != user_session.email:
             raise HTTPException(status_code=401, detail="Token mismatch")
 
+        session_cache.put(cookie_str, user_session, payload.get("exp"))
         return user_session
         
     except Exception:
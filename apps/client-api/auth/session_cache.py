@@ -0,0 +1,87 @@
+# apps/client-api/auth/session_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from config.env import settings
+from models.Auth import authmeschema
+
+
+class SessionCache:
+    """
+    Bounded LRU of already-verified sessions, keyed by a hash of the raw
+    cookie. An entry lives until the token's `exp` (capped at max_ttl), so
+    repeat requests skip JSON parsing, schema validation and the JWT
+    signature check. Only successful verifications are cached.
+    """
+
+    def __init__(self, max_size: int, max_ttl: float):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[authmeschema, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(cookie: str) -> str:
+        return hashlib.sha256(cookie.encode("utf-8")).hexdigest()
+
+    def get(self, cookie: str) -> Optional[authmeschema]:
+        key = self._key(cookie)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            session, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return session
+
+    def put(self, cookie: str, session: authmeschema, token_exp: Optional[float]):
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.max_ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        key = self._key(cookie)
+        with self._lock:
+            self._entries[key] = (session, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, cookie: str):
+        with self._lock:
+            self._entries.pop(self._key(cookie), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+session_cache = SessionCache(settings.SESSION_CACHE_SIZE, settings.SESSION_CACHE_MAX_TTL_SECONDS)
@@ -0,0 +1,76 @@
+"""
+Microbenchmark for get_current_user.
+
+Times the per-request auth cost for a valid session cookie with the
+verified-session cache cold (parse + validate + JWT verify every time)
+and warm (cache hit).
+
+Usage (from apps/client-api):
+    python benchmarks/auth_benchmark.py --iterations 20000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from urllib.parse import quote
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.requests import Request  # noqa: E402
+
+from auth.get_current_user import get_current_user  # noqa: E402
+from auth.session_cache import session_cache  # noqa: E402
+from jwt_handler import create_jwt_token  # noqa: E402
+from models.Auth import authmeschema  # noqa: E402
+
+
+def _request(cookie: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/auth/me",
+        "headers": [(b"cookie", f"token={cookie}".encode("latin-1"))],
+    })
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _measure(request: Request, iterations: int, clear: bool):
+    samples = []
+    for _ in range(iterations):
+        if clear:
+            session_cache.clear()
+        start = time.perf_counter()
+        await get_current_user(request)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    email = "creator@example.com"
+    session = authmeschema(token=create_jwt_token(email, "photographer"), email=email, role="photographer")
+    request = _request(quote(session.model_dump_json()))
+
+    uncached = asyncio.run(_measure(request, args.iterations, clear=True))
+    session_cache.clear()
+    cached = asyncio.run(_measure(request, args.iterations, clear=False))
+
+    for label, samples in (("uncached", uncached), ("cached", cached)):
+        print(f"{label:9} mean {statistics.mean(samples):7.2f} µs   "
+              f"p50 {percentile(samples, 50):7.2f} µs   p99 {percentile(samples, 99):7.2f} µs")
+    print(f"speedup   {statistics.mean(uncached) / statistics.mean(cached):.1f}x")
+    print(f"cache     {session_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
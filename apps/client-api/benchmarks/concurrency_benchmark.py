@@ -0,0 +1,127 @@
+"""
+Load test for the async data layer.
+
+Swaps Firestore for a fake client whose every read sleeps for a fixed
+latency, then fires N concurrent GET /api/escrow/{payment_id} requests at
+the ASGI app. With the reads on the Firestore pool the requests overlap and
+wall time is ~latency x ceil(N / pool size); a route that called the client
+on the event loop would take ~latency x N.
+
+Usage (from apps/client-api):
+    python benchmarks/concurrency_benchmark.py --requests 64 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Snapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _SlowDocument:
+    def __init__(self, doc_id, latency):
+        self._doc_id = doc_id
+        self._latency = latency
+
+    def get(self):
+        time.sleep(self._latency)  # a blocking network round trip
+        return _Snapshot(self._doc_id, {"payment_id": self._doc_id, "status": "escrow"})
+
+
+class _SlowCollection:
+    def __init__(self, latency):
+        self._latency = latency
+
+    def document(self, doc_id):
+        return _SlowDocument(doc_id, self._latency)
+
+
+class SlowFirestore:
+    def __init__(self, latency):
+        self._latency = latency
+
+    def collection(self, name):
+        return _SlowCollection(self._latency)
+
+
+async def _call(app, path):
+    """Minimal ASGI GET; returns the status code"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80), "root_path": "",
+    }
+    status = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    await app(scope, receive, send)
+    return status.get("code")
+
+
+async def _run(app, count):
+    start = time.perf_counter()
+    codes = await asyncio.gather(*(_call(app, f"/api/escrow/pay_{i}") for i in range(count)))
+    return time.perf_counter() - start, codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--min-overlap", type=float, default=4.0,
+                        help="fail (exit 1) if serial time / wall time is below this")
+    args = parser.parse_args()
+
+    from config.env import settings
+    from services import payment_service
+    from routers import payment_route
+    from fastapi import FastAPI
+
+    latency = args.latency_ms / 1000
+    payment_service.db = SlowFirestore(latency)
+
+    app = FastAPI()
+    app.include_router(payment_route.router)
+
+    wall, codes = asyncio.run(_run(app, args.requests))
+    serial = latency * args.requests
+    overlap = serial / wall
+    bad = [c for c in codes if c != 200]
+
+    print(json.dumps({
+        "requests": args.requests,
+        "db_latency_ms": args.latency_ms,
+        "pool_size": settings.DB_THREADPOOL_SIZE,
+        "serial_ms": round(serial * 1000, 1),
+        "wall_ms": round(wall * 1000, 1),
+        "overlap": round(overlap, 1),
+        "errors": len(bad),
+    }, indent=2))
+
+    if bad or overlap < args.min_overlap:
+        print(f"❌ requests did not overlap (overlap {overlap:.1f}x, {len(bad)} errors)")
+        sys.exit(1)
+    print(f"✅ {args.requests} requests overlapped {overlap:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,547 @@
+"""
+End-to-end benchmark of the marketplace flows through the real app.
+
+Runs main.app in-process (lifespan included) over httpx's ASGI transport,
+on the local storage backend (STORAGE_BACKEND=memory, or sqlite with
+--storage sqlite) seeded with --creators creators. External services are
+stubbed, each with a configurable latency:
+  - Razorpay: order creation (signatures are real HMACs, verified as usual)
+  - Cloudinary: uploads are kept in memory and served back to the style indexer
+  - Exotel: benchmarks/exotel_stub.py, mounted as the Exotel client's transport
+  - Firestore: --db-latency-ms is added to every local round trip
+
+Flows (one iteration = every step, as one user would run them):
+  discover    filtered /api/creators page, next page, a profile, featured
+  onboarding  image upload, portfolio, pricing, details, verification, complete, status
+  request     project request, creator inbox, offer, counter, messages, accept
+  escrow      create order, verify payment, status, masked call, confirm
+  reviews     create review, creator reviews, creator profile
+
+For each flow: throughput, p50/p95/p99 latency of the whole flow and of
+each step, and Firestore reads/writes/RPCs per iteration (from the
+x-firestore-usage header). Results are written as JSON; --compare prints
+the change against an earlier results file.
+
+Usage (from apps/client-api):
+    python benchmarks/e2e_benchmark.py --iterations 200 --concurrency 20 --db-latency-ms 5
+    python benchmarks/e2e_benchmark.py --flows discover,escrow --compare benchmarks/results/e2e-previous.json
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import io
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import quote
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FLOWS = ("discover", "onboarding", "request", "escrow", "reviews")
+CITIES = ["Chennai", "Mumbai", "Bengaluru", "Delhi", "Pune", "Hyderabad", "Kochi", "Jaipur"]
+ROLES = ["photographer", "videographer", "both"]
+CATEGORIES = ["Wedding", "Pre-wedding", "Event", "Corporate", "Fashion", "Product", "Portrait"]
+STYLES = ["Cinematic", "Natural", "Bright & Airy", "Moody", "Documentary", "Vintage", "Modern"]
+
+
+def _configure_env(args, workdir: str):
+    """Settings are read at import time, so this runs before the app is imported"""
+    os.environ["STORAGE_BACKEND"] = args.storage
+    os.environ["STORAGE_SQLITE_PATH"] = os.path.join(workdir, "bench.db")
+    os.environ["STYLE_INDEX_DIR"] = os.path.join(workdir, "style_index")
+    os.environ["FIRESTORE_USAGE_HEADER"] = "true"
+    os.environ["FIRESTORE_READ_BUDGET"] = "0"
+    os.environ["EXOTEL_SID"] = "bench"
+    os.environ["EXOTEL_API_KEY"] = "bench"
+    os.environ["EXOTEL_API_TOKEN"] = "bench"
+    os.environ["EXOTEL_CALLER_ID"] = "08000000000"
+    os.environ["EXOTEL_BASE_URL"] = "http://exotel.stub"
+    os.environ["CALL_RECONCILE_INTERVAL_SECONDS"] = "0"
+    os.environ["SMTP_HOST"] = ""
+
+
+# =========================
+# STUBS
+# =========================
+class StubRazorpayOrders:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.ids = itertools.count(1)
+        self.calls = 0
+
+    def create(self, data=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return {"id": f"order_bench{next(self.ids):010d}", "amount": data["amount"], "currency": data["currency"], "status": "created"}
+
+
+class StubCloudinary:
+    """Uploads land in a dict; the style indexer reads them back from it"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.ids = itertools.count(1)
+        self.files = {}
+        self.calls = 0
+
+    def upload_image(self, file, folder="portfolio_images"):
+        self.calls += 1
+        time.sleep(self.latency)
+        url = f"https://res.cloudinary.com/bench/image/upload/{folder}/{next(self.ids)}.png"
+        file.seek(0)
+        self.files[url] = file.read()
+        return url
+
+    def load_image(self, url):
+        from PIL import Image
+        data = self.files.get(url)
+        return Image.open(io.BytesIO(data)) if data is not None else None
+
+
+def _install_stubs(args):
+    import httpx
+    from benchmarks.exotel_stub import create_app
+    from services import payment_service, style_index
+    from services.claudinary_service import ClaudinaryService
+    from services.exotel_client import exotel_client
+    from config.clients import db
+
+    razorpay = StubRazorpayOrders(args.razorpay_latency_ms / 1000)
+    payment_service.razorpay_client.order = razorpay
+
+    cloudinary = StubCloudinary(args.cloudinary_latency_ms / 1000)
+    ClaudinaryService.upload_image = staticmethod(cloudinary.upload_image)
+    style_index.load_image = cloudinary.load_image
+
+    exotel_app = create_app(latency=args.exotel_latency_ms / 1000)
+
+    def ensure_client():
+        if exotel_client._client is None:
+            exotel_client._client = httpx.AsyncClient(
+                base_url=exotel_client.base_url, auth=exotel_client._auth,
+                transport=httpx.ASGITransport(app=exotel_app),
+            )
+            exotel_client._semaphore = asyncio.Semaphore(exotel_client.max_concurrency)
+        return exotel_client._client
+
+    exotel_client._ensure_client = ensure_client
+
+    # Every local round trip pays the configured latency, like a network RPC would
+    latency = args.db_latency_ms / 1000
+    if latency:
+        for name in ("_batch_get", "_run_query", "_commit"):
+            call = getattr(db, name)
+
+            def slowed(*a, _call=call, **kw):
+                time.sleep(latency)
+                return _call(*a, **kw)
+
+            setattr(db, name, slowed)
+
+    return {"razorpay": razorpay, "cloudinary": cloudinary, "exotel": exotel_app}
+
+
+# =========================
+# DATA
+# =========================
+def _creator_doc(i: int, rng: random.Random) -> dict:
+    email = f"creator{i}@example.com"
+    images = [f"https://res.cloudinary.com/bench/image/upload/seed/{i}-{n}.jpg" for n in range(rng.randint(3, 12))]
+    return {
+        "email": email,
+        "full_name": f"Creator {i}",
+        "role": rng.choice(ROLES),
+        "city": rng.choice(CITIES),
+        "phone_number": f"98{i:08d}"[:10],
+        "bio": "Candid wedding and event photographer. " * 3,
+        "years_experience": rng.randint(1, 15),
+        "starting_price": rng.randrange(5000, 150000, 500),
+        "currency": "INR",
+        "price_unit": "per day",
+        "negotiable": True,
+        "categories": rng.sample(CATEGORIES, 2),
+        "style_tags": rng.sample(STYLES, 3),
+        "gear_list": ["Sony A7IV", "24-70mm f/2.8", "DJI Mini 3"],
+        "languages": ["English", "Hindi"],
+        "operating_locations": rng.sample(CITIES, 2),
+        "profile_photo": images[0],
+        "portfolio_images": images,
+        "rating": round(rng.uniform(3.0, 5.0), 1),
+        "profile_live": True,
+        "onboarding_status": "completed",
+        "current_step": 4,
+        "profile_completeness": 100,
+    }
+
+
+def _seed(db, creators: int, clients: int, seed: int):
+    rng = random.Random(seed)
+    ids = []
+    batch = db.batch()
+    for i in range(creators):
+        doc = _creator_doc(i, rng)
+        batch.set(db.collection("creators").document(doc["email"]), doc)
+        ids.append(doc["email"])
+        if len(batch) >= 400:
+            batch.commit()
+            batch = db.batch()
+    for i in range(clients):
+        batch.set(db.collection("Users").document(f"client{i}@example.com"), {
+            "email": f"client{i}@example.com", "name": f"Client {i}", "role": "client", "phone_number": f"97{i:08d}"[:10],
+        })
+        if len(batch) >= 400:
+            batch.commit()
+            batch = db.batch()
+    batch.commit()
+    return ids
+
+
+def _session_cookie(email: str, role: str) -> str:
+    from jwt_handler import create_jwt_token
+    from models.Auth import authmeschema
+    session = authmeschema(token=create_jwt_token(email, role), email=email, role=role)
+    return f"token={quote(session.model_dump_json())}"
+
+
+def _png(seed: int) -> bytes:
+    from PIL import Image
+    rng = random.Random(seed)
+    image = Image.new("RGB", (64, 48), tuple(rng.randrange(256) for _ in range(3)))
+    out = io.BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue()
+
+
+def _signature(order_id: str, payment_id: str) -> str:
+    from config.env import settings
+    message = f"{order_id}|{payment_id}".encode()
+    return hmac.new(settings.RAZORPAY_KEY_SECRET.encode(), message, hashlib.sha256).hexdigest()
+
+
+# =========================
+# RECORDING
+# =========================
+class Recorder:
+    """Latency per step and per flow iteration, plus Firestore usage per iteration"""
+
+    def __init__(self):
+        self.steps = defaultdict(list)
+        self.flows = []
+        self.usage = []
+        self.errors = defaultdict(int)
+
+    def iteration(self):
+        return _Iteration(self)
+
+
+class _Iteration:
+    def __init__(self, recorder: Recorder):
+        self.recorder = recorder
+        self.usage = {"reads": 0, "writes": 0, "rpcs": 0}
+        self.ok = True
+
+    async def call(self, client, step: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.recorder.steps[step].append(time.perf_counter() - started)
+        header = response.headers.get("x-firestore-usage", "")
+        for part in header.split(";"):
+            key, _, value = part.strip().partition("=")
+            if key in self.usage:
+                self.usage[key] += int(value)
+        if response.status_code >= 400:
+            self.ok = False
+            self.recorder.errors[f"{step} {response.status_code}"] += 1
+            raise _StepFailed(step, response)
+        return response
+
+
+class _StepFailed(Exception):
+    def __init__(self, step, response):
+        super().__init__(f"{step}: {response.status_code} {response.text[:200]}")
+
+
+def _percentiles(samples):
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    samples = sorted(samples)
+
+    def pick(q):
+        return round(samples[min(len(samples) - 1, max(0, int(round(q * len(samples))) - 1))] * 1000, 2)
+
+    return {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+# =========================
+# FLOWS
+# =========================
+class Bench:
+    def __init__(self, app, db, creator_ids, args):
+        import httpx
+        self.http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        self.db = db
+        self.creator_ids = creator_ids
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.counter = itertools.count()
+
+    def client_id(self):
+        return f"client{self.rng.randrange(self.args.clients)}@example.com"
+
+    def creator_id(self):
+        return self.rng.choice(self.creator_ids)
+
+    # discover
+    async def discover(self, it: _Iteration, ctx):
+        params = {"category": self.rng.choice(ROLES), "location": self.rng.choice(CITIES).lower(), "price_max": 100000, "limit": 20}
+        first = (await it.call(self.http, "creators_page", "GET", "/api/creators", params=params)).json()
+        if first.get("next_cursor"):
+            await it.call(self.http, "creators_next_page", "GET", "/api/creators", params={**params, "cursor": first["next_cursor"]})
+        creator = first["creators"][0]["id"] if first["creators"] else self.creator_id()
+        await it.call(self.http, "creator_profile", "GET", f"/api/creators/{creator}")
+        await it.call(self.http, "featured", "GET", "/api/creators/featured/")
+
+    # onboarding
+    async def onboarding(self, it: _Iteration, ctx):
+        n = next(self.counter)
+        email = f"new-creator{n}@example.com"
+        headers = {"cookie": _session_cookie(email, "photographer")}
+        urls = []
+        for i in range(3):
+            files = {"file": (f"{i}.png", _png(n * 10 + i), "image/png")}
+            upload = await it.call(self.http, "upload_image", "POST", "/api/creator/portfolio/upload-image", files=files, headers=headers)
+            urls.append(upload.json()["url"])
+        await it.call(self.http, "portfolio_setup", "POST", "/api/creator/portfolio/setup", headers=headers, json={
+            "profile_photo": urls[0], "portfolio_images": urls, "categories": ["Wedding"], "style_tags": ["Cinematic"],
+        })
+        await it.call(self.http, "pricing_setup", "POST", "/api/creator/pricing/setup", headers=headers, json={
+            "starting_price": 25000, "currency": "INR", "price_unit": "per day", "negotiable": True,
+        })
+        await it.call(self.http, "details_setup", "POST", "/api/creator/details/setup", headers=headers, json={
+            "full_name": f"New Creator {n}", "phone_number": "9876543210", "city": self.rng.choice(CITIES),
+            "years_experience": 3, "bio": "Wedding photographer", "gear_list": ["Canon R6"],
+        })
+        await it.call(self.http, "verification_submit", "POST", "/api/creator/verification/submit", headers=headers, json={
+            "verification_type": "id_card", "document_url": urls[0],
+        })
+        await it.call(self.http, "onboarding_complete", "POST", "/api/creator/onboarding/complete", headers=headers)
+        await it.call(self.http, "onboarding_status", "GET", "/api/creator/onboarding/status", headers=headers)
+
+    # request -> negotiation chat -> accept
+    async def _create_request(self, it: _Iteration, client_id: str, creator_id: str) -> str:
+        response = await it.call(self.http, "project_request", "POST", "/api/projects/request", json={
+            "clientId": client_id, "creatorId": creator_id, "packageName": "Wedding day", "packagePrice": "45,000",
+            "serviceType": "photography", "category": "Wedding", "eventDate": "2026-12-12", "duration": 8,
+            "location": "Chennai", "budget": "40000-50000", "message": "Are you available?",
+        })
+        return response.json()["requestId"]
+
+    async def request(self, it: _Iteration, ctx):
+        client_id, creator_id = self.client_id(), self.creator_id()
+        request_id = await self._create_request(it, client_id, creator_id)
+        await it.call(self.http, "creator_inbox", "GET", f"/api/projects/creator-requests/{creator_id}", params={"limit": 20})
+        await it.call(self.http, "offer", "POST", f"/api/projects/{request_id}/messages", json={
+            "sender": "client", "senderId": client_id, "message": "Would 40k work?", "price": 40000, "deliverables": "300 photos", "type": "offer",
+        })
+        await it.call(self.http, "counter", "POST", f"/api/projects/{request_id}/messages", json={
+            "sender": "creator", "senderId": creator_id, "message": "42k with an album", "price": 42000, "deliverables": "300 photos + album", "type": "counter",
+        })
+        messages = await it.call(self.http, "messages", "GET", f"/api/projects/{request_id}/messages")
+        etag = messages.headers.get("etag")
+        if etag:
+            await it.call(self.http, "messages_not_modified", "GET", f"/api/projects/{request_id}/messages", headers={"if-none-match": etag})
+        await it.call(self.http, "accept", "POST", f"/api/project-request/{request_id}/respond", json={"action": "accept", "message": "Booked!"})
+
+    # escrow
+    async def prepare_escrow(self):
+        it = Recorder().iteration()
+        client_id, creator_id = self.client_id(), self.creator_id()
+        request_id = await self._create_request(it, client_id, creator_id)
+        await it.call(self.http, "accept", "POST", f"/api/project-request/{request_id}/respond", json={"action": "accept"})
+        return {"request_id": request_id, "client_id": client_id, "creator_id": creator_id}
+
+    async def escrow(self, it: _Iteration, ctx):
+        order = (await it.call(self.http, "create_order", "POST", "/api/escrow/create-order", json={
+            "client_id": ctx["client_id"], "creator_id": ctx["creator_id"], "request_id": ctx["request_id"],
+            "amount": 45000, "description": "Wedding day",
+        })).json()
+        payment_id = f"pay_bench{next(self.counter):010d}"
+        await it.call(self.http, "verify_payment", "POST", "/api/escrow/verify-payment", json={
+            "razorpay_order_id": order["order_id"], "razorpay_payment_id": payment_id,
+            "razorpay_signature": _signature(order["order_id"], payment_id),
+        })
+        await it.call(self.http, "payment_status", "GET", f"/api/escrow/{ctx['request_id']}/status")
+        await it.call(self.http, "masked_call", "POST", "/api/call/connect", json={
+            "request_id": ctx["request_id"], "caller_id": ctx["client_id"], "caller_phone": "9812345678", "caller_type": "client",
+        })
+        await it.call(self.http, "confirm_release", "POST", "/api/escrow/confirm", json={"payment_id": order["payment_id"]})
+
+    # reviews
+    async def prepare_reviews(self):
+        booking_id = f"bk_bench{next(self.counter):08d}"
+        client_id, creator_id = self.client_id(), self.creator_id()
+        self.db.collection("Bookings").document(booking_id).set({
+            "id": booking_id, "clientId": client_id, "creatorId": creator_id, "status": "completed", "escrowStatus": "released",
+        })
+        return {"booking_id": booking_id, "client_id": client_id, "creator_id": creator_id}
+
+    async def reviews(self, it: _Iteration, ctx):
+        await it.call(self.http, "create_review", "POST", "/api/reviews/create", json={
+            "bookingId": ctx["booking_id"], "clientId": ctx["client_id"], "creatorId": ctx["creator_id"],
+            "overallRating": self.rng.randint(3, 5), "aspects": {"quality": 5, "communication": 4, "punctuality": 5},
+            "review": "Lovely photos, delivered on time.",
+        })
+        await it.call(self.http, "creator_reviews", "GET", f"/api/reviews/creator/{ctx['creator_id']}", params={"limit": 20})
+        await it.call(self.http, "creator_profile", "GET", f"/api/creators/{ctx['creator_id']}")
+
+    async def run_flow(self, name: str) -> dict:
+        flow = getattr(self, name)
+        prepare = getattr(self, f"prepare_{name}", None)
+        iterations = self.args.iterations
+        contexts = [await prepare() if prepare else None for _ in range(iterations)]
+
+        recorder = Recorder()
+        failures = []
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+
+        async def one(ctx):
+            async with semaphore:
+                it = recorder.iteration()
+                started = time.perf_counter()
+                try:
+                    await flow(it, ctx)
+                except _StepFailed as e:
+                    failures.append(str(e))
+                    return
+                recorder.flows.append(time.perf_counter() - started)
+                recorder.usage.append(it.usage)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(ctx) for ctx in contexts))
+        elapsed = time.perf_counter() - started
+
+        completed = len(recorder.flows)
+        per_iteration = {
+            key: round(sum(u[key] for u in recorder.usage) / completed, 2) if completed else None
+            for key in ("reads", "writes", "rpcs")
+        }
+        return {
+            "iterations": iterations,
+            "completed": completed,
+            "failed": len(failures),
+            "errors": dict(recorder.errors),
+            "first_failure": failures[0] if failures else None,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(completed / elapsed, 2) if elapsed else None,
+            **_percentiles(recorder.flows),
+            "firestore_per_iteration": per_iteration,
+            "steps": {step: {"count": len(samples), **_percentiles(samples)} for step, samples in recorder.steps.items()},
+        }
+
+
+def _compare(results: dict, previous_path: str) -> dict:
+    with open(previous_path) as f:
+        previous = json.load(f)
+    changes = {}
+    for name, current in results["flows"].items():
+        before = previous.get("flows", {}).get(name)
+        if not before:
+            continue
+        changes[name] = {}
+        for key in ("throughput_per_s", "p50_ms", "p95_ms", "p99_ms"):
+            if current.get(key) and before.get(key):
+                changes[name][key] = f"{(current[key] - before[key]) / before[key] * 100:+.1f}%"
+        for key, value in (current.get("firestore_per_iteration") or {}).items():
+            old = (before.get("firestore_per_iteration") or {}).get(key)
+            if value is not None and old is not None:
+                changes[name][f"firestore_{key}"] = round(value - old, 2)
+    return changes
+
+
+async def run(args, workdir: str):
+    import main as app_module
+    from config.clients import db
+
+    creator_ids = _seed(db, args.creators, args.clients, args.seed)
+    stubs = _install_stubs(args)
+    quiet = contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext()
+
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "verbose")},
+        "flows": {},
+    }
+    async with app_module.app.router.lifespan_context(app_module.app):
+        from services.creator_catalog import creator_catalog
+        await asyncio.to_thread(creator_catalog.wait_until_ready, 30)
+        bench = Bench(app_module.app, db, creator_ids, args)
+        for name in args.flows:
+            with quiet:
+                results["flows"][name] = await bench.run_flow(name)
+            flow = results["flows"][name]
+            print(
+                f"{name:<11} {flow['throughput_per_s']:>8} flows/s  p50 {flow['p50_ms']} ms  p95 {flow['p95_ms']} ms  "
+                f"p99 {flow['p99_ms']} ms  firestore {flow['firestore_per_iteration']}  failed {flow['failed']}",
+                file=sys.stderr,
+            )
+        await bench.http.aclose()
+    results["stubs"] = {
+        "razorpay_orders": stubs["razorpay"].calls,
+        "cloudinary_uploads": stubs["cloudinary"].calls,
+        "exotel": dict(stubs["exotel"].state.counts),
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", default=",".join(FLOWS), help=f"comma-separated subset of {','.join(FLOWS)}")
+    parser.add_argument("--iterations", type=int, default=100, help="iterations per flow")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent users per flow")
+    parser.add_argument("--creators", type=int, default=2000, help="creators seeded before the run")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--storage", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="added to every Firestore round trip")
+    parser.add_argument("--razorpay-latency-ms", type=float, default=150.0)
+    parser.add_argument("--cloudinary-latency-ms", type=float, default=200.0)
+    parser.add_argument("--exotel-latency-ms", type=float, default=80.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="results file (default benchmarks/results/e2e-<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's own logging")
+    args = parser.parse_args()
+    args.flows = [f.strip() for f in args.flows.split(",") if f.strip()]
+    unknown = set(args.flows) - set(FLOWS)
+    if unknown:
+        parser.error(f"unknown flows: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix="e2e-bench-") as workdir:
+        _configure_env(args, workdir)
+        results = asyncio.run(run(args, workdir))
+
+    if args.compare:
+        results["compared_to"] = args.compare
+        results["changes"] = _compare(results, args.compare)
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results", f"e2e-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({"output": output, "flows": {
+        name: {k: flow[k] for k in ("throughput_per_s", "p50_ms", "p95_ms", "p99_ms", "firestore_per_iteration", "failed")}
+        for name, flow in results["flows"].items()
+    }, **({"changes": results["changes"]} if args.compare else {})}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
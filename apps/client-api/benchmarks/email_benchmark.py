@@ -0,0 +1,192 @@
+"""
+Contact-form mail: a fresh SMTP session per message vs the queued outbox.
+
+Runs a local SMTP stand-in (aiosmtpd, with AUTH and an artificial
+round-trip delay on EHLO and DATA) and sends N contact messages two ways:
+  - "inline": connect, EHLO, AUTH, send, QUIT inside each request, as before
+  - "outbox": EmailOutbox.enqueue() in the request; one worker session
+    delivers in batches
+Reports request latency, time until the last message is delivered and the
+number of SMTP sessions opened. With --fail-rate > 0 the stand-in answers
+451 to that share of messages so the outbox's retries are exercised.
+
+Needs aiosmtpd (pip install aiosmtpd).
+
+Usage (from apps/client-api):
+    python benchmarks/email_benchmark.py --messages 200 --rtt-ms 40 --fail-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import smtplib
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiosmtpd.controller import Controller  # noqa: E402
+from aiosmtpd.smtp import AuthResult  # noqa: E402
+
+from services.email_outbox import EmailOutbox  # noqa: E402
+from services.homePage_service import build_contact_email  # noqa: E402
+
+USER = "bench@example.com"
+PASSWORD = "secret"
+
+
+class StandIn:
+    """aiosmtpd handler: counts sessions and delivered messages"""
+
+    def __init__(self, rtt: float, fail_rate: float):
+        self.rtt = rtt
+        self.fail_rate = fail_rate
+        self.sessions = 0
+        self.delivered = 0
+        self.lock = threading.Lock()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.rtt)
+        session.host_name = hostname
+        with self.lock:
+            self.sessions += 1
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.rtt)
+        if random.random() < self.fail_rate:
+            return "451 Try again later"
+        with self.lock:
+            self.delivered += 1
+        return "250 OK"
+
+    def reset(self):
+        with self.lock:
+            self.sessions = 0
+            self.delivered = 0
+
+
+def _authenticator(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=auth_data.login.decode() == USER and auth_data.password.decode() == PASSWORD)
+
+
+def _message(i: int):
+    msg = build_contact_email(f"Visitor {i}", f"visitor{i}@example.com", "Hello, I'd like to book a shoot.")
+    msg.replace_header("From", USER)
+    msg.replace_header("To", USER)
+    return msg
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1] * 1000, 2),
+    }
+
+
+async def _wait_delivered(stand_in: StandIn, count: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while stand_in.delivered < count and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def run_inline(port: int, messages: int, concurrency: int, stand_in: StandIn) -> dict:
+    def send(i):
+        started = time.perf_counter()
+        try:
+            with smtplib.SMTP("127.0.0.1", port, timeout=10) as smtp:
+                smtp.ehlo()
+                smtp.login(USER, PASSWORD)
+                smtp.send_message(_message(i))
+            return time.perf_counter() - started, True
+        except Exception:
+            return time.perf_counter() - started, False
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(i):
+        async with semaphore:
+            return await asyncio.to_thread(send, i)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(request(i) for i in range(messages)))
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": "inline",
+        "failed_requests": sum(1 for _, ok in results if not ok),
+        **_percentiles([latency for latency, _ in results]),
+        "all_delivered_s": round(elapsed, 3),
+        "delivered": stand_in.delivered,
+        "smtp_sessions": stand_in.sessions,
+    }
+
+
+async def run_outbox(port: int, messages: int, batch_size: int, stand_in: StandIn) -> dict:
+    outbox = EmailOutbox("127.0.0.1", port, USER, PASSWORD, starttls=False, batch_size=batch_size)
+    outbox.BACKOFF_BASE = 0.05
+    outbox.start()
+    latencies = []
+    started = time.perf_counter()
+    for i in range(messages):
+        t = time.perf_counter()
+        outbox.enqueue(_message(i))
+        latencies.append(time.perf_counter() - t)
+        await asyncio.sleep(0)
+    await _wait_delivered(stand_in, messages, timeout=120)
+    elapsed = time.perf_counter() - started
+    await outbox.stop()
+    stats = outbox.stats()
+    return {
+        "mode": "outbox",
+        "failed_requests": stats["rejected"],
+        **_percentiles(latencies),
+        "all_delivered_s": round(elapsed, 3),
+        "delivered": stand_in.delivered,
+        "smtp_sessions": stand_in.sessions,
+        "retried": stats["retried"],
+        "dropped": stats["dropped"],
+        "batches": stats["batches"],
+    }
+
+
+async def main(args):
+    stand_in = StandIn(args.rtt_ms / 1000, args.fail_rate)
+    controller = Controller(
+        stand_in,
+        hostname="127.0.0.1",
+        port=args.port,
+        authenticator=_authenticator,
+        auth_require_tls=False,
+    )
+    controller.start()
+    try:
+        results = []
+        if not args.skip_inline:
+            stand_in.reset()
+            results.append(await run_inline(args.port, args.messages, args.concurrency, stand_in))
+        stand_in.reset()
+        results.append(await run_outbox(args.port, args.messages, args.batch_size, stand_in))
+    finally:
+        controller.stop()
+    print(json.dumps({
+        "messages": args.messages,
+        "rtt_ms": args.rtt_ms,
+        "fail_rate": args.fail_rate,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=40)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent inline requests")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--skip-inline", action="store_true")
+    asyncio.run(main(parser.parse_args()))
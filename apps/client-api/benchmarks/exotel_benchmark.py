@@ -0,0 +1,155 @@
+"""
+Throughput of Exotel calls: shared async pool vs a new connection per call.
+
+Starts benchmarks/exotel_stub.py in a subprocess (HTTPS with a throwaway
+self-signed certificate, like the real API; --plain for HTTP) and fires N
+concurrent connect + status round trips two ways:
+  - "per_call": requests.post/get in the threadpool, one fresh connection
+    and TLS handshake per request, as before
+  - "pooled":   ExotelClient, keep-alive connections shared by all calls
+With --error-rate > 0 the pooled client's retries are reported as well.
+
+Usage (from apps/client-api):
+    python benchmarks/exotel_benchmark.py --calls 200 --latency-ms 80 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+from services.exotel_client import ExotelClient, ExotelError  # noqa: E402
+
+SID = "bench"
+AUTH = ("key", "token")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_certificate(directory: str):
+    certfile, keyfile = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+        "-keyout", keyfile, "-out", certfile,
+    ], check=True, capture_output=True)
+    return certfile, keyfile
+
+
+def start_stub(latency_ms: float, error_rate: float, certfile=None, keyfile=None):
+    """Own process, so the stub doesn't share a GIL with the clients under test"""
+    port = _free_port()
+    command = [
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "exotel_stub.py"),
+        "--port", str(port), "--latency-ms", str(latency_ms), "--error-rate", str(error_rate),
+    ]
+    if certfile:
+        command += ["--certfile", certfile, "--keyfile", keyfile]
+    stub = subprocess.Popen(command)
+    base_url = f"{'https' if certfile else 'http'}://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return stub, base_url
+        except OSError:
+            time.sleep(0.05)
+    stub.kill()
+    raise RuntimeError("Exotel stub did not start")
+
+
+async def per_call_flow(base_url: str, calls: int, connections: int, certfile):
+    """The previous call path: blocking requests in the threadpool"""
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=connections)
+    verify = certfile or True
+
+    def one_call(i):
+        response = requests.post(
+            f"{base_url}/v1/Accounts/{SID}/Calls/connect.json",
+            data={"From": f"9000{i:06d}", "To": "9111111111", "CallerId": "0800"}, auth=AUTH, verify=verify,
+        )
+        if response.status_code != 200:
+            return False
+        call_sid = response.json()["Call"]["Sid"]
+        status = requests.get(f"{base_url}/v1/Accounts/{SID}/Calls/{call_sid}.json", auth=AUTH, verify=verify)
+        return status.status_code == 200
+
+    try:
+        results = await asyncio.gather(*(loop.run_in_executor(pool, one_call, i) for i in range(calls)))
+    finally:
+        pool.shutdown()
+    return sum(results), {}
+
+
+async def pooled_flow(base_url: str, calls: int, connections: int, certfile):
+    client = ExotelClient(
+        base_url, SID, *AUTH,
+        max_connections=connections,
+        max_concurrency=connections,
+        verify=ssl.create_default_context(cafile=certfile) if certfile else True,
+    )
+
+    async def one_call(i):
+        try:
+            result = await client.connect_call(f"9000{i:06d}", "9111111111", "0800")
+            await client.get_call(result["Call"]["Sid"])
+            return True
+        except ExotelError:
+            return False
+
+    try:
+        results = await asyncio.gather(*(one_call(i) for i in range(calls)))
+    finally:
+        await client.aclose()
+    return sum(results), client.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--connections", type=int, default=20, help="pool size / threadpool size")
+    parser.add_argument("--plain", action="store_true", help="serve the stub over HTTP instead of HTTPS")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        certfile, keyfile = (None, None) if args.plain else make_certificate(tmp)
+        stub, base_url = start_stub(args.latency_ms, args.error_rate, certfile, keyfile)
+        results = {}
+        try:
+            for name, flow in (("per_call", per_call_flow), ("pooled", pooled_flow)):
+                start = time.perf_counter()
+                ok, stats = asyncio.run(flow(base_url, args.calls, args.connections, certfile))
+                elapsed = time.perf_counter() - start
+                results[name] = {
+                    "succeeded": ok,
+                    "failed": args.calls - ok,
+                    "seconds": round(elapsed, 2),
+                    "calls_per_sec": round(args.calls / elapsed, 1),
+                    **stats,
+                }
+        finally:
+            stub.terminate()
+            stub.wait()
+
+    results["speedup"] = round(results["pooled"]["calls_per_sec"] / results["per_call"]["calls_per_sec"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
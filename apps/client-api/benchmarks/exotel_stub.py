@@ -0,0 +1,85 @@
+"""
+Local stand-in for the two Exotel endpoints the call router uses.
+
+POST /v1/Accounts/{sid}/Calls/connect.json,
+GET  /v1/Accounts/{sid}/Calls/{call_sid}.json and the bulk
+GET  /v1/Accounts/{sid}/Calls.json?Sid=a,b answer with Exotel-shaped
+JSON after a fixed latency; a configurable share of requests fail with 503
+so the client's retries can be exercised.
+
+Usage (from apps/client-api):
+    python benchmarks/exotel_stub.py --port 8765 --latency-ms 80 --error-rate 0.05
+    (add --certfile/--keyfile to serve HTTPS like the real API)
+"""
+import argparse
+import asyncio
+import itertools
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(latency: float = 0.08, error_rate: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Exotel stub")
+    app.state.counts = {"connect": 0, "status": 0, "bulk": 0, "errors": 0}
+    call_ids = itertools.count(1)
+
+    async def _simulate(kind: str):
+        app.state.counts[kind] += 1
+        await asyncio.sleep(latency)
+        if random.random() < error_rate:
+            app.state.counts["errors"] += 1
+            return JSONResponse({"RestException": {"Status": 503, "Message": "Service Unavailable"}}, status_code=503)
+        return None
+
+    @app.post("/v1/Accounts/{sid}/Calls/connect.json")
+    async def connect(sid: str, request: Request):
+        failure = await _simulate("connect")
+        if failure:
+            return failure
+        form = await request.form()
+        return {"Call": {
+            "Sid": f"stub{next(call_ids):08d}",
+            "From": form.get("From"),
+            "To": form.get("To"),
+            "PhoneNumberSid": form.get("CallerId"),
+            "Status": "in-progress",
+        }}
+
+    @app.get("/v1/Accounts/{sid}/Calls.json")
+    async def bulk_status(sid: str, Sid: str = ""):
+        failure = await _simulate("bulk")
+        if failure:
+            return failure
+        calls = [{"Sid": call_sid, "Status": "completed", "Duration": "42"} for call_sid in Sid.split(",") if call_sid]
+        return {"Metadata": {"Total": len(calls), "PageSize": len(calls)}, "Calls": calls}
+
+    @app.get("/v1/Accounts/{sid}/Calls/{call_sid}.json")
+    async def status(sid: str, call_sid: str):
+        failure = await _simulate("status")
+        if failure:
+            return failure
+        return {"Call": {"Sid": call_sid, "Status": "completed", "Duration": "42"}}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--certfile")
+    parser.add_argument("--keyfile")
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(args.latency_ms / 1000, args.error_rate),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+        ssl_certfile=args.certfile,
+        ssl_keyfile=args.keyfile,
+    )
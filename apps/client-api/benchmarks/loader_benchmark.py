@@ -0,0 +1,179 @@
+"""
+Critical path of initiate_call with the request-scoped document loader.
+
+Runs POST /api/call/connect against a fake Firestore that sleeps for a
+fixed latency per RPC (get, get_all, query) and a fake Exotel connect.
+"legacy" replays the previous sequence: payment query, then request get,
+then receiver get, then the Calls log write. "loader" is the current handler: the payment status comes
+from the latest-payment pointer on the request, and the creator's phone
+from the creator cache.
+
+Usage (from apps/client-api):
+    python benchmarks/loader_benchmark.py --latency-ms 30 --calls 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Snapshot:
+    def __init__(self, ref, data):
+        self.reference = ref
+        self.id = ref.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _Document:
+    def __init__(self, fake, collection, doc_id):
+        self._fake = fake
+        self._collection = collection
+        self.id = doc_id
+        self.path = f"{collection}/{doc_id}"
+
+    def get(self):
+        self._fake.rpc()
+        return _Snapshot(self, self._fake.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        self._fake.rpc()
+        self._fake.docs[self.path] = dict(data)
+
+
+class _Query:
+    def __init__(self, fake, collection, field, value):
+        self._fake = fake
+        self._collection = collection
+        self._field = field
+        self._value = value
+
+    def limit(self, _):
+        return self
+
+    def stream(self):
+        self._fake.rpc()
+        for path, data in list(self._fake.docs.items()):
+            if path.startswith(f"{self._collection}/") and data.get(self._field) == self._value:
+                yield _Snapshot(_Document(self._fake, self._collection, path.split("/", 1)[1]), data)
+
+
+class _Collection:
+    def __init__(self, fake, name):
+        self._fake = fake
+        self._name = name
+
+    def document(self, doc_id):
+        return _Document(self._fake, self._name, doc_id)
+
+    def where(self, field, op, value):
+        return _Query(self._fake, self._name, field, value)
+
+
+class FakeFirestore:
+    def __init__(self, latency):
+        self.latency = latency
+        self.docs = {}
+        self.rpcs = 0
+
+    def rpc(self):
+        self.rpcs += 1
+        time.sleep(self.latency)
+
+    def collection(self, name):
+        return _Collection(self, name)
+
+    def get_all(self, refs):
+        self.rpc()
+        return [_Snapshot(ref, self.docs.get(ref.path)) for ref in refs]
+
+
+async def legacy_lookups(fake, request_id):
+    """Previous read sequence of initiate_call, one round trip after another"""
+    from config.async_db import get_doc, set_doc, stream_query
+    payments = await stream_query(fake.collection("Payments").where("request_id", "==", request_id).limit(1))
+    assert payments and payments[0].to_dict()["status"] == "escrowed"
+    request_data = (await get_doc(fake.collection("ProjectRequests").document(request_id))).to_dict()
+    receiver = await get_doc(fake.collection("Users").document(request_data["creatorId"]))
+    assert receiver.to_dict()["phone_number"]
+    await set_doc(fake.collection("Calls").document("bench"), {"request_id": request_id, "status": "initiated"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    from config.env import settings
+    from routers import call_route
+    from services import creator_cache as cache_module
+    from services import doc_loader
+    from services.doc_loader import DocLoader
+
+    settings.EXOTEL_SID = settings.EXOTEL_API_KEY = settings.EXOTEL_API_TOKEN = settings.EXOTEL_CALLER_ID = "bench"
+    sids = iter(range(10 ** 9))
+
+    async def fake_connect(**kwargs):
+        return {"Call": {"Sid": f"bench{next(sids)}"}}
+
+    call_route.exotel_client.connect_call = fake_connect
+
+    payload = call_route.CallRequest(
+        request_id="req_bench", caller_id="client@example.com", caller_phone="9000000000", caller_type="client"
+    )
+    seed = {
+        "Payments/pay_bench": {"request_id": "req_bench", "status": "escrowed"},
+        "ProjectRequests/req_bench": {
+            "clientId": "client@example.com",
+            "creatorId": "creator@example.com",
+            "latestPayment": {"id": "pay_bench", "status": "escrowed", "created_at": 0},
+        },
+        "Users/creator@example.com": {"phone_number": "9111111111"},
+        "creators/creator@example.com": {"phone_number": "9111111111"},
+    }
+
+    results = {}
+    for name in ("legacy", "loader"):
+        fake = FakeFirestore(args.latency_ms / 1000)
+        fake.docs.update(seed)
+        call_route.db = doc_loader.db = cache_module.db = fake
+        cache_module.creator_cache.clear()
+
+        async def one():
+            if name == "legacy":
+                await legacy_lookups(fake, "req_bench")
+            else:
+                await call_route.initiate_call(payload, DocLoader(fake))
+
+        async def run():
+            samples = []
+            for _ in range(args.calls):
+                fake.rpcs = 0
+                start = time.perf_counter()
+                await one()
+                samples.append(((time.perf_counter() - start) * 1000, fake.rpcs))
+            return samples
+
+        samples = asyncio.run(run())
+        latencies = [ms for ms, _ in samples]
+        results[name] = {
+            "mean_ms": round(statistics.mean(latencies), 1),
+            "p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 1),
+            "rpcs_first_call": samples[0][1],
+            "rpcs_warm_call": samples[-1][1],
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
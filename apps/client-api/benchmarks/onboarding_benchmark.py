@@ -0,0 +1,137 @@
+"""
+Round trips and latency of one onboarding save.
+
+Runs the four onboarding steps (portfolio, pricing, details, verification)
+against a fake Firestore that sleeps for a fixed latency per call and
+counts reads/writes. The "legacy" flow replays the previous write path
+(router set(merge) + service set(merge) + get + update per step) for
+comparison with CreatorOnboardingService.update_step_data.
+
+Usage (from apps/client-api):
+    python benchmarks/onboarding_benchmark.py --latency-ms 20
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Snapshot:
+    def __init__(self, data):
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+
+class _Document:
+    def __init__(self, store, doc_id, fake):
+        self._store = store
+        self._id = doc_id
+        self._fake = fake
+
+    def get(self):
+        self._fake.call("reads")
+        return _Snapshot(self._store.get(self._id))
+
+    def set(self, data, merge=False):
+        self._fake.call("writes")
+        current = self._store.get(self._id) if merge else None
+        self._store[self._id] = {**(current or {}), **data}
+
+    def update(self, data):
+        self._fake.call("writes")
+        self._store[self._id].update(data)
+
+
+class _Collection:
+    def __init__(self, store, fake):
+        self._store = store
+        self._fake = fake
+
+    def document(self, doc_id):
+        return _Document(self._store, doc_id, self._fake)
+
+
+class CountingFirestore:
+    def __init__(self, latency):
+        self.latency = latency
+        self._collections = {}
+        self.counts = {"reads": 0, "writes": 0}
+
+    def call(self, kind):
+        self.counts[kind] += 1
+        time.sleep(self.latency)
+
+    def collection(self, name):
+        return _Collection(self._collections.setdefault(name, {}), self)
+
+
+STEPS = [
+    ({"profile_photo": "p.jpg", "portfolio_images": ["a.jpg", "b.jpg"], "categories": ["Wedding"]}, 2, "portfolio_completed"),
+    ({"starting_price": 25000, "currency": "INR", "price_unit": "per day", "negotiable": True}, 3, "pricing_completed"),
+    ({"full_name": "Asha", "bio": "Wedding photographer", "city": "Chennai"}, 4, "details_completed"),
+    ({"verification_status": "pending", "verification_documents": []}, 4, "verification_completed"),
+]
+
+
+async def legacy_flow(service, fake, user_id):
+    """Previous path: router set(merge), then service set(merge) + get + update"""
+    from config.async_db import get_doc, set_doc, update_doc
+    ref = fake.collection("creators").document(user_id)
+    for data, next_step, flag in STEPS:
+        await set_doc(ref, data, merge=True)
+        await set_doc(ref, {**data, "current_step": next_step, flag: True}, merge=True)
+        user_data = (await get_doc(ref)).to_dict()
+        await update_doc(ref, {"profile_completeness": service.calculate_completeness(user_data)})
+
+
+async def current_flow(service, fake, user_id):
+    # The step pages GET the profile first, which primes the creator cache
+    from services.creator_cache import creator_cache
+    await creator_cache.get_async(user_id)
+    fake.counts = {"reads": 0, "writes": 0}
+    for data, next_step, flag in STEPS:
+        await service.update_step_data(user_id=user_id, data=data, next_step=next_step, flag_name=flag)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    from services import creator_cache as cache_module
+    from services import onboard_service
+    from services.onboard_service import CreatorOnboardingService
+
+    results = {}
+    for name, flow in (("legacy", legacy_flow), ("current", current_flow)):
+        fake = CountingFirestore(args.latency_ms / 1000)
+        onboard_service.db = fake
+        cache_module.db = fake
+        cache_module.creator_cache.clear()
+
+        start = time.perf_counter()
+        asyncio.run(flow(CreatorOnboardingService, fake, f"{name}@example.com"))
+        elapsed = (time.perf_counter() - start) * 1000
+
+        results[name] = {
+            "ms_per_step": round(elapsed / len(STEPS), 1),
+            "reads_per_step": fake.counts["reads"] / len(STEPS),
+            "writes_per_step": fake.counts["writes"] / len(STEPS),
+        }
+
+    legacy, current = results["legacy"], results["current"]
+    results["latency_reduction"] = round(legacy["ms_per_step"] / current["ms_per_step"], 1)
+    results["write_reduction"] = round(legacy["writes_per_step"] / current["writes_per_step"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
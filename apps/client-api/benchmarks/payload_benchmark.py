@@ -0,0 +1,146 @@
+"""
+Size and serialize time of the discover payload, per 1k creators.
+
+Builds synthetic creators (with image metadata, as uploads record it),
+runs them through transform_creator_data and encodes the /api/creators
+body several ways:
+  - "default": FastAPI's path (jsonable_encoder + JSONResponse), full view
+  - "orjson": services.json_response.render_json, full view
+  - "card": orjson, view=card
+  - "fields": orjson, view=card&fields=<--fields>
+Each orjson variant is also compressed with gzip and brotli at the
+configured levels (RESPONSE_GZIP_LEVEL / RESPONSE_BROTLI_QUALITY).
+
+Usage (from apps/client-api):
+    python benchmarks/payload_benchmark.py --creators 1000 --repeat 20
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from services.creators_service import card_view, transform_creator_data  # noqa: E402
+from services.image_meta import IMAGE_META_FIELD  # noqa: E402
+from services.json_response import compress, render_json  # noqa: E402
+from services.pagination import project  # noqa: E402
+
+ROLES = ["photographer", "videographer", "both"]
+CATEGORIES = ["Wedding", "Pre-wedding", "Event", "Corporate", "Fashion", "Product", "Portrait"]
+STYLES = ["Cinematic", "Natural", "Bright & Airy", "Moody", "Documentary", "Vintage", "Modern"]
+CITIES = ["Chennai", "Mumbai", "Bengaluru", "New Delhi", "Hyderabad", "Kolkata", "Pune", "Jaipur"]
+
+
+def synthetic_docs(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    docs = []
+    for i in range(count):
+        images = [
+            f"https://res.cloudinary.com/demo/image/upload/v17000{i:05d}/portfolio_images/{rng.getrandbits(48):012x}.jpg"
+            for _ in range(rng.randint(4, 16))
+        ]
+        meta = [
+            {
+                "url": url,
+                "width": rng.choice([1080, 1600, 2048]),
+                "height": rng.choice([720, 1067, 1365]),
+                # Roughly the size of a 16px blur placeholder data URI
+                "placeholder": "data:image/webp;base64," + base64.b64encode(rng.randbytes(90)).decode(),
+                "color": "#%06x" % rng.getrandbits(24),
+            }
+            for url in images
+        ]
+        docs.append((f"creator{i}@example.com", {
+            "email": f"creator{i}@example.com",
+            "full_name": f"Creator {i}",
+            "phone_number": f"98{rng.getrandbits(28):08d}"[:10],
+            "role": rng.choice(ROLES),
+            "bio": "Candid wedding and event photographer based in the city. " * rng.randint(1, 4),
+            "profile_photo": images[0],
+            "city": rng.choice(CITIES),
+            "operating_locations": rng.sample(CITIES, rng.randint(0, 3)),
+            "travel_available": rng.random() < 0.5,
+            "categories": rng.sample(CATEGORIES, rng.randint(1, 3)),
+            "style_tags": rng.sample(STYLES, rng.randint(1, 4)),
+            "years_experience": rng.randint(0, 15),
+            "languages": ["English", "Hindi"],
+            "gear_list": ["Sony A7IV", "24-70mm f/2.8", "DJI Mini 3"],
+            "starting_price": rng.randrange(5000, 150000, 500),
+            "price_unit": "per day",
+            "currency": "INR",
+            "negotiable": True,
+            "portfolio_images": images,
+            "portfolio_videos": [],
+            IMAGE_META_FIELD: meta,
+            "verification_status": rng.choice(["pending", "verified"]),
+            "profile_live": True,
+            "profile_completeness": 100,
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "reviews": rng.randint(0, 80),
+        }))
+    return docs
+
+
+def _timed(fn, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--creators", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement (median is reported)")
+    parser.add_argument("--fields", default="id,name,profileImage,city,starting_price,rating")
+    args = parser.parse_args()
+
+    creators = [transform_creator_data(data, doc_id) for doc_id, data in synthetic_docs(args.creators)]
+    fields = [f for f in args.fields.split(",") if f]
+    variants = {
+        "orjson": lambda: creators,
+        "card": lambda: [card_view(c) for c in creators],
+        "fields": lambda: [project(card_view(c), fields) for c in creators],
+    }
+    per_1k = 1000 / args.creators
+
+    def body(rows):
+        return {"success": True, "creators": rows, "count": len(rows), "next_cursor": None}
+
+    default_body, default_time = _timed(lambda: JSONResponse(jsonable_encoder(body(creators))).body, args.repeat)
+    results = {"default": {
+        "bytes_per_1k": round(len(default_body) * per_1k),
+        "serialize_ms_per_1k": round(default_time * 1000 * per_1k, 2),
+    }}
+
+    for name, shape in variants.items():
+        raw, serialize = _timed(lambda: render_json(body(shape())), args.repeat)
+        assert json.loads(raw)["count"] == args.creators
+        entry = {
+            "bytes_per_1k": round(len(raw) * per_1k),
+            "serialize_ms_per_1k": round(serialize * 1000 * per_1k, 2),
+        }
+        for encoding in ("gzip", "br"):
+            compressed, took = _timed(lambda: compress(raw, encoding), max(1, args.repeat // 4))
+            entry[f"{encoding}_bytes_per_1k"] = round(len(compressed) * per_1k)
+            entry[f"{encoding}_ms_per_1k"] = round(took * 1000 * per_1k, 2)
+        entry["size_vs_default"] = round(len(raw) / len(default_body), 3)
+        entry["br_size_vs_default"] = round(entry["br_bytes_per_1k"] / results["default"]["bytes_per_1k"], 3)
+        results[name] = entry
+
+    print(json.dumps({"creators": args.creators, "fields": fields, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
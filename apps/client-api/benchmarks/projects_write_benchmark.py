@@ -0,0 +1,164 @@
+"""
+Per-call latency of the negotiation message write path.
+
+Uses a fake Firestore that sleeps for a fixed latency per round trip.
+"legacy" replays the previous sequence (existence get, message set,
+request update); "batched" calls send_negotiation_message, which commits
+the message and the request update in one WriteBatch.
+
+Usage (from apps/client-api):
+    python benchmarks/projects_write_benchmark.py --latency-ms 20 --calls 50
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.api_core.exceptions import NotFound  # noqa: E402
+
+
+class _Snapshot:
+    def __init__(self, data):
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _Document:
+    def __init__(self, fake, path):
+        self._fake = fake
+        self.path = path
+
+    def collection(self, name):
+        return _Collection(self._fake, f"{self.path}/{name}")
+
+    def get(self):
+        self._fake.round_trip()
+        return _Snapshot(self._fake.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        self._fake.round_trip()
+        self._fake.apply_set(self.path, data, merge)
+
+    def update(self, data):
+        self._fake.round_trip()
+        self._fake.apply_update(self.path, data)
+
+
+class _Collection:
+    def __init__(self, fake, path):
+        self._fake = fake
+        self._path = path
+
+    def document(self, doc_id):
+        return _Document(self._fake, f"{self._path}/{doc_id}")
+
+
+class _Batch:
+    def __init__(self, fake):
+        self._fake = fake
+        self._ops = []
+
+    def set(self, ref, data, merge=False):
+        self._ops.append(("set", ref.path, data, merge))
+
+    def update(self, ref, data):
+        self._ops.append(("update", ref.path, data, None))
+
+    def commit(self):
+        self._fake.round_trip()
+        if any(op == "update" and path not in self._fake.docs for op, path, _, _ in self._ops):
+            raise NotFound("No document to update")
+        for op, path, data, merge in self._ops:
+            if op == "set":
+                self._fake.apply_set(path, data, merge)
+            else:
+                self._fake.apply_update(path, data)
+
+
+class FakeFirestore:
+    def __init__(self, latency):
+        self.latency = latency
+        self.docs = {}
+        self.round_trips = 0
+
+    def round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+    def apply_set(self, path, data, merge):
+        self.docs[path] = {**(self.docs.get(path, {}) if merge else {}), **data}
+
+    def apply_update(self, path, data):
+        if path not in self.docs:
+            raise NotFound("No document to update")
+        self.docs[path].update(data)
+
+    def collection(self, name):
+        return _Collection(self, name)
+
+    def batch(self):
+        return _Batch(self)
+
+
+def legacy_send(db, request_id, payload):
+    request_ref = db.collection("ProjectRequests").document(request_id)
+    if not request_ref.get().exists:
+        raise RuntimeError("Request not found")
+    now = int(time.time() * 1000)
+    message_id = f"msg_{now}"
+    db.collection("ProjectMessages").document(request_id).collection("messages").document(message_id).set({
+        "id": message_id, "message": payload.message, "timestamp": now,
+    })
+    request_ref.update({"status": "negotiating", "updatedAt": now})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    from routers import projects_route
+    from services import projects_service
+    from services import chat_hub
+
+    payload = projects_route.NegotiationMessage(
+        sender="client", senderId="client@example.com", message="Can you do 30k?", type="counter", price=30000
+    )
+
+    results = {}
+    for name in ("legacy", "batched"):
+        fake = FakeFirestore(args.latency_ms / 1000)
+        fake.docs["ProjectRequests/req_bench"] = {"id": "req_bench", "status": "pending_creator"}
+        projects_route.db = fake
+        projects_service.db = fake
+        chat_hub.db = None
+
+        samples = []
+        for _ in range(args.calls):
+            start = time.perf_counter()
+            if name == "legacy":
+                legacy_send(fake, "req_bench", payload)
+            else:
+                projects_route.send_negotiation_message("req_bench", payload)
+            samples.append((time.perf_counter() - start) * 1000)
+
+        results[name] = {
+            "round_trips_per_call": fake.round_trips / args.calls,
+            "mean_ms": round(statistics.mean(samples), 2),
+            "p95_ms": round(sorted(samples)[int(0.95 * (len(samples) - 1))], 2),
+        }
+
+    results["commit_stats"] = projects_service.write_stats()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Portfolio upload throughput: one request per file vs the batch endpoint.
+
+Both paths use a stub uploader that reads the file and sleeps for a fixed
+latency (standing in for the Cloudinary round trip), so no credentials or
+network are needed. "serial" posts each file to /upload-image in turn, as
+the onboarding page did; "batch" posts all of them to /upload-images,
+where they are uploaded on the bounded worker pool while the rest of the
+body is still being parsed. Both paths also extract image metadata
+(dimensions, placeholder, colour) from real JPEGs; the creator doc write
+goes to the in-memory storage backend.
+
+Usage (from apps/client-api):
+    python benchmarks/upload_benchmark.py --files 30 --width 2400 --latency-ms 300
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+import uuid
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+from PIL import Image, ImageFilter  # noqa: E402
+
+
+class StubUploader:
+    """Reads the whole file, waits `latency`, returns a fake URL"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self, file, policy=None, **kwargs):
+        file.read()
+        time.sleep(self.latency)
+        self.calls += 1
+        folder = policy.folder if policy is not None else kwargs.get("folder", "portfolio_images")
+        return f"https://stub.local/{folder}/{uuid.uuid4().hex}.jpg"
+
+
+def make_files(count: int, width: int):
+    noise = np.random.default_rng(0).integers(0, 255, (width * 3 // 4, width, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(noise).filter(ImageFilter.GaussianBlur(2)).save(buffer, "JPEG", quality=90)
+    body = buffer.getvalue()
+    return [(f"shot_{i:02d}.jpg", body) for i in range(count)]
+
+
+async def serial_flow(client, files):
+    for name, body in files:
+        response = await client.post(
+            "/api/creator/portfolio/upload-image", files={"file": (name, body, "image/jpeg")}
+        )
+        assert response.status_code == 200, response.text
+
+
+async def batch_flow(client, files):
+    response = await client.post(
+        "/api/creator/portfolio/upload-images",
+        files=[("files", (name, body, "image/jpeg")) for name, body in files],
+    )
+    assert response.status_code == 200 and response.json()["uploaded"] == len(files), response.text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=30)
+    parser.add_argument("--width", type=int, default=2400, help="JPEG width in px (4:3)")
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    from fastapi import FastAPI
+    from auth.get_current_user import get_current_user
+    from models.Auth import authmeschema
+    from routers import portfolio_route
+    from services.upload_service import batch_uploader
+
+    stub = StubUploader(args.latency_ms / 1000)
+    batch_uploader.uploader = stub
+    portfolio_route.ClaudinaryService.upload_image = staticmethod(stub)
+
+    app = FastAPI()
+    app.include_router(portfolio_route.router)
+    app.dependency_overrides[get_current_user] = lambda: authmeschema(
+        token="bench", email="creator@example.com", role="creator"
+    )
+    files = make_files(args.files, args.width)
+
+    async def run(flow):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            await flow(client, files)
+            return time.perf_counter() - start
+
+    results = {}
+    for name, flow in (("serial", serial_flow), ("batch", batch_flow)):
+        elapsed = asyncio.run(run(flow))
+        results[name] = {"seconds": round(elapsed, 2), "files_per_sec": round(args.files / elapsed, 1)}
+    results["speedup"] = round(results["serial"]["seconds"] / results["batch"]["seconds"], 1)
+    results["file_kb"] = len(files[0][1]) // 1024
+    results["workers"] = batch_uploader.workers
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from .env import settings
+
+# Dedicated pool for the synchronous firebase_admin client so a slow
+# Firestore round trip never blocks the event loop (or starves the
+# default executor that Starlette uses for sync routes and file I/O).
+_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_THREADPOOL_SIZE,
+    thread_name_prefix="firestore",
+)
+
+
+async def run_db(fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run a blocking data-layer call on the Firestore pool and await it.
+    Raises 504 if it takes longer than `timeout` (DB_CALL_TIMEOUT_SECONDS by
+    default). The worker thread finishes the call in the background, but the
+    request is released.
+    """
+    loop = asyncio.get_running_loop()
+    # Run in a copy of the caller's context so request-scoped state (Firestore
+    # usage accounting) follows the call onto the pool thread
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(_executor, functools.partial(context.run, fn, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(future, timeout or settings.DB_CALL_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        print(f"⏱️ Data layer call timed out: {getattr(fn, '__name__', fn)}")
+        raise HTTPException(status_code=504, detail="Database request timed out")
+
+
+# =========================
+# CONVENIENCE WRAPPERS
+# =========================
+async def get_doc(ref, **kwargs):
+    """Await a DocumentReference.get()"""
+    return await run_db(ref.get, **kwargs)
+
+
+async def get_doc_dict(ref) -> Optional[Dict]:
+    """Document data as a dict, or None if it doesn't exist"""
+    snapshot = await run_db(ref.get)
+    return snapshot.to_dict() if snapshot.exists else None
+
+
+async def set_doc(ref, data: Dict, merge: bool = False):
+    return await run_db(ref.set, data, merge=merge)
+
+
+async def update_doc(ref, data: Dict):
+    return await run_db(ref.update, data)
+
+
+async def stream_query(query) -> List:
+    """Materialise a query's snapshots inside the pool (stream() is lazy)"""
+    return await run_db(lambda: list(query.stream()))
+
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
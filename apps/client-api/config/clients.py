@@ -1,3 +1,5 @@
+import os
+
 import firebase_admin
 from firebase_admin import credentials, firestore
 from .env import settings
@@ -6,9 +8,24 @@ from .env import settings
 firebase_app = None
 db = None
 
+
+def _connect_local():
+    """Local Firestore-compatible client (STORAGE_BACKEND=memory|sqlite)"""
+    from .local_store import connect
+
+    if settings.STORAGE_BACKEND == "sqlite":
+        os.makedirs(os.path.dirname(settings.STORAGE_SQLITE_PATH) or ".", exist_ok=True)
+    client = connect(settings.STORAGE_BACKEND, settings.STORAGE_SQLITE_PATH)
+    print(f"🗄️ Using local {settings.STORAGE_BACKEND} storage instead of Firestore")
+    return client
+
+
 try:
+    if settings.STORAGE_BACKEND != "firestore":
+        db = _connect_local()
+
     # Verify that the private key exists before attempting to initialize
-    if settings.FIREBASE_PRIVATE_KEY and "BEGIN PRIVATE KEY" in settings.FIREBASE_PRIVATE_KEY:
+    elif settings.FIREBASE_PRIVATE_KEY and "BEGIN PRIVATE KEY" in settings.FIREBASE_PRIVATE_KEY:
         cred = credentials.Certificate({
             "type": "service_account",
             "project_id": settings.FIREBASE_PROJECT_ID,
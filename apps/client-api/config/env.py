@@ -36,5 +36,79 @@ class Settings:
     EXOTEL_API_KEY: str = os.getenv("EXOTEL_API_KEY", "")
     EXOTEL_API_TOKEN: str = os.getenv("EXOTEL_API_TOKEN", "")
     EXOTEL_CALLER_ID: str = os.getenv("EXOTEL_CALLER_ID", "")
+    EXOTEL_BASE_URL: str = os.getenv("EXOTEL_BASE_URL", "https://api.exotel.com")
+    EXOTEL_MAX_CONNECTIONS: int = int(os.getenv("EXOTEL_MAX_CONNECTIONS", "20"))
+    EXOTEL_MAX_CONCURRENCY: int = int(os.getenv("EXOTEL_MAX_CONCURRENCY", "20"))
+    EXOTEL_CONNECT_TIMEOUT: float = float(os.getenv("EXOTEL_CONNECT_TIMEOUT", "3"))
+    EXOTEL_READ_TIMEOUT: float = float(os.getenv("EXOTEL_READ_TIMEOUT", "10"))
+    EXOTEL_MAX_RETRIES: int = int(os.getenv("EXOTEL_MAX_RETRIES", "2"))
+    # Public URL of POST /api/call/status-callback; callbacks must carry the token
+    EXOTEL_STATUS_CALLBACK_URL: str = os.getenv("EXOTEL_STATUS_CALLBACK_URL", "")
+    EXOTEL_CALLBACK_TOKEN: str = os.getenv("EXOTEL_CALLBACK_TOKEN", "")
+
+    # Call status records (cache + reconciler for missed callbacks; interval 0 disables it)
+    CALL_STATUS_CACHE_SIZE: int = int(os.getenv("CALL_STATUS_CACHE_SIZE", "2000"))
+    CALL_STATUS_CACHE_TTL_SECONDS: float = float(os.getenv("CALL_STATUS_CACHE_TTL_SECONDS", "300"))
+    CALL_RECONCILE_INTERVAL_SECONDS: float = float(os.getenv("CALL_RECONCILE_INTERVAL_SECONDS", "120"))
+    CALL_RECONCILE_GRACE_SECONDS: float = float(os.getenv("CALL_RECONCILE_GRACE_SECONDS", "60"))
+
+    # Outbound email (contact form goes to CONTACT_EMAIL_TO, default SMTP_USER)
+    SMTP_HOST: str = os.getenv("SMTP_HOST", "")
+    SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
+    SMTP_USER: str = os.getenv("SMTP_USER", "")
+    SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+    SMTP_TIMEOUT_SECONDS: float = float(os.getenv("SMTP_TIMEOUT_SECONDS", "10"))
+    CONTACT_EMAIL_TO: str = os.getenv("CONTACT_EMAIL_TO", "")
+    EMAIL_QUEUE_SIZE: int = int(os.getenv("EMAIL_QUEUE_SIZE", "1000"))
+    EMAIL_BATCH_SIZE: int = int(os.getenv("EMAIL_BATCH_SIZE", "20"))
+    EMAIL_MAX_RETRIES: int = int(os.getenv("EMAIL_MAX_RETRIES", "5"))
+    EMAIL_IDLE_SECONDS: float = float(os.getenv("EMAIL_IDLE_SECONDS", "60"))
+
+    # Verified-session cache in get_current_user (0 disables it)
+    SESSION_CACHE_SIZE: int = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+    SESSION_CACHE_MAX_TTL_SECONDS: float = float(os.getenv("SESSION_CACHE_MAX_TTL_SECONDS", "900"))
+
+    # Password hashing process pool (BCRYPT_WORKERS=0 means one per core)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_WORKERS: int = int(os.getenv("BCRYPT_WORKERS", "0"))
+    BCRYPT_QUEUE_SIZE: int = int(os.getenv("BCRYPT_QUEUE_SIZE", "32"))
+    BCRYPT_TIMEOUT_SECONDS: float = float(os.getenv("BCRYPT_TIMEOUT_SECONDS", "5"))
+
+    # Multi-file uploads: per-process upload workers and per-request limits
+    UPLOAD_WORKERS: int = int(os.getenv("UPLOAD_WORKERS", "8"))
+    UPLOAD_MAX_FILES: int = int(os.getenv("UPLOAD_MAX_FILES", "50"))
+    UPLOAD_MAX_IMAGE_MB: int = int(os.getenv("UPLOAD_MAX_IMAGE_MB", "15"))
+    UPLOAD_MAX_DOCUMENT_MB: int = int(os.getenv("UPLOAD_MAX_DOCUMENT_MB", "10"))
+
+    # Read-through cache of creator documents
+    CREATOR_CACHE_SIZE: int = int(os.getenv("CREATOR_CACHE_SIZE", "5000"))
+    CREATOR_CACHE_TTL_SECONDS: float = float(os.getenv("CREATOR_CACHE_TTL_SECONDS", "300"))
+
+    # Storage backend: "firestore" (production), or "memory" / "sqlite" for local
+    # development and benchmarks (Firestore-compatible client, no Firebase project needed)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "firestore").lower()
+    STORAGE_SQLITE_PATH: str = os.getenv("STORAGE_SQLITE_PATH", "data/local.db")
+
+    # Data layer: pool for blocking Firestore calls made from async routes
+    DB_THREADPOOL_SIZE: int = int(os.getenv("DB_THREADPOOL_SIZE", "32"))
+    DB_CALL_TIMEOUT_SECONDS: float = float(os.getenv("DB_CALL_TIMEOUT_SECONDS", "10"))
+
+    # Per-request Firestore accounting: reads over budget are logged, or with
+    # FIRESTORE_BUDGET_MODE=fail answered with a 500 ("METHOD /route=N" or "/route=N" overrides; 0 = no budget)
+    FIRESTORE_READ_BUDGET: int = int(os.getenv("FIRESTORE_READ_BUDGET", "1000"))
+    FIRESTORE_ROUTE_READ_BUDGETS: str = os.getenv("FIRESTORE_ROUTE_READ_BUDGETS", "")
+    FIRESTORE_BUDGET_MODE: str = os.getenv("FIRESTORE_BUDGET_MODE", "log").lower()
+    FIRESTORE_USAGE_HEADER: bool = os.getenv("FIRESTORE_USAGE_HEADER", "false").lower() == "true"
+
+    # Creator list/profile responses: orjson, compressed (br, else gzip) when the
+    # client accepts it and the body is at least RESPONSE_COMPRESS_MIN_BYTES
+    RESPONSE_COMPRESS_MIN_BYTES: int = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+    RESPONSE_BROTLI_QUALITY: int = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+    RESPONSE_GZIP_LEVEL: int = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+
+    # Portfolio style search (on-disk vector index)
+    STYLE_INDEX_DIR: str = os.getenv("STYLE_INDEX_DIR", "data/style_index")
+    STYLE_EMBEDDER: str = os.getenv("STYLE_EMBEDDER", "histogram")
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,857 @@
+# apps/client-api/config/local_store.py
+import copy
+import random
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from google.api_core import exceptions
+from google.cloud.firestore_v1 import transforms
+
+# Local, Firestore-compatible client for development and load tests.
+#
+# LocalClient implements the part of the google-cloud-firestore API the
+# app uses (collection/document get/set/update/delete with merge, where/
+# order_by/select/cursors/limit/stream, get_all, batches, transactions via
+# firestore.transactional, Increment/ArrayUnion/ArrayRemove/SERVER_TIMESTAMP/
+# DELETE_FIELD, on_snapshot listeners) on top of a small document store:
+# MemoryStore below, or SqliteStore (config/sqlite_store.py).
+#
+# Queries are evaluated here with Firestore's semantics (type ordering,
+# documents missing an ordered/filtered field are skipped, implicit
+# __name__ ordering); stores only list a collection, optionally narrowed by
+# equality filters they can index.
+
+DOCUMENT_ID = "__name__"
+AUTO_ID_CHARS = string.ascii_letters + string.digits
+_MISSING = object()
+
+_RANGE_OPS = {"<", "<=", ">", ">="}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def auto_id() -> str:
+    return "".join(random.choice(AUTO_ID_CHARS) for _ in range(20))
+
+
+def _split_path(path: str) -> Tuple[str, str]:
+    """"Users/abc" -> ("Users", "abc"); subcollections keep their full parent path"""
+    collection, _, doc_id = path.rpartition("/")
+    return collection, doc_id
+
+
+# =========================
+# VALUES
+# =========================
+def get_field(data: Dict, field_path: str):
+    value = data
+    for part in field_path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _type_order(value) -> Tuple:
+    """Firestore's cross-type ordering: null < bool < number < timestamp < string < bytes < ref < array < map"""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value.timestamp())
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, bytes):
+        return (5, value)
+    if isinstance(value, LocalDocumentReference):
+        return (6, value.path)
+    if isinstance(value, (list, tuple)):
+        return (8, tuple(_type_order(v) for v in value))
+    if isinstance(value, dict):
+        return (9, tuple(sorted((k, _type_order(v)) for k, v in value.items())))
+    return (7, str(value))
+
+
+def _equal(a, b) -> bool:
+    return _type_order(a) == _type_order(b)
+
+
+def _compare(a, b) -> int:
+    ka, kb = _type_order(a), _type_order(b)
+    return (ka > kb) - (ka < kb)
+
+
+def _apply_value(target: Dict, key: str, value, merge_maps: bool):
+    """Store `value` at target[key], resolving write transforms against the current value"""
+    current = target.get(key, _MISSING)
+    if value is transforms.DELETE_FIELD:
+        target.pop(key, None)
+    elif value is transforms.SERVER_TIMESTAMP:
+        target[key] = _now()
+    elif isinstance(value, transforms.Increment):
+        numeric = isinstance(current, (int, float)) and not isinstance(current, bool)
+        target[key] = current + value.value if numeric else value.value
+    elif isinstance(value, transforms.Maximum):
+        numeric = isinstance(current, (int, float)) and not isinstance(current, bool)
+        target[key] = max(current, value.value) if numeric else value.value
+    elif isinstance(value, transforms.Minimum):
+        numeric = isinstance(current, (int, float)) and not isinstance(current, bool)
+        target[key] = min(current, value.value) if numeric else value.value
+    elif isinstance(value, transforms.ArrayUnion):
+        existing = list(current) if isinstance(current, list) else []
+        for item in value.values:
+            if not any(_equal(item, e) for e in existing):
+                existing.append(copy.deepcopy(item))
+        target[key] = existing
+    elif isinstance(value, transforms.ArrayRemove):
+        existing = list(current) if isinstance(current, list) else []
+        target[key] = [e for e in existing if not any(_equal(e, item) for item in value.values)]
+    elif isinstance(value, dict):
+        nested = current if merge_maps and isinstance(current, dict) else {}
+        nested = dict(nested)
+        for k, v in value.items():
+            _apply_value(nested, k, v, merge_maps)
+        target[key] = nested
+    elif isinstance(value, tuple):
+        target[key] = copy.deepcopy(list(value))
+    else:
+        target[key] = copy.deepcopy(value)
+
+
+def _set_path(data: Dict, field_path: str, value, merge_maps: bool):
+    parts = field_path.split(".")
+    for part in parts[:-1]:
+        child = data.get(part)
+        child = dict(child) if isinstance(child, dict) else {}
+        data[part] = child
+        data = child
+    _apply_value(data, parts[-1], value, merge_maps)
+
+
+def resolve_write(path: str, current: Optional[Dict], kind: str, data: Optional[Dict], merge) -> Optional[Dict]:
+    """New document for one write (None deletes); raises like Firestore for create/update"""
+    if kind == "delete":
+        return None
+    if kind == "create" and current is not None:
+        raise exceptions.AlreadyExists(f"Document already exists: {path}")
+    if kind == "update":
+        if current is None:
+            raise exceptions.NotFound(f"No document to update: {path}")
+        result = dict(current)
+        for field_path, value in data.items():
+            # update() keys are field paths; a map value replaces the whole map
+            _set_path(result, field_path, value, merge_maps=False)
+        return result
+    if kind == "set" and merge:
+        result = dict(current or {})
+        if merge is True:
+            for key, value in data.items():
+                _apply_value(result, key, value, merge_maps=True)
+        else:
+            for field_path in merge:
+                value = get_field(data, field_path)
+                if value is not _MISSING:
+                    _set_path(result, field_path, value, merge_maps=True)
+        return result
+    result = {}
+    for key, value in data.items():
+        _apply_value(result, key, value, merge_maps=False)
+    return result
+
+
+# =========================
+# SNAPSHOTS AND REFERENCES
+# =========================
+class ChangeType(Enum):
+    ADDED = 1
+    REMOVED = 2
+    MODIFIED = 3
+
+
+class LocalDocumentChange:
+    def __init__(self, type: ChangeType, document: "LocalSnapshot"):
+        self.type = type
+        self.document = document
+
+
+class LocalWriteResult:
+    def __init__(self, update_time: datetime):
+        self.update_time = update_time
+
+
+class LocalSnapshot:
+    def __init__(self, reference: "LocalDocumentReference", data: Optional[Dict], read_time: datetime,
+                 create_time: Optional[datetime] = None, update_time: Optional[datetime] = None):
+        self.reference = reference
+        self._data = data
+        self.read_time = read_time
+        self.create_time = create_time
+        self.update_time = update_time
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    @property
+    def id(self) -> str:
+        return self.reference.id
+
+    def to_dict(self) -> Optional[Dict]:
+        # Stored documents are never mutated in place, but callers may mutate this
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str):
+        if self._data is None:
+            return None
+        value = get_field(self._data, field_path)
+        if value is _MISSING:
+            raise KeyError(f"'{field_path}' is not contained in the data")
+        return copy.deepcopy(value)
+
+
+class LocalDocumentReference:
+    def __init__(self, client: "LocalClient", path: str):
+        self._client = client
+        self.path = path
+
+    @property
+    def id(self) -> str:
+        return self.path.rpartition("/")[2]
+
+    @property
+    def parent(self) -> "LocalCollectionReference":
+        return LocalCollectionReference(self._client, self.path.rpartition("/")[0])
+
+    def collection(self, collection_id: str) -> "LocalCollectionReference":
+        return LocalCollectionReference(self._client, f"{self.path}/{collection_id}")
+
+    def get(self, field_paths: Optional[List[str]] = None, transaction=None, **kwargs) -> LocalSnapshot:
+        snapshot = self._client._batch_get([self.path])[0]
+        return _project(snapshot, field_paths)
+
+    def _write(self, kind: str, data: Optional[Dict] = None, merge=False) -> LocalWriteResult:
+        batch = self._client.batch()
+        batch._add(kind, self, data, merge)
+        return batch.commit()[0]
+
+    def create(self, document_data: Dict, **kwargs) -> LocalWriteResult:
+        return self._write("create", document_data)
+
+    def set(self, document_data: Dict, merge=False, **kwargs) -> LocalWriteResult:
+        return self._write("set", document_data, merge)
+
+    def update(self, field_updates: Dict, **kwargs) -> LocalWriteResult:
+        return self._write("update", field_updates)
+
+    def delete(self, **kwargs) -> LocalWriteResult:
+        return self._write("delete")
+
+    def __eq__(self, other):
+        return isinstance(other, LocalDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __repr__(self):
+        return f"<LocalDocumentReference {self.path}>"
+
+
+def _project(snapshot: LocalSnapshot, field_paths: Optional[List[str]]) -> LocalSnapshot:
+    if not field_paths or snapshot._data is None:
+        return snapshot
+    projected = {}
+    for field_path in field_paths:
+        value = get_field(snapshot._data, field_path)
+        if value is not _MISSING:
+            _set_path(projected, field_path, value, merge_maps=True)
+    return LocalSnapshot(snapshot.reference, projected, snapshot.read_time, snapshot.create_time, snapshot.update_time)
+
+
+# =========================
+# QUERIES
+# =========================
+class LocalQuery:
+    ASCENDING = "ASCENDING"
+    DESCENDING = "DESCENDING"
+
+    def __init__(self, client: "LocalClient", collection_path: str, filters=(), orders=(), limit=None,
+                 limit_to_last=False, offset=0, projection=None, start=None, end=None):
+        self._client = client
+        self._collection_path = collection_path
+        self._filters: Tuple = filters
+        self._orders: Tuple = orders
+        self._limit = limit
+        self._limit_to_last = limit_to_last
+        self._offset = offset
+        self._projection = projection
+        # (values or snapshot, before: bool) per Firestore cursor
+        self._start = start
+        self._end = end
+
+    def _copy(self, **changes) -> "LocalQuery":
+        fields = {
+            "filters": self._filters, "orders": self._orders, "limit": self._limit,
+            "limit_to_last": self._limit_to_last, "offset": self._offset,
+            "projection": self._projection, "start": self._start, "end": self._end,
+        }
+        fields.update(changes)
+        return LocalQuery(self._client, self._collection_path, **fields)
+
+    # Builders
+    def where(self, field_path: Optional[str] = None, op_string: Optional[str] = None, value=None, *, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        if op_string not in {"==", "!=", "<", "<=", ">", ">=", "in", "not-in", "array_contains",
+                             "array-contains", "array_contains_any", "array-contains-any"}:
+            raise ValueError(f"Unsupported operator: {op_string}")
+        return self._copy(filters=self._filters + ((field_path, op_string.replace("_", "-"), value),))
+
+    def order_by(self, field_path: str, direction: str = ASCENDING):
+        if direction not in (self.ASCENDING, self.DESCENDING):
+            raise ValueError(f"Invalid direction: {direction}")
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count: int):
+        return self._copy(limit=count, limit_to_last=False)
+
+    def limit_to_last(self, count: int):
+        return self._copy(limit=count, limit_to_last=True)
+
+    def offset(self, num_to_skip: int):
+        return self._copy(offset=num_to_skip)
+
+    def select(self, field_paths: Iterable[str]):
+        return self._copy(projection=list(field_paths))
+
+    def start_at(self, document_fields_or_snapshot):
+        return self._copy(start=(document_fields_or_snapshot, True))
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy(start=(document_fields_or_snapshot, False))
+
+    def end_before(self, document_fields_or_snapshot):
+        return self._copy(end=(document_fields_or_snapshot, True))
+
+    def end_at(self, document_fields_or_snapshot):
+        return self._copy(end=(document_fields_or_snapshot, False))
+
+    # Execution
+    def stream(self, transaction=None, **kwargs) -> Iterator[LocalSnapshot]:
+        return iter(self._client._run_query(self))
+
+    def get(self, transaction=None, **kwargs) -> List[LocalSnapshot]:
+        return self._client._run_query(self)
+
+    def on_snapshot(self, callback: Callable) -> "LocalWatch":
+        return self._client._watch(self, callback)
+
+    # Evaluation (used by LocalClient)
+    def _equality_filters(self) -> Dict[str, Any]:
+        """field -> value for == filters a store may use to narrow its scan"""
+        return {f: v for f, op, v in self._filters if op == "==" and f != DOCUMENT_ID}
+
+    def _order_keys(self) -> List[Tuple[str, str]]:
+        orders = list(self._orders)
+        if not orders:
+            # Firestore orders by the inequality field first when no order is given
+            for field_path, op, _ in self._filters:
+                if op in _RANGE_OPS or op in ("!=", "not-in"):
+                    orders.append((field_path, self.ASCENDING))
+                    break
+        if not any(field_path == DOCUMENT_ID for field_path, _ in orders):
+            direction = orders[-1][1] if orders else self.ASCENDING
+            orders.append((DOCUMENT_ID, direction))
+        return orders
+
+    def _matches(self, doc_id: str, data: Dict) -> bool:
+        for field_path, op, expected in self._filters:
+            value = doc_id if field_path == DOCUMENT_ID else get_field(data, field_path)
+            if field_path == DOCUMENT_ID:
+                expected = _document_id(expected) if op not in ("in", "not-in") else [_document_id(e) for e in expected]
+            if value is _MISSING:
+                return False
+            if op == "==":
+                ok = _equal(value, expected)
+            elif op == "!=":
+                ok = value is not None and not _equal(value, expected)
+            elif op in _RANGE_OPS:
+                # Range filters only match values of the same type
+                if _type_order(value)[0] != _type_order(expected)[0]:
+                    return False
+                c = _compare(value, expected)
+                ok = {"<": c < 0, "<=": c <= 0, ">": c > 0, ">=": c >= 0}[op]
+            elif op == "in":
+                ok = any(_equal(value, e) for e in expected)
+            elif op == "not-in":
+                ok = value is not None and not any(_equal(value, e) for e in expected)
+            elif op == "array-contains":
+                ok = isinstance(value, list) and any(_equal(v, expected) for v in value)
+            else:  # array-contains-any
+                ok = isinstance(value, list) and any(_equal(v, e) for v in value for e in expected)
+            if not ok:
+                return False
+        return True
+
+    def _cursor_values(self, cursor, order_keys) -> List:
+        if isinstance(cursor, LocalSnapshot):
+            return [cursor.id if f == DOCUMENT_ID else get_field(cursor._data or {}, f) for f, _ in order_keys]
+        if isinstance(cursor, dict):
+            values = []
+            for field_path, _ in order_keys:
+                if field_path not in cursor:
+                    break
+                value = cursor[field_path]
+                values.append(_document_id(value) if field_path == DOCUMENT_ID else value)
+            return values
+        return [_document_id(v) if f == DOCUMENT_ID else v for (f, _), v in zip(order_keys, cursor)]
+
+    def _evaluate(self, rows: Iterable[Tuple[str, Dict, Any, Any]]) -> List[Tuple[str, Dict, Any, Any]]:
+        order_keys = self._order_keys()
+
+        def keys(row):
+            doc_id, data = row[0], row[1]
+            return [doc_id if f == DOCUMENT_ID else get_field(data, f) for f, _ in order_keys]
+
+        matched = []
+        for row in rows:
+            if not self._matches(row[0], row[1]):
+                continue
+            row_keys = keys(row)
+            # Documents without an ordered field are left out, as in Firestore
+            if any(k is _MISSING for k in row_keys):
+                continue
+            matched.append((row_keys, row))
+
+        def cmp(a_keys, b_values) -> int:
+            for (_, direction), a, b in zip(order_keys, a_keys, b_values):
+                c = _compare(a, b)
+                if c:
+                    return -c if direction == self.DESCENDING else c
+            return 0
+
+        for i in range(len(order_keys) - 1, -1, -1):
+            matched.sort(key=lambda item: _type_order(item[0][i]), reverse=order_keys[i][1] == self.DESCENDING)
+
+        if self._start is not None:
+            values = self._cursor_values(self._start[0], order_keys)
+            inclusive = self._start[1]
+            matched = [m for m in matched if cmp(m[0], values) > 0 or (inclusive and cmp(m[0], values) == 0)]
+        if self._end is not None:
+            values = self._cursor_values(self._end[0], order_keys)
+            exclusive = self._end[1]
+            matched = [m for m in matched if cmp(m[0], values) < 0 or (not exclusive and cmp(m[0], values) == 0)]
+
+        rows = [row for _, row in matched][self._offset:]
+        if self._limit is not None:
+            rows = rows[-self._limit:] if self._limit_to_last else rows[:self._limit]
+        return rows
+
+
+def _document_id(value) -> str:
+    if isinstance(value, LocalDocumentReference):
+        return value.id
+    return str(value).rpartition("/")[2]
+
+
+class LocalCollectionReference(LocalQuery):
+    def __init__(self, client: "LocalClient", path: str):
+        super().__init__(client, path)
+
+    @property
+    def id(self) -> str:
+        return self._collection_path.rpartition("/")[2]
+
+    @property
+    def path(self) -> str:
+        return self._collection_path
+
+    @property
+    def parent(self) -> Optional[LocalDocumentReference]:
+        parent = self._collection_path.rpartition("/")[0]
+        return LocalDocumentReference(self._client, parent) if parent else None
+
+    def document(self, document_id: Optional[str] = None) -> LocalDocumentReference:
+        return LocalDocumentReference(self._client, f"{self._collection_path}/{document_id or auto_id()}")
+
+    def add(self, document_data: Dict, document_id: Optional[str] = None, **kwargs):
+        ref = self.document(document_id)
+        result = ref.create(document_data)
+        return result.update_time, ref
+
+    def list_documents(self, **kwargs) -> Iterator[LocalDocumentReference]:
+        return iter([snapshot.reference for snapshot in self._client._run_query(LocalQuery(self._client, self._collection_path))])
+
+
+# =========================
+# WRITES
+# =========================
+class LocalWriteBatch:
+    def __init__(self, client: "LocalClient"):
+        self._client = client
+        self._writes: List[Tuple[str, LocalDocumentReference, Optional[Dict], Any]] = []
+
+    def _add(self, kind: str, reference: LocalDocumentReference, data: Optional[Dict] = None, merge=False):
+        self._writes.append((kind, reference, data, merge))
+        return self
+
+    def create(self, reference, document_data: Dict):
+        return self._add("create", reference, document_data)
+
+    def set(self, reference, document_data: Dict, merge=False):
+        return self._add("set", reference, document_data, merge)
+
+    def update(self, reference, field_updates: Dict, **kwargs):
+        return self._add("update", reference, field_updates)
+
+    def delete(self, reference, **kwargs):
+        return self._add("delete", reference)
+
+    def commit(self, **kwargs) -> List[LocalWriteResult]:
+        writes, self._writes = self._writes, []
+        return self._client._commit(writes)
+
+    def __len__(self):
+        return len(self._writes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+
+
+class LocalTransaction(LocalWriteBatch):
+    """
+    Works with @firestore.transactional. The store's write lock is held
+    from _begin() to _commit()/_rollback(), so a transaction on one node is
+    serializable and never needs a retry.
+    """
+
+    def __init__(self, client: "LocalClient", max_attempts: int = 5, read_only: bool = False):
+        super().__init__(client)
+        self._max_attempts = max_attempts
+        self._read_only = read_only
+        self._id: Optional[bytes] = None
+
+    @property
+    def in_progress(self) -> bool:
+        return self._id is not None
+
+    @property
+    def id(self) -> Optional[bytes]:
+        return self._id
+
+    def _begin(self, retry_id=None):
+        if self.in_progress:
+            raise ValueError("Transaction already in progress")
+        self._client._store.begin()
+        self._id = auto_id().encode()
+
+    def _clean_up(self):
+        self._writes = []
+        self._id = None
+
+    def _rollback(self):
+        if not self.in_progress:
+            return
+        try:
+            self._client._store.end(commit=False)
+        finally:
+            self._clean_up()
+
+    def _commit(self) -> List[LocalWriteResult]:
+        if not self.in_progress:
+            raise ValueError("Transaction not in progress")
+        # Listeners hear about the writes only once the store has committed them
+        notifications = []
+        try:
+            try:
+                results = self._client._commit(self._writes, notifications)
+            except BaseException:
+                self._client._store.end(commit=False)
+                raise
+            self._client._store.end(commit=True)
+        finally:
+            self._clean_up()
+        for changed, commit_time in notifications:
+            self._client._notify(changed, commit_time)
+        return results
+
+    def commit(self, **kwargs):
+        return self._commit()
+
+    def get_all(self, references, **kwargs) -> Iterator[LocalSnapshot]:
+        return self._client.get_all(references)
+
+    def get(self, ref_or_query, **kwargs) -> Iterator[LocalSnapshot]:
+        if isinstance(ref_or_query, LocalDocumentReference):
+            return self._client.get_all([ref_or_query])
+        return ref_or_query.stream()
+
+
+# =========================
+# LISTENERS
+# =========================
+class LocalWatch:
+    """on_snapshot() handle; callbacks run on the client's listener thread"""
+
+    def __init__(self, client: "LocalClient", query: LocalQuery, callback: Callable):
+        self._client = client
+        self._query = query
+        self._callback = callback
+        self._docs: Dict[str, LocalSnapshot] = {}
+        self.active = True
+
+    def _apply(self, changes: List[LocalDocumentChange], read_time: datetime):
+        if not changes or not self.active:
+            return
+        docs = list(self._docs.values())
+        self._client._listener_pool.submit(self._deliver, docs, changes, read_time)
+
+    def _deliver(self, docs, changes, read_time):
+        if not self.active:
+            return
+        try:
+            self._callback(docs, changes, read_time)
+        except Exception as e:
+            print(f"❌ Local listener callback failed: {e}")
+
+    def unsubscribe(self):
+        self.active = False
+        self._client._unwatch(self)
+
+    close = unsubscribe
+
+
+# =========================
+# CLIENT
+# =========================
+class LocalClient:
+    """
+    Drop-in for firestore.Client over a local document store. The _batch_get,
+    _run_query and _commit methods are its "RPCs" (one per round trip a real
+    client would make), which is what services/db_usage counts.
+    """
+
+    def __init__(self, store, project: str = "local"):
+        self._store = store
+        self.project = project
+        self._watches: List[LocalWatch] = []
+        self._watch_lock = threading.Lock()
+        self._listener_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-listeners")
+        store.attach(self)
+
+    # Public API
+    def collection(self, *path: str) -> LocalCollectionReference:
+        return LocalCollectionReference(self, "/".join(path))
+
+    def document(self, *path: str) -> LocalDocumentReference:
+        return LocalDocumentReference(self, "/".join(path))
+
+    def get_all(self, references, field_paths=None, transaction=None, **kwargs) -> Iterator[LocalSnapshot]:
+        references = list(references)
+        snapshots = self._batch_get(list(dict.fromkeys(ref.path for ref in references)))
+        return iter([_project(snapshot, field_paths) for snapshot in snapshots])
+
+    def batch(self) -> LocalWriteBatch:
+        return LocalWriteBatch(self)
+
+    def transaction(self, max_attempts: int = 5, read_only: bool = False) -> LocalTransaction:
+        return LocalTransaction(self, max_attempts, read_only)
+
+    def close(self):
+        for watch in list(self._watches):
+            watch.unsubscribe()
+        self._listener_pool.shutdown(wait=False)
+        self._store.close()
+
+    # Round trips
+    def _snapshot(self, path: str, row, read_time: datetime) -> LocalSnapshot:
+        data, create_time, update_time = row if row is not None else (None, None, None)
+        return LocalSnapshot(LocalDocumentReference(self, path), data, read_time, create_time, update_time)
+
+    def _batch_get(self, paths: List[str]) -> List[LocalSnapshot]:
+        read_time = _now()
+        with self._store.reading():
+            rows = self._store.get_many(paths)
+        return [self._snapshot(path, row, read_time) for path, row in zip(paths, rows)]
+
+    def _run_query(self, query: LocalQuery) -> List[LocalSnapshot]:
+        return self._query_snapshots(query)
+
+    def _query_snapshots(self, query: LocalQuery) -> List[LocalSnapshot]:
+        # Shared by _run_query and listeners, which like Firestore's Watch stream aren't a query RPC
+        read_time = _now()
+        with self._store.reading():
+            rows = query._evaluate(self._store.scan(query._collection_path, query._equality_filters()))
+        snapshots = [
+            LocalSnapshot(LocalDocumentReference(self, f"{query._collection_path}/{doc_id}"), data, read_time, ctime, utime)
+            for doc_id, data, ctime, utime in rows
+        ]
+        return [_project(snapshot, query._projection) for snapshot in snapshots]
+
+    def _commit(self, writes, deferred: Optional[List] = None) -> List[LocalWriteResult]:
+        if not writes:
+            return []
+        commit_time = _now()
+        changed: Dict[str, Optional[Tuple]] = {}
+        with self._store.writing():
+            current = dict(zip(
+                (ref.path for _, ref, _, _ in writes),
+                self._store.get_many([ref.path for _, ref, _, _ in writes]),
+            ))
+            for kind, ref, data, merge in writes:
+                row = current.get(ref.path)
+                new_data = resolve_write(ref.path, row[0] if row else None, kind, data, merge)
+                current[ref.path] = None if new_data is None else (new_data, row[1] if row else commit_time, commit_time)
+                changed[ref.path] = current[ref.path]
+            for path, row in changed.items():
+                if row is None:
+                    self._store.delete(path)
+                else:
+                    self._store.put(path, *row)
+        if deferred is not None:
+            deferred.append((changed, commit_time))
+        else:
+            self._notify(changed, commit_time)
+        return [LocalWriteResult(commit_time) for _ in writes]
+
+    # Listeners
+    def _watch(self, query: LocalQuery, callback: Callable) -> LocalWatch:
+        watch = LocalWatch(self, query, callback)
+        # Store lock before listener lock, the order commits take them in
+        with self._store.reading(), self._watch_lock:
+            snapshots = self._query_snapshots(query._copy(limit=None, offset=0, start=None, end=None))
+            watch._docs = {snapshot.reference.path: snapshot for snapshot in snapshots}
+            self._watches.append(watch)
+        if snapshots:
+            watch._apply([LocalDocumentChange(ChangeType.ADDED, s) for s in snapshots], _now())
+        else:
+            # Firestore always delivers an initial (possibly empty) snapshot
+            self._listener_pool.submit(watch._deliver, [], [], _now())
+        self._store.watch_started()
+        return watch
+
+    def _unwatch(self, watch: LocalWatch):
+        with self._watch_lock:
+            if watch in self._watches:
+                self._watches.remove(watch)
+
+    def _notify(self, changed: Dict[str, Optional[Tuple]], read_time: datetime):
+        """Diff committed documents against every listener's current result set"""
+        with self._watch_lock:
+            watches = list(self._watches)
+            for watch in watches:
+                changes = []
+                for path, row in changed.items():
+                    collection, doc_id = _split_path(path)
+                    if collection != watch._query._collection_path:
+                        continue
+                    was_in = path in watch._docs
+                    now_in = row is not None and watch._query._matches(doc_id, row[0])
+                    if now_in:
+                        snapshot = self._snapshot(path, row, read_time)
+                        watch._docs[path] = snapshot
+                        changes.append(LocalDocumentChange(ChangeType.MODIFIED if was_in else ChangeType.ADDED, snapshot))
+                    elif was_in:
+                        snapshot = watch._docs.pop(path)
+                        changes.append(LocalDocumentChange(ChangeType.REMOVED, snapshot))
+                watch._apply(changes, read_time)
+
+    def _refresh_watches(self):
+        """Re-read every listener's query (the store saw writes from another process)"""
+        read_time = _now()
+        with self._watch_lock:
+            for watch in list(self._watches):
+                query = watch._query._copy(limit=None, offset=0, start=None, end=None)
+                fresh = {s.reference.path: s for s in self._query_snapshots(query)}
+                changes = []
+                for path, snapshot in fresh.items():
+                    old = watch._docs.get(path)
+                    if old is None:
+                        changes.append(LocalDocumentChange(ChangeType.ADDED, snapshot))
+                    elif old.update_time != snapshot.update_time:
+                        changes.append(LocalDocumentChange(ChangeType.MODIFIED, snapshot))
+                for path, snapshot in watch._docs.items():
+                    if path not in fresh:
+                        changes.append(LocalDocumentChange(ChangeType.REMOVED, snapshot))
+                watch._docs = fresh
+                watch._apply(changes, read_time)
+
+
+# =========================
+# IN-MEMORY STORE
+# =========================
+class MemoryStore:
+    """
+    Documents in a dict per collection, for tests and benchmarks. Stored
+    documents are replaced on write, never mutated, so snapshots can keep
+    references to them.
+    """
+
+    def __init__(self):
+        self._collections: Dict[str, Dict[str, Tuple[Dict, datetime, datetime]]] = {}
+        self._lock = threading.RLock()
+
+    def attach(self, client: LocalClient):
+        pass
+
+    def watch_started(self):
+        pass
+
+    # Locking: one RLock serves reads, writes and transactions
+    def begin(self):
+        self._lock.acquire()
+
+    def end(self, commit: bool):
+        self._lock.release()
+
+    @contextmanager
+    def reading(self):
+        with self._lock:
+            yield
+
+    writing = reading
+
+    def get_many(self, paths: List[str]) -> List[Optional[Tuple]]:
+        rows = []
+        for path in paths:
+            collection, doc_id = _split_path(path)
+            rows.append(self._collections.get(collection, {}).get(doc_id))
+        return rows
+
+    def scan(self, collection: str, equals: Dict[str, Any]) -> Iterator[Tuple]:
+        for doc_id, (data, create_time, update_time) in list(self._collections.get(collection, {}).items()):
+            yield doc_id, data, create_time, update_time
+
+    def put(self, path: str, data: Dict, create_time: datetime, update_time: datetime):
+        collection, doc_id = _split_path(path)
+        self._collections.setdefault(collection, {})[doc_id] = (data, create_time, update_time)
+
+    def delete(self, path: str):
+        collection, doc_id = _split_path(path)
+        self._collections.get(collection, {}).pop(doc_id, None)
+
+    def close(self):
+        pass
+
+
+def connect(backend: str, sqlite_path: str = "") -> LocalClient:
+    """LocalClient for STORAGE_BACKEND=memory or sqlite"""
+    if backend == "memory":
+        return LocalClient(MemoryStore())
+    if backend == "sqlite":
+        from .sqlite_store import SqliteStore
+        return LocalClient(SqliteStore(sqlite_path))
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,246 @@
+# apps/client-api/config/sqlite_store.py
+import base64
+import json
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .local_store import LocalClient, LocalDocumentReference, _split_path
+
+# SQLite document store for LocalClient: a single-node dev instance with
+# realistic data volumes that survives restarts.
+#
+# One row per document, data as JSON. Values JSON can't carry (timestamps,
+# bytes, document references) are tagged, e.g. {"__type": "ts", "v": iso}.
+# Equality filters are pushed down as json_extract() conditions, each backed
+# by an expression index created the first time a field is filtered on.
+# Writes take BEGIN IMMEDIATE, so several API workers can share a file.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    create_time TEXT NOT NULL,
+    update_time TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS commits (
+    writer TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+);
+"""
+BUSY_TIMEOUT_MS = 10000
+# How often listeners look for commits made by other processes
+POLL_INTERVAL = 1.0
+# Host parameters per statement stay well under SQLite's limit
+GET_CHUNK = 400
+
+
+def _json_path(field_path: str) -> str:
+    return "$" + "".join('."%s"' % part.replace('"', '""') for part in field_path.split("."))
+
+
+class SqliteStore:
+    """
+    Thread-safe: every thread gets its own connection (WAL lets readers run
+    alongside the writer). Writers in this process are also serialized by a
+    lock, so they queue here rather than spinning on SQLITE_BUSY.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._indexed = set()
+        self._client: Optional[LocalClient] = None
+        self._poller: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        # Commits are counted per store instance so listeners can tell other processes' writes from ours
+        self._writer = uuid.uuid4().hex
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'doc_field_%'"):
+            self._indexed.add(name)
+        print(f"🗄️ SQLite storage at {path}")
+
+    def attach(self, client: LocalClient):
+        self._client = client
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: transactions are started explicitly below
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.in_transaction = False
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    # Encoding
+    def _encode(self, value):
+        if isinstance(value, datetime):
+            return {"__type": "ts", "v": value.isoformat()}
+        if isinstance(value, bytes):
+            return {"__type": "bytes", "v": base64.b64encode(value).decode()}
+        if isinstance(value, LocalDocumentReference):
+            return {"__type": "ref", "v": value.path}
+        if isinstance(value, dict):
+            return {k: self._encode(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._encode(v) for v in value]
+        return value
+
+    def _decode_hook(self, obj: Dict):
+        kind = obj.get("__type")
+        if kind == "ts":
+            return datetime.fromisoformat(obj["v"])
+        if kind == "bytes":
+            return base64.b64decode(obj["v"])
+        if kind == "ref":
+            return LocalDocumentReference(self._client, obj["v"])
+        return obj
+
+    def _row(self, data: str, create_time: str, update_time: str) -> Tuple:
+        return (
+            json.loads(data, object_hook=self._decode_hook),
+            datetime.fromisoformat(create_time),
+            datetime.fromisoformat(update_time),
+        )
+
+    # Transactions
+    def begin(self):
+        self._write_lock.acquire()
+        try:
+            self._conn().execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._write_lock.release()
+            raise
+        self._local.in_transaction = True
+
+    def end(self, commit: bool):
+        conn = self._conn()
+        try:
+            if commit:
+                conn.execute(
+                    "INSERT INTO commits (writer, n) VALUES (?, 1) ON CONFLICT (writer) DO UPDATE SET n = n + 1",
+                    (self._writer,),
+                )
+                conn.execute("COMMIT")
+            else:
+                conn.execute("ROLLBACK")
+        finally:
+            self._local.in_transaction = False
+            self._write_lock.release()
+
+    @contextmanager
+    def reading(self):
+        # Each read is one statement, which SQLite runs against a consistent snapshot
+        yield
+
+    @contextmanager
+    def writing(self):
+        if getattr(self._local, "in_transaction", False):
+            yield
+            return
+        self.begin()
+        try:
+            yield
+        except BaseException:
+            self.end(commit=False)
+            raise
+        self.end(commit=True)
+
+    # Documents
+    def get_many(self, paths: List[str]) -> List[Optional[Tuple]]:
+        conn = self._conn()
+        keys = [_split_path(path) for path in paths]
+        found: Dict[Tuple[str, str], Tuple] = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), GET_CHUNK):
+            chunk = unique[start:start + GET_CHUNK]
+            placeholders = ",".join("(?, ?)" for _ in chunk)
+            params = [part for key in chunk for part in key]
+            rows = conn.execute(
+                f"SELECT collection, id, data, create_time, update_time FROM documents "
+                f"WHERE (collection, id) IN (VALUES {placeholders})",
+                params,
+            ).fetchall()
+            for collection, doc_id, data, create_time, update_time in rows:
+                found[(collection, doc_id)] = self._row(data, create_time, update_time)
+        return [found.get(key) for key in keys]
+
+    def _ensure_index(self, field_path: str) -> str:
+        expression = f"json_extract(data, '{_json_path(field_path).replace(chr(39), chr(39) * 2)}')"
+        name = "doc_field_" + "".join(c if c.isalnum() else "_" for c in field_path)
+        if name not in self._indexed:
+            with self._write_lock:
+                self._conn().execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON documents (collection, {expression})')
+                self._indexed.add(name)
+        return expression
+
+    def scan(self, collection: str, equals: Dict[str, Any]) -> Iterator[Tuple]:
+        sql = "SELECT id, data, create_time, update_time FROM documents WHERE collection = ?"
+        params: List[Any] = [collection]
+        for field_path, value in equals.items():
+            # Only scalars JSON stores as-is; the query engine re-checks every row anyway
+            if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                sql += f" AND {self._ensure_index(field_path)} = ?"
+                params.append(value)
+        for doc_id, data, create_time, update_time in self._conn().execute(sql, params).fetchall():
+            yield (doc_id, *self._row(data, create_time, update_time))
+
+    def put(self, path: str, data: Dict, create_time: datetime, update_time: datetime):
+        collection, doc_id = _split_path(path)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO documents (collection, id, data, create_time, update_time) VALUES (?, ?, ?, ?, ?)",
+            (collection, doc_id, json.dumps(self._encode(data)), create_time.isoformat(), update_time.isoformat()),
+        )
+
+    def delete(self, path: str):
+        collection, doc_id = _split_path(path)
+        self._conn().execute("DELETE FROM documents WHERE collection = ? AND id = ?", (collection, doc_id))
+
+    # Listeners
+    def watch_started(self):
+        """Start polling for other processes' commits once something listens"""
+        if self._poller is None:
+            self._poller = threading.Thread(target=self._poll, name="sqlite-store-poller", daemon=True)
+            self._poller.start()
+
+    def _foreign_commits(self, conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COALESCE(SUM(n), 0) FROM commits WHERE writer != ?", (self._writer,)).fetchone()[0]
+
+    def _poll(self):
+        # Our own commits already reached the listeners through LocalClient._notify
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        seen = self._foreign_commits(conn)
+        while not self._closed.wait(POLL_INTERVAL):
+            try:
+                current = self._foreign_commits(conn)
+                if current != seen:
+                    seen = current
+                    self._client._refresh_watches()
+            except Exception as e:
+                print(f"⚠️ SQLite listener poll failed: {e}")
+        conn.close()
+
+    def close(self):
+        self._closed.set()
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers import user_router
@@ -12,8 +14,48 @@ from routers import creators_route
 from routers import projects_route
 from routers import payment_route
 from routers import call_route
+from routers import homePage_route
+from services.creator_catalog import creator_catalog
+from services.style_index import style_index
+from services.chat_hub import chat_hub
+from services.creator_cache import creator_cache
+from config import async_db
+from services.password_hasher import password_hasher
+from services.exotel_client import exotel_client
+from services.call_status import call_reconciler
+from services.upload_service import batch_uploader
+from services.email_outbox import email_outbox
+from utils_py.metrics import install_metrics
+from services.db_usage import install_firestore_usage
+from config.clients import db
 
-app = FastAPI(title="Client API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep the discover catalog in sync with Firestore for the life of the worker;
+    # the same listener refreshes the creator document cache
+    creator_catalog.add_listener(creator_cache.apply_snapshot)
+    creator_catalog.start()
+    style_index.load()
+    # Warm the bcrypt workers and log hashes/sec before taking traffic, so it never competes with logins
+    await asyncio.get_running_loop().run_in_executor(None, password_hasher.benchmark)
+    # Catch Exotel status callbacks that never arrived
+    call_reconciler.start()
+    # Contact-form mail goes out from one queued SMTP session
+    email_outbox.start()
+    yield
+    await email_outbox.stop()
+    await call_reconciler.stop()
+    creator_catalog.stop()
+    chat_hub.close()
+    style_index.save_if_dirty(force=True)
+    async_db.shutdown()
+    password_hasher.shutdown()
+    await exotel_client.aclose()
+    batch_uploader.shutdown()
+
+
+app = FastAPI(title="Client API", lifespan=lifespan)
 
 # CORS
 # trigger redeploy
@@ -28,6 +70,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, status codes, in-flight requests and loop lag at /metrics
+install_metrics(app)
+# Firestore reads/writes per request and per route (budgets, X-Firestore-Usage header)
+install_firestore_usage(app, db)
+
 # Include routers
 app.include_router(user_router.router)
 app.include_router(Auth.router)
@@ -40,6 +87,7 @@ app.include_router(creators_route.router)
 app.include_router(projects_route.router)
 app.include_router(payment_route.router)
 app.include_router(call_route.router)
+app.include_router(homePage_route.router)
 
 @app.get("/")
 def read_root():
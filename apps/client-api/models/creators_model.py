@@ -1,6 +1,10 @@
 # apps/client-api/models/creators_models.py
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional, Dict, Any, Union
+
+# /similar downloads or decodes every reference, so keep a request bounded
+MAX_REFERENCE_IMAGES = 10
+MAX_REFERENCE_URL_LENGTH = 3_000_000  # a data: URL of roughly 2 MB of image
 
 class Package(BaseModel):
     id: Optional[str]
@@ -32,4 +36,28 @@ class CreatorProfile(BaseModel):
     gear: Optional[List[str]] = []
     location: Optional[LocationModel] = None
     role: Optional[str] = None
-    extra: Optional[Dict[str, Any]] = {}
\ No newline at end of file
+    extra: Optional[Dict[str, Any]] = {}
+
+class MatchRequest(BaseModel):
+    """Wizard preferences posted by client-web fetchMatchedCreators"""
+    serviceType: Optional[str] = None
+    category: Optional[str] = None
+    location: Optional[str] = None
+    budget: Optional[str] = None
+    styles: Optional[List[str]] = []
+    limit: int = 20
+
+
+class SimilarCreatorsRequest(BaseModel):
+    """Reference images in the same shape as ProjectRequestCreate.referenceImages"""
+    referenceImages: List[Union[str, Dict[str, Any]]] = Field(default=[], max_length=MAX_REFERENCE_IMAGES)
+    limit: int = 20
+
+    @field_validator("referenceImages")
+    @classmethod
+    def _bounded_urls(cls, images):
+        for image in images:
+            url = image if isinstance(image, str) else image.get("url")
+            if isinstance(url, str) and len(url) > MAX_REFERENCE_URL_LENGTH:
+                raise ValueError(f"Reference image URLs are limited to {MAX_REFERENCE_URL_LENGTH} characters")
+        return images
@@ -1,9 +1,12 @@
 import json
-from fastapi import APIRouter, Response, HTTPException, Depends
+from fastapi import APIRouter, Request, Response, HTTPException, Depends
 from models.Auth import loginschema, signupschema, authmeschema
 from services.Auth import signup_service, login_service
 from auth.get_current_user import get_current_user
+from auth.session_cache import session_cache
+from services.password_hasher import password_hasher
 from config.clients import db
+from services.creator_cache import creator_cache
 from urllib.parse import quote
 router = APIRouter(prefix="/api/auth", tags=["Creator Authentication"])
 
@@ -12,7 +15,7 @@ MAX_AGE = 60 * 60 * 24  # 1 day
 
 @router.post("/signup")
 async def signup(request: signupschema, response: Response):
-    result = signup_service(request.name, request.email, request.password, request.role)
+    result = await signup_service(request.name, request.email, request.password, request.role)
 
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
@@ -33,7 +36,7 @@ async def signup(request: signupschema, response: Response):
 
 @router.post("/login")
 async def login(request: loginschema, response: Response):
-    result = login_service(request.email, request.password)
+    result = await login_service(request.email, request.password)
 
     if "error" in result:
         raise HTTPException(status_code=401, detail=result["error"])
@@ -63,9 +66,8 @@ async def get_me(current_user: authmeschema = Depends(get_current_user)):
     if current_user.role in ["photographer", "videographer", "both", "creator"]:
         try:
             # Check creators collection for profile completeness
-            creator_doc = db.collection("creators").document(current_user.email).get()
-            if creator_doc.exists:
-                creator_data = creator_doc.to_dict()
+            creator_data = await creator_cache.get_async(current_user.email)
+            if creator_data is not None:
                 user_data["profile_completeness"] = creator_data.get("profile_completeness", 0)
                 # Check both onboarding_status and profile_completeness
                 onboarding_status = creator_data.get("onboarding_status", "")
@@ -88,6 +90,21 @@ async def get_me(current_user: authmeschema = Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(request: Request, response: Response):
+    cookie_str = request.cookies.get(COOKIE_NAME)
+    if cookie_str:
+        session_cache.invalidate(cookie_str)
     response.delete_cookie(COOKIE_NAME, path="/")
-    return {"message": "Logged out successfully"}
\ No newline at end of file
+    return {"message": "Logged out successfully"}
+
+
+@router.get("/session-cache/stats")
+async def get_session_cache_stats():
+    """Hit rate of the verified-session cache"""
+    return {"success": True, "session_cache": session_cache.stats()}
+
+
+@router.get("/hasher/stats")
+async def get_hasher_stats():
+    """Password hashing pool throughput and admission counters"""
+    return {"success": True, "hasher": password_hasher.stats()}
\ No newline at end of file
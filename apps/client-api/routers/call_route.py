@@ -1,18 +1,27 @@
 # routers/call_route.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from config.env import settings
 from config.clients import db
-import requests
+from config.async_db import set_doc, stream_query
+from services.creator_cache import creator_cache
+from services.doc_loader import DocLoader, get_doc_loader
+from services.payment_service import LATEST_PAYMENT_FIELD, PAYMENTS_COLLECTION
+from services.exotel_client import exotel_client, ExotelError
+from services.call_status import (
+    CALLS_COLLECTION,
+    call_status_cache,
+    call_reconciler,
+    get_live_call_record,
+    record_status,
+    status_callback_params,
+)
 from typing import Optional, Literal
+import hmac
 import time
 
 router = APIRouter()
 
-# Collection names
-CALLS_COLLECTION = "Calls"
-PAYMENTS_COLLECTION = "Payments"
-
 
 class CallRequest(BaseModel):
     request_id: str
@@ -29,7 +38,7 @@ class CallResponse(BaseModel):
 
 
 @router.post("/api/call/connect", response_model=CallResponse)
-async def initiate_call(payload: CallRequest):
+async def initiate_call(payload: CallRequest, loader: DocLoader = Depends(get_doc_loader)):
     """
     Initiate a masked call between client and creator using Exotel.
     Works for both client->creator and creator->client calls.
@@ -44,15 +53,19 @@ async def initiate_call(payload: CallRequest):
                 detail="Exotel credentials not configured"
             )
         
-        # Verify payment is escrowed or completed for this request
-        payment_ref = db.collection(PAYMENTS_COLLECTION).where(
-            "request_id", "==", payload.request_id
-        ).limit(1).stream()
+        # The request carries its latest payment's status, so one read covers both
+        request_ref = await loader.get_async(db.collection("ProjectRequests").document(payload.request_id))
+        request_data = request_ref.to_dict() if request_ref.exists else {}
         
-        payment = None
-        for doc in payment_ref:
-            payment = doc.to_dict()
-            break
+        # Verify payment is escrowed or completed for this request
+        payment = request_data.get(LATEST_PAYMENT_FIELD)
+        if not payment:
+            # Requests paid before the latest-payment pointer existed
+            for doc in await stream_query(db.collection(PAYMENTS_COLLECTION).where(
+                "request_id", "==", payload.request_id
+            ).limit(1)):
+                payment = doc.to_dict()
+                break
         
         if not payment:
             raise HTTPException(
@@ -66,32 +79,29 @@ async def initiate_call(payload: CallRequest):
                 detail="Call can only be made after payment is secured"
             )
         
-        # Get the request to find client_id and creator_id
-        request_ref = db.collection("ProjectRequests").document(payload.request_id).get()
+        # The request gives us client_id and creator_id
         if not request_ref.exists:
             raise HTTPException(status_code=404, detail="Request not found")
         
-        request_data = request_ref.to_dict()
-        
         # Determine receiver based on caller type
         if payload.caller_type == "client":
             # Client is calling creator
             receiver_id = request_data.get("creatorId")
-            receiver_collection = "Users"
         else:
             # Creator is calling client
             receiver_id = request_data.get("clientId")
-            receiver_collection = "Users"
         
         if not receiver_id:
             raise HTTPException(status_code=400, detail="Receiver ID not found in request")
         
-        # Get receiver's phone number
-        receiver_doc = db.collection(receiver_collection).document(receiver_id).get()
-        if not receiver_doc.exists:
+        # Get receiver's phone number (creators keep theirs on the creator profile)
+        if payload.caller_type == "client":
+            receiver_data = await creator_cache.get_async(receiver_id)
+        else:
+            receiver_data = await loader.get_dict_async(db.collection("Users").document(receiver_id))
+        if receiver_data is None:
             raise HTTPException(status_code=404, detail="Receiver not found")
         
-        receiver_data = receiver_doc.to_dict()
         receiver_phone = receiver_data.get("phone_number")
         
         if not receiver_phone:
@@ -112,28 +122,20 @@ async def initiate_call(payload: CallRequest):
         caller_phone = format_phone(payload.caller_phone)
         receiver_phone = format_phone(receiver_phone)
         
-        # Make Exotel API call
-        exotel_url = (
-            f"https://{settings.EXOTEL_API_KEY}:{settings.EXOTEL_API_TOKEN}"
-            f"@api.exotel.com/v1/Accounts/{settings.EXOTEL_SID}/Calls/connect.json"
-        )
-        
-        call_data = {
-            "From": caller_phone,      # Caller (who initiates)
-            "To": receiver_phone,      # Receiver
-            "CallerId": settings.EXOTEL_CALLER_ID  # Masked number shown to both
-        }
-        
-        response = requests.post(exotel_url, data=call_data)
-        
-        if response.status_code != 200:
-            error_detail = response.json() if response.text else "Unknown error"
+        # Make Exotel API call over the shared keep-alive pool
+        try:
+            result = await exotel_client.connect_call(
+                from_number=caller_phone,                 # Caller (who initiates)
+                to_number=receiver_phone,                 # Receiver
+                caller_id=settings.EXOTEL_CALLER_ID,      # Masked number shown to both
+                **status_callback_params(),               # Exotel posts status changes back
+            )
+        except ExotelError as e:
             raise HTTPException(
                 status_code=500, 
-                detail=f"Exotel API error: {error_detail}"
+                detail=f"Exotel API error: {e.detail}"
             )
         
-        result = response.json()
         call_sid = result.get("Call", {}).get("Sid")
         
         # Log the call in Firestore
@@ -146,7 +148,8 @@ async def initiate_call(payload: CallRequest):
             "status": "initiated",
             "created_at": int(time.time() * 1000),
         }
-        db.collection(CALLS_COLLECTION).document(call_sid).set(call_log)
+        await set_doc(db.collection(CALLS_COLLECTION).document(call_sid), call_log)
+        call_status_cache.put(call_sid, call_log)
         
         return CallResponse(
             success=True,
@@ -163,40 +166,62 @@ async def initiate_call(payload: CallRequest):
 
 @router.get("/api/call/status/{call_sid}")
 async def get_call_status(call_sid: str):
-    """Get the status of a call from Exotel"""
+    """
+    Get the status of a call from our own record. Exotel's status callback
+    (and the reconciler for missed callbacks) keep it current; without a
+    configured callback an active call is looked up on Exotel instead.
+    """
     try:
-        if not all([settings.EXOTEL_SID, settings.EXOTEL_API_KEY, settings.EXOTEL_API_TOKEN]):
-            raise HTTPException(status_code=500, detail="Exotel credentials not configured")
-        
-        exotel_url = (
-            f"https://{settings.EXOTEL_API_KEY}:{settings.EXOTEL_API_TOKEN}"
-            f"@api.exotel.com/v1/Accounts/{settings.EXOTEL_SID}/Calls/{call_sid}.json"
-        )
-        
-        response = requests.get(exotel_url)
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=500, detail="Failed to get call status")
-        
-        result = response.json()
-        call_status = result.get("Call", {}).get("Status")
-        
-        # Update call log in Firestore
-        call_ref = db.collection(CALLS_COLLECTION).document(call_sid)
-        if call_ref.get().exists:
-            call_ref.update({
-                "status": call_status,
-                "updated_at": int(time.time() * 1000)
-            })
+        record = await get_live_call_record(call_sid)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Call not found")
         
         return {
             "success": True,
             "call_sid": call_sid,
-            "status": call_status,
-            "details": result.get("Call", {})
+            "status": record.get("status"),
+            "details": record.get("details", {}),
+            "updated_at": record.get("updated_at", record.get("created_at")),
         }
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/api/call/status-callback")
+async def call_status_callback(request: Request, token: str = ""):
+    """
+    Exotel StatusCallback target (form or JSON body with CallSid and Status).
+    The URL carries EXOTEL_CALLBACK_TOKEN so only Exotel can move call state.
+    """
+    expected = settings.EXOTEL_CALLBACK_TOKEN
+    if not expected or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Invalid callback token")
+    
+    if request.headers.get("content-type", "").startswith("application/json"):
+        body = await request.json()
+    else:
+        body = dict(await request.form())
+    
+    call_sid = body.get("CallSid")
+    call_status = body.get("Status")
+    if not call_sid or not call_status:
+        raise HTTPException(status_code=400, detail="CallSid and Status are required")
+    
+    details = {k: v for k, v in body.items() if isinstance(v, (str, int, float, bool))}
+    stored = await record_status(call_sid, call_status, details)
+    
+    # Always 200 so Exotel doesn't retry callbacks we chose to ignore
+    return {"success": True, "updated": stored is not None}
+
+
+@router.get("/api/call/status-stats")
+def call_status_stats():
+    return {
+        "success": True,
+        "cache": call_status_cache.stats(),
+        "reconciler": call_reconciler.stats(),
+        "exotel": exotel_client.stats(),
+    }
@@ -1,27 +1,60 @@
 # apps/client-api/routers/creators_route.py
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from services.creators_service import (
+    card_view,
     get_creator_by_id, 
     push_gallery_item, 
     upsert_creator_section,
     get_featured_creators,
-    get_all_creators
+    get_all_creators,
+    get_creators_page
 )
-from typing import List, Optional, Dict, Any
+from services.pagination import DEFAULT_PAGE_SIZE, paginate_list, parse_fields, page_size, project
+from services.creator_catalog import creator_catalog
+from services.match_engine import match_creators
+from services.style_index import find_similar_creators
+from models.creators_model import MatchRequest, SimilarCreatorsRequest
+from models.Auth import authmeschema
+from auth.get_current_user import get_current_user
+from fastapi.concurrency import run_in_threadpool
+from config.async_db import run_db
+from services.creator_cache import creator_cache
+from services.json_response import json_response
+from typing import List, Literal, Optional, Dict, Any
 
 router = APIRouter(prefix="/api/creators", tags=["Creators"])
 
+CreatorView = Literal["full", "card"]
+VIEW_QUERY = Query("full", description="'card' for the compact discover card; 'full' for every field")
+FIELDS_QUERY = Query(None, description="Comma-separated fields to return")
+
+
+def _shape(creators: List[Dict[str, Any]], view: CreatorView, fields: Optional[str]) -> List[Dict[str, Any]]:
+    """Apply the requested view, then the sparse fieldset"""
+    if view == "card":
+        creators = [card_view(c) for c in creators]
+    selected = parse_fields(fields)
+    if selected:
+        creators = [project(c, selected) for c in creators]
+    return creators
+
+
 @router.get("")
 async def get_creators(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category (photographer/videographer)"),
     location: Optional[str] = Query(None, description="Filter by location/city"),
     price_min: Optional[int] = Query(None, description="Minimum price"),
     price_max: Optional[int] = Query(None, description="Maximum price"),
     rating: Optional[float] = Query(None, description="Minimum rating"),
-    styles: Optional[str] = Query(None, description="Comma-separated style tags")
+    styles: Optional[str] = Query(None, description="Comma-separated style tags"),
+    limit: Optional[int] = Query(None, description="Page size; omit for every match"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = FIELDS_QUERY,
+    view: CreatorView = VIEW_QUERY
 ):
     """
-    Fetch all creators with optional filters
+    Fetch all creators with optional filters, paginated when a limit is given
     """
     filters = {
         "category": category,
@@ -31,34 +64,89 @@ async def get_creators(
         "rating": rating,
         "styles": styles.split(",") if styles else None
     }
-    creators = get_all_creators(filters)
+    # Served from the in-memory catalog once its listener has primed it
+    next_cursor = None
+    if creator_catalog.is_ready():
+        creators, next_cursor = paginate_list(
+            creator_catalog.query(filters), page_size(limit), cursor
+        )
+    elif limit or cursor:
+        creators, next_cursor = await run_db(get_creators_page, filters, page_size(limit, DEFAULT_PAGE_SIZE), cursor)
+    else:
+        creators = await run_db(get_all_creators, filters)
+
+    creators = _shape(creators, view, fields)
+    return await json_response(request, {"success": True, "creators": creators, "count": len(creators), "next_cursor": next_cursor})
+
+@router.get("/catalog/status")
+async def get_catalog_status():
+    """Freshness of the in-memory creator catalog"""
+    return {"success": True, "catalog": creator_catalog.status()}
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss/eviction counters of the creator document cache"""
+    return {"success": True, "cache": creator_cache.stats()}
+
+@router.post("/match")
+async def match(payload: MatchRequest):
+    """
+    Rank creators against the client wizard preferences
+    """
+    limit = max(1, min(payload.limit, 100))
+    # Scoring is CPU work (and may rebuild the feature matrix), so keep it off the loop
+    creators = await run_in_threadpool(match_creators, payload.model_dump(exclude={"limit"}), limit)
     return {"success": True, "creators": creators, "count": len(creators)}
 
-@router.get("/featured/")
-async def get_featured():
-    creators = get_featured_creators()
+@router.post("/similar")
+async def similar_creators(payload: SimilarCreatorsRequest, current_user: authmeschema = Depends(get_current_user)):
+    """
+    Creators whose portfolio looks like the client's reference images.
+    References are data: URLs or images uploaded to our Cloudinary account;
+    other URLs are ignored (see style_embeddings.is_fetchable_url).
+    """
+    urls = [
+        image if isinstance(image, str) else image.get("url")
+        for image in payload.referenceImages
+    ]
+    limit = max(1, min(payload.limit, 100))
+    # Downloading and embedding the references is blocking work
+    ranked = await run_in_threadpool(find_similar_creators, [u for u in urls if u], limit)
+
+    creators = []
+    for creator_id, similarity in ranked:
+        data = creator_catalog.get(creator_id) if creator_catalog.is_ready() else await run_db(get_creator_by_id, creator_id)
+        if data is None:
+            continue
+        creators.append({**data, "style_similarity": round(similarity, 4)})
     return {"success": True, "creators": creators, "count": len(creators)}
 
+@router.get("/featured/")
+async def get_featured(request: Request, fields: Optional[str] = FIELDS_QUERY, view: CreatorView = VIEW_QUERY):
+    creators = _shape(await run_db(get_featured_creators), view, fields)
+    return await json_response(request, {"success": True, "creators": creators, "count": len(creators)})
+
 @router.get("/{creator_id}")
-async def get_creator(creator_id: str):
-    data = get_creator_by_id(creator_id)
+async def get_creator(request: Request, creator_id: str, fields: Optional[str] = FIELDS_QUERY, view: CreatorView = VIEW_QUERY):
+    data = await run_db(get_creator_by_id, creator_id)
     if data is None:
         raise HTTPException(status_code=404, detail="Creator not found")
     # inject id
     data["id"] = creator_id
-    return {"success": True, "data": data}
+    data = _shape([data], view, fields)[0]
+    return await json_response(request, {"success": True, "data": data})
 
 # Creator-only endpoints to add content
 @router.post("/{creator_id}/gallery")
 async def add_gallery(creator_id: str, payload: dict):
-    ok = push_gallery_item(creator_id, payload.get("image_url"))
+    ok = await run_db(push_gallery_item, creator_id, payload.get("image_url"))
     if not ok:
         raise HTTPException(status_code=500, detail="Failed to add gallery image")
     return {"success": True}
     
 @router.post("/{creator_id}/section/{section_name}")
 async def update_section(creator_id: str, section_name: str, payload: dict):
-    ok = upsert_creator_section(creator_id, section_name, payload.get("value"))
+    ok = await run_db(upsert_creator_section, creator_id, section_name, payload.get("value"))
     if not ok:
         raise HTTPException(status_code=500, detail="Failed to update section")
     return {"success": True}
\ No newline at end of file
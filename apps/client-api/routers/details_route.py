@@ -3,7 +3,7 @@ from models.creator_details import CreatorDetailsRequest, CreatorDetailsResponse
 from models.Auth import authmeschema
 from auth.get_current_user import get_current_user
 from services.onboard_service import CreatorOnboardingService as service
-from config.clients import db 
+from services.creator_cache import creator_cache
 
 router = APIRouter(prefix="/api/creator/details", tags=["Creator Details"])
 
@@ -29,10 +29,8 @@ async def setup_details(request: CreatorDetailsRequest, current_user: authmesche
         }
         
         # Logic: Update the 'creators' collection instead of 'users'
-        # We use the email as the document ID for easy retrieval
-        db.collection("creators").document(creator_email).set(details_data, merge=True)
-        
-        # Calculate completeness via service (passing creator_email instead of user_id)
+        # We use the email as the document ID for easy retrieval.
+        # The service saves the details, step and completeness in one write.
         completeness = await service.update_step_data(
             user_id=creator_email, 
             data=details_data, 
@@ -57,14 +55,12 @@ async def get_details(current_user: authmeschema = Depends(get_current_user)):
         creator_email = current_user.email
         
         # Retrieve from the 'creators' collection
-        creator_doc = db.collection("creators").document(creator_email).get()
+        user_data = await creator_cache.get_async(creator_email)
         
-        if not creator_doc.exists:
+        if user_data is None:
             # If they exist in Auth but haven't filled details yet, return empty defaults
             return {"email": creator_email, "full_name": "", "profile_completeness": 0}
         
-        user_data = creator_doc.to_dict()
-        
         return {
             "user_id": creator_email,
             "full_name": user_data.get("full_name"),
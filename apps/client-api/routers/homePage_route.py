@@ -1,18 +1,27 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from models.homePage import HomePage
+from models.Auth import authmeschema
+from auth.get_current_user import get_current_user
 from services.homePage_service import send_contact_email
+from services.email_outbox import email_outbox
 
 router = APIRouter(prefix="/api/contact", tags=["Contact"])
 
 @router.post("/")
 async def contact_form(payload: HomePage):
-    sent = send_contact_email(
+    # Only enqueues; the outbox worker delivers (and retries) in the background
+    queued = send_contact_email(
         name=payload.name,
         email=payload.email,
         message=payload.message,
     )
 
-    if not sent:
-        raise HTTPException(status_code=500, detail="Failed to send message")
+    if not queued:
+        raise HTTPException(status_code=503, detail="Failed to send message, please try again shortly")
 
-    return {"success": True, "message": "Message sent successfully!"}
\ No newline at end of file
+    return {"success": True, "message": "Message received"}
+
+@router.get("/stats")
+def contact_stats(current_user: authmeschema = Depends(get_current_user)):
+    # Outbox internals are for signed-in operators, not the public contact page
+    return {"success": True, "outbox": email_outbox.stats()}
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from auth.get_current_user import get_current_user
 from models.Auth import authmeschema
 from services.onboard_service import CreatorOnboardingService as service
-from config.clients import db
+from services.creator_cache import creator_cache
 
 router = APIRouter(prefix="/api/creator/onboarding", tags=["Onboarding"])
 
@@ -16,9 +16,9 @@ async def get_onboarding_status(current_user: authmeschema = Depends(get_current
         creator_email = current_user.email
         
         # 2. Check the 'creators' collection for progress
-        creator_doc = db.collection("creators").document(creator_email).get()
+        user_data = await creator_cache.get_async(creator_email)
         
-        if not creator_doc.exists:
+        if user_data is None:
             # If no entry exists in the creators collection yet, they are at Step 1
             return {
                 "current_step": 1,
@@ -26,8 +26,6 @@ async def get_onboarding_status(current_user: authmeschema = Depends(get_current
                 "profile_live": False
             }
         
-        user_data = creator_doc.to_dict()
-        
         # 3. Use data from the creators collection
         current_step = user_data.get("current_step", 1)
         onboarding_status = user_data.get("onboarding_status", "not_started")
@@ -50,14 +48,13 @@ async def complete_onboarding(current_user: authmeschema = Depends(get_current_u
     try:
         creator_email = current_user.email
         
-        # Update the 'creators' document to finalize
-        db.collection("creators").document(creator_email).update({
-            "onboarding_status": "completed",
-            "profile_live": True,
-            "current_step": 4 # Final step
-        })
+        # Same transaction as the steps, so profile_completeness is recomputed with the final write
+        if not await service.finalize_profile(creator_email):
+            raise HTTPException(status_code=404, detail="Creator profile not found")
         
         return {"message": "Profile is now live!"}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Finalize Profile Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to finalize profile")
\ No newline at end of file
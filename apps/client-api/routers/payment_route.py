@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from typing import Optional
 
 from services import payment_service
+from config.async_db import run_db
 
 
 router = APIRouter(prefix="/api/escrow", tags=["Escrow Payments"])
@@ -36,7 +37,8 @@ async def create_order(request: CreateOrderRequest):
     Returns order_id and key_id for Razorpay Checkout.
     """
     try:
-        result = payment_service.create_razorpay_order(
+        result = await run_db(
+            payment_service.create_razorpay_order,
             client_id=request.client_id,
             creator_id=request.creator_id,
             request_id=request.request_id,
@@ -55,7 +57,8 @@ async def verify_payment(request: VerifyPaymentRequest):
     Called after Razorpay Checkout success callback.
     """
     try:
-        result = payment_service.verify_razorpay_payment(
+        result = await run_db(
+            payment_service.verify_razorpay_payment,
             razorpay_order_id=request.razorpay_order_id,
             razorpay_payment_id=request.razorpay_payment_id,
             razorpay_signature=request.razorpay_signature
@@ -71,7 +74,7 @@ async def verify_payment(request: VerifyPaymentRequest):
 async def check_status(order_or_payment_id: str):
     """Check payment status by order ID or payment ID"""
     try:
-        result = payment_service.check_payment_status(order_or_payment_id)
+        result = await run_db(payment_service.check_payment_status, order_or_payment_id)
         return result
     except HTTPException:
         raise
@@ -85,7 +88,7 @@ async def confirm_payment(request: ConfirmPaymentRequest):
     Client confirms delivery and releases payment to creator.
     """
     try:
-        result = payment_service.confirm_and_release_payment(request.payment_id)
+        result = await run_db(payment_service.confirm_and_release_payment, request.payment_id)
         return result
     except HTTPException:
         raise
@@ -96,7 +99,7 @@ async def confirm_payment(request: ConfirmPaymentRequest):
 @router.get("/{payment_id}")
 async def get_payment(payment_id: str):
     """Get payment details by ID"""
-    payment = payment_service.get_payment(payment_id)
+    payment = await run_db(payment_service.get_payment, payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
     return payment
@@ -105,7 +108,7 @@ async def get_payment(payment_id: str):
 @router.get("/balance/{user_id}")
 async def get_user_balance(user_id: str):
     """Get user's available balance"""
-    balance = payment_service.get_user_balance(user_id)
+    balance = await run_db(payment_service.get_user_balance, user_id)
     return {"user_id": user_id, "balance": balance}
 
 
@@ -116,7 +119,7 @@ async def get_payment_status_by_request(request_id: str):
     Useful for restoring state across devices.
     """
     try:
-        payment = payment_service.get_payment_by_request(request_id)
+        payment = await run_db(payment_service.get_payment_by_request, request_id)
         if not payment:
             return {
                 "success": False, 
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Request
 from services.claudinary_service import ClaudinaryService
 from models.portfolio import PortfolioSetupRequest, PortfolioSetupResponse
 from models.Auth import authmeschema  # Import the schema
 from auth.get_current_user import get_current_user
 from services.onboard_service import CreatorOnboardingService as service
+from services.style_index import index_creator_portfolio
 from config.clients import db # Ensure Firestore db is imported
+from services.creator_cache import creator_cache
+from services.upload_service import batch_uploader, PORTFOLIO_IMAGES, summarize
+from services.image_meta import extract_image_meta, prune_image_meta, save_image_meta, IMAGE_META_FIELD
+from fastapi.concurrency import run_in_threadpool
 from typing import List
 
 router = APIRouter(prefix="/api/creator/portfolio", tags=["Portfolio"])
@@ -29,10 +34,15 @@ async def setup_portfolio(request: PortfolioSetupRequest, current_user: authmesc
             "email": creator_email  # Link to Auth collection
         }
         
-        # Update the 'creators' collection specifically
-        db.collection("creators").document(creator_email).set(portfolio_data, merge=True)
+        # Keep dimensions/placeholders only for the images that are still in use
+        current = await creator_cache.get_async(creator_email)
+        if current and current.get(IMAGE_META_FIELD):
+            portfolio_data[IMAGE_META_FIELD] = prune_image_meta(
+                current, [request.profile_photo, *request.portfolio_images]
+            )
         
-        # Advance onboarding step using the email as the document ID
+        # Save to the 'creators' collection and advance the onboarding step in one write,
+        # using the email as the document ID
         await service.update_step_data(
             user_id=creator_email, 
             data=portfolio_data, 
@@ -40,10 +50,20 @@ async def setup_portfolio(request: PortfolioSetupRequest, current_user: authmesc
             flag_name="portfolio_completed"
         )
         
+        # Index style vectors for "looks like these references" search.
+        # Only new image URLs are downloaded; a failure here shouldn't fail the save.
+        try:
+            embeddings_generated = await run_in_threadpool(
+                index_creator_portfolio, creator_email, request.portfolio_images
+            )
+        except Exception as e:
+            print(f"Style Embedding Error: {str(e)}")
+            embeddings_generated = False
+        
         return PortfolioSetupResponse(
             message="Portfolio setup completed successfully",
             user_id=creator_email,
-            embeddings_generated=False 
+            embeddings_generated=embeddings_generated
         )
     
     except Exception as e:
@@ -60,13 +80,11 @@ async def get_portfolio(current_user: authmeschema = Depends(get_current_user)):
         creator_email = current_user.email
         
         # Retrieve from 'creators' collection
-        creator_doc = db.collection("creators").document(creator_email).get()
+        user_data = await creator_cache.get_async(creator_email)
         
-        if not creator_doc.exists:
+        if user_data is None:
             raise HTTPException(status_code=404, detail="Creator portfolio not found")
         
-        user_data = creator_doc.to_dict()
-        
         return {
             "user_id": creator_email,
             "profile_photo": user_data.get("profile_photo"),
@@ -98,12 +116,42 @@ async def upload_portfolio_image(
 
     try:
         # Pass the binary file object to the service
-        secure_url = ClaudinaryService.upload_image(file.file)
+        # The Cloudinary SDK and Pillow are blocking; keep them off the event loop
+        meta = await run_in_threadpool(extract_image_meta, file.file)
+        secure_url = await run_in_threadpool(ClaudinaryService.upload_image, file.file)
+        if meta:
+            await save_image_meta(current_user.email, [{"url": secure_url, **meta}])
         
         return {
             "message": "Image uploaded successfully",
-            "url": secure_url
+            "url": secure_url,
+            "meta": meta
         }
     except Exception as e:
         print(f"Upload Error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to upload image to Cloudinary")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to upload image to Cloudinary")
+
+
+@router.post("/upload-images")
+async def upload_portfolio_images(
+    request: Request,
+    current_user: authmeschema = Depends(get_current_user)
+):
+    """
+    Upload many portfolio images in one multipart request (any field name).
+    Files are type/size checked while they stream in and uploaded to
+    Cloudinary concurrently; the response has a result per file.
+    """
+    print(f"Batch upload initiated by: {current_user.email}")
+    results = await batch_uploader.upload_request(request, PORTFOLIO_IMAGES)
+    await save_image_meta(
+        current_user.email,
+        [{"url": r["url"], **r["meta"]} for r in results if r["success"] and r.get("meta")],
+    )
+    return summarize(results)
+
+
+@router.get("/upload-stats")
+def upload_stats():
+    return {"success": True, **batch_uploader.stats()}
+
@@ -3,7 +3,7 @@ from models.pricing import PricingSetupRequest, PricingSetupResponse
 from models.Auth import authmeschema
 from auth.get_current_user import get_current_user
 from services.onboard_service import CreatorOnboardingService as service
-from config.clients import db 
+from services.creator_cache import creator_cache
 
 router = APIRouter(prefix="/api/creator/pricing", tags=["Pricing"])
 
@@ -25,10 +25,7 @@ async def setup_pricing(request: PricingSetupRequest, current_user: authmeschema
             "email": creator_email
         }
         
-        # 3. Update the 'creators' collection specifically
-        db.collection("creators").document(creator_email).set(pricing_data, merge=True)
-        
-        # 4. Use the centralized service to update onboarding progress
+        # 3. Save to the 'creators' collection and update onboarding progress in one write
         await service.update_step_data(
             user_id=creator_email, 
             data=pricing_data, 
@@ -56,13 +53,11 @@ async def get_pricing(current_user: authmeschema = Depends(get_current_user)):
         creator_email = current_user.email
         
         # Retrieve from 'creators' collection
-        creator_doc = db.collection("creators").document(creator_email).get()
+        user_data = await creator_cache.get_async(creator_email)
         
-        if not creator_doc.exists:
+        if user_data is None:
             raise HTTPException(status_code=404, detail="Creator pricing data not found")
         
-        user_data = creator_doc.to_dict()
-        
         return {
             "user_id": creator_email,
             "starting_price": user_data.get("starting_price"),
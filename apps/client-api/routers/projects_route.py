@@ -1,7 +1,21 @@
 # routes/project_requests.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from firebase_admin import firestore
+from google.api_core.exceptions import NotFound
 from config.clients import db  # Use Firestore from clients.py
+from config.async_db import get_doc_dict
+from auth.get_current_user import get_current_user
+from models.Auth import authmeschema
+from services.pagination import paginate_query, parse_fields, page_size
+from services.chat_hub import chat_hub
+from services.creator_cache import creator_cache
+from services.doc_loader import DocLoader, get_doc_loader
+from services.projects_service import batched_writes, transactional_writes, write_stats
+from services.rating_service import RATING_STATS_FIELD, add_review, rating_fields, stats_from_reviews
 from uuid import uuid4
+import asyncio
+import json
 import time
 from models.projectRequest import (
     ProjectRequest,
@@ -19,6 +33,9 @@ PROJECT_MESSAGES_COLLECTION = "ProjectMessages"
 BOOKINGS_COLLECTION = "Bookings"
 REVIEWS_COLLECTION = "Reviews"
 
+# Seconds between keep-alives on idle chat streams (proxies drop silent connections)
+CHAT_HEARTBEAT_SECONDS = 25
+
 
 # =========================
 # PYDANTIC MODELS
@@ -55,9 +72,8 @@ def create_project_request(payload: ProjectRequestCreate):
         # Fetch creator's starting_price to store with the request
         creator_starting_price = None
         try:
-            creator_doc = db.collection("Users").document(payload.creatorId).get()
-            if creator_doc.exists:
-                creator_data = creator_doc.to_dict()
+            creator_data = creator_cache.get(payload.creatorId)
+            if creator_data is not None:
                 creator_starting_price = creator_data.get("starting_price")
         except:
             pass
@@ -133,9 +149,13 @@ def get_request_by_id(request_id: str):
 # RESPOND TO REQUEST
 # =========================
 @router.post("/api/project-request/{request_id}/respond")
-def respond_to_request(request_id: str, payload: ProjectRequestResponse):
+def respond_to_request(
+    request_id: str,
+    payload: ProjectRequestResponse,
+    loader: DocLoader = Depends(get_doc_loader),
+):
     doc_ref = db.collection(PROJECT_REQUESTS_COLLECTION).document(request_id)
-    doc = doc_ref.get()
+    doc = loader.get(doc_ref)
 
     if not doc.exists:
         raise HTTPException(status_code=404, detail="Request not found")
@@ -184,13 +204,15 @@ def respond_to_request(request_id: str, payload: ProjectRequestResponse):
                         pass
             
             # If no valid package price, try to get creator's starting_price
+            # (stored on the request at creation; the creator cache otherwise)
+            if not final_price or final_price <= 0:
+                final_price = request_data.get("creator_starting_price")
             if not final_price or final_price <= 0:
                 creator_id = request_data.get("creatorId")
                 if creator_id:
                     try:
-                        creator_doc = db.collection("Users").document(creator_id).get()
-                        if creator_doc.exists:
-                            creator_data = creator_doc.to_dict()
+                        creator_data = creator_cache.get(creator_id)
+                        if creator_data is not None:
                             final_price = creator_data.get("starting_price", 0)
                     except:
                         pass
@@ -209,18 +231,24 @@ def respond_to_request(request_id: str, payload: ProjectRequestResponse):
 # GET REQUESTS BY CLIENT
 # =========================
 @router.get("/api/projects/requests/{clientId}")
-def get_requests_by_client(clientId: str):
-    # Query Firestore for requests by this client
-    docs = db.collection(PROJECT_REQUESTS_COLLECTION).where("clientId", "==", clientId).stream()
-
-    client_requests = []
-    for doc in docs:
-        client_requests.append(doc.to_dict())
+def get_requests_by_client(
+    clientId: str,
+    limit: Optional[int] = Query(None, description="Page size; omit for every row"),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None)
+):
+    """Page through a client's project requests, newest first"""
+    query = db.collection(PROJECT_REQUESTS_COLLECTION).where("clientId", "==", clientId)
+    client_requests, next_cursor = paginate_query(
+        query, page_size(limit), cursor,
+        order_field="createdAt", descending=True, fields=parse_fields(fields)
+    )
 
     return {
         "success": True,
         "count": len(client_requests),
-        "data": client_requests
+        "data": client_requests,
+        "next_cursor": next_cursor
     }
 
 
@@ -228,22 +256,24 @@ def get_requests_by_client(clientId: str):
 # GET REQUESTS BY CREATOR
 # =========================
 @router.get("/api/projects/creator-requests/{creatorId}")
-def get_requests_by_creator(creatorId: str):
-    """Get all project requests sent to a specific creator"""
-    # Query Firestore for requests by this creator
-    docs = db.collection(PROJECT_REQUESTS_COLLECTION).where("creatorId", "==", creatorId).stream()
-
-    creator_requests = []
-    for doc in docs:
-        creator_requests.append(doc.to_dict())
-
-    # Sort by createdAt descending (newest first)
-    creator_requests.sort(key=lambda x: x.get("createdAt", 0), reverse=True)
+def get_requests_by_creator(
+    creatorId: str,
+    limit: Optional[int] = Query(None, description="Page size; omit for every row"),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None)
+):
+    """Page through project requests sent to a specific creator, newest first"""
+    query = db.collection(PROJECT_REQUESTS_COLLECTION).where("creatorId", "==", creatorId)
+    creator_requests, next_cursor = paginate_query(
+        query, page_size(limit), cursor,
+        order_field="createdAt", descending=True, fields=parse_fields(fields)
+    )
 
     return {
         "success": True,
         "count": len(creator_requests),
-        "data": creator_requests
+        "data": creator_requests,
+        "next_cursor": next_cursor
     }
 
 
@@ -254,16 +284,13 @@ def get_requests_by_creator(creatorId: str):
 def send_negotiation_message(request_id: str, payload: NegotiationMessage):
     """Send a message in the negotiation chat"""
     try:
-        # Verify request exists
+        # No existence read: the batched update of the request fails with
+        # NotFound if it doesn't exist, and then the message isn't written either
         request_ref = db.collection(PROJECT_REQUESTS_COLLECTION).document(request_id)
-        request_doc = request_ref.get()
-        if not request_doc.exists:
-            raise HTTPException(status_code=404, detail="Request not found")
-        
-        request_data = request_doc.to_dict()
 
         # Create message
         message_id = f"msg_{uuid4().hex[:8]}"
+        now = int(time.time() * 1000)
         message_ref = db.collection(PROJECT_MESSAGES_COLLECTION).document(request_id).collection("messages").document(message_id)
         
         message_data = {
@@ -272,7 +299,7 @@ def send_negotiation_message(request_id: str, payload: NegotiationMessage):
             "senderId": payload.senderId,
             "message": payload.message,
             "type": payload.type,
-            "timestamp": int(time.time() * 1000),
+            "timestamp": now,
             "status": "sent"
         }
         
@@ -281,59 +308,183 @@ def send_negotiation_message(request_id: str, payload: NegotiationMessage):
             message_data["price"] = payload.price
         if payload.deliverables:
             message_data["deliverables"] = payload.deliverables
-            
-        message_ref.set(message_data)
+
+        # Thread watermark for conditional GETs; the counter is atomic so
+        # concurrent senders can never leave a stale ETag behind
+        watermark = {
+            "lastMessageId": message_id,
+            "lastMessageAt": now,
+            "messageCount": firestore.Increment(1),
+        }
 
         # Update request status if it's an offer/counter
         if payload.type in ["offer", "counter"]:
-            request_ref.update({
+            request_update = {
                 "currentOffer": {
                     "price": payload.price,
                     "deliverables": payload.deliverables,
                     "from": payload.sender
                 },
                 "status": "negotiating",
-                "updatedAt": int(time.time() * 1000)
-            })
+                "updatedAt": now,
+                **watermark
+            }
         elif payload.type == "accepted":
-            request_ref.update({
+            request_update = {
                 "status": "accepted",
                 "finalOffer": {
                     "price": payload.price,
                     "deliverables": payload.deliverables
                 },
-                "updatedAt": int(time.time() * 1000)
-            })
+                "updatedAt": now,
+                **watermark
+            }
+        else:
+            request_update = watermark
+
+        # Message and request state land together or not at all
+        with batched_writes("negotiation") as batch:
+            batch.set(message_ref, message_data)
+            batch.update(request_ref, request_update)
+        chat_hub.publish(request_id, message_data)
 
         return {"success": True, "messageId": message_id}
+    except NotFound:
+        raise HTTPException(status_code=404, detail="Request not found")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _messages_etag(request_data: dict) -> Optional[str]:
+    """ETag from the thread watermark on the ProjectRequests doc"""
+    if "messageCount" not in request_data:
+        return None
+    return f'"{request_data["messageCount"]}-{request_data.get("lastMessageAt", 0)}"'
+
+
 @router.get("/api/projects/{request_id}/messages")
-def get_negotiation_messages(request_id: str):
-    """Get all messages for a negotiation"""
+def get_negotiation_messages(
+    request_id: str,
+    request: Request,
+    response: Response,
+    since: Optional[str] = Query(None, description="Only messages after this timestamp (ms) or message id"),
+):
+    """
+    Get messages for a negotiation, oldest first.
+    Send the last ETag as If-None-Match to get a 304 (no message reads)
+    when nothing changed, and `since` to fetch only newer messages.
+    """
     try:
+        request_ref = db.collection(PROJECT_REQUESTS_COLLECTION).document(request_id)
+        request_doc = request_ref.get()
+        request_data = request_doc.to_dict() if request_doc.exists else {}
+
+        etag = _messages_etag(request_data)
+        if_none_match = request.headers.get("if-none-match")
+        if etag and if_none_match and etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers={"ETag": etag})
+
         messages_ref = db.collection(PROJECT_MESSAGES_COLLECTION).document(request_id).collection("messages")
-        docs = messages_ref.stream()
-        
-        message_list = []
-        for doc in docs:
-            message_list.append(doc.to_dict())
-        
-        # Sort by timestamp
-        message_list.sort(key=lambda x: x.get("timestamp", 0))
-        
+        query = messages_ref.order_by("timestamp")
+        if since:
+            if since.isdigit():
+                query = query.where("timestamp", ">", int(since))
+            else:
+                anchor = messages_ref.document(since).get()
+                if not anchor.exists:
+                    raise HTTPException(status_code=400, detail="Unknown message id in 'since'")
+                query = query.start_after(anchor)
+
+        message_list = [doc.to_dict() for doc in query.stream()]
+
+        # Threads from before the watermark have no ETag until their next message
+        # (or until `python -m services.projects_service` backfills them)
+        if etag:
+            response.headers["ETag"] = etag
         return {
             "success": True,
             "messages": message_list
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _negotiation_participant(request_id: str, current_user: authmeschema) -> dict:
+    """The project request, if the signed-in user is its client or creator"""
+    request_data = await get_doc_dict(db.collection(PROJECT_REQUESTS_COLLECTION).document(request_id))
+    if request_data is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+    if current_user.email not in (request_data.get("clientId"), request_data.get("creatorId")):
+        raise HTTPException(status_code=403, detail="Not a participant in this negotiation")
+    return request_data
+
+
+@router.websocket("/api/projects/{request_id}/ws")
+async def negotiation_socket(websocket: WebSocket, request_id: str):
+    """
+    Push channel for a negotiation chat. Load history once with
+    GET /messages, then receive {"type": "message", "message": {...}}
+    for every new message. Messages are still sent with POST /messages.
+    Closes with 1008 unless the session cookie belongs to the client or
+    creator on the request.
+    """
+    try:
+        current_user = await get_current_user(websocket)
+        await _negotiation_participant(request_id, current_user)
+    except HTTPException as e:
+        print(f"🚫 Negotiation socket refused for {request_id}: {e.detail}")
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+
+    async def pump():
+        async for message in chat_hub.listen(request_id, heartbeat=CHAT_HEARTBEAT_SECONDS):
+            if message is None:
+                await websocket.send_json({"type": "ping"})
+            else:
+                await websocket.send_json({"type": "message", "message": message})
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        # Nothing is expected from the client; this returns when it disconnects
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pump_task.cancel()
+
+
+@router.get("/api/projects/{request_id}/events")
+async def negotiation_events(request_id: str, current_user: authmeschema = Depends(get_current_user)):
+    """Server-Sent Events fallback for clients that can't open a WebSocket"""
+    await _negotiation_participant(request_id, current_user)
+
+    async def stream():
+        yield "retry: 3000\n\n"
+        async for message in chat_hub.listen(request_id, heartbeat=CHAT_HEARTBEAT_SECONDS):
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"id: {message.get('id', '')}\nevent: message\ndata: {json.dumps(message)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/api/projects/write-stats")
+def get_write_stats():
+    """Commit counts and latency of the batched and transactional project writes, per flow"""
+    return {"success": True, "flows": write_stats()}
+
+
 # =========================
 # BOOKING ENDPOINTS
 # =========================
@@ -348,18 +499,25 @@ def get_booking(booking_id: str):
 
 
 @router.get("/api/bookings/client/{client_id}")
-def get_client_bookings(client_id: str):
-    """Get all bookings for a client"""
-    docs = db.collection(BOOKINGS_COLLECTION).where("clientId", "==", client_id).stream()
-    
-    client_bookings = []
-    for doc in docs:
-        client_bookings.append(doc.to_dict())
+def get_client_bookings(
+    client_id: str,
+    limit: Optional[int] = Query(None, description="Page size; omit for every row"),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None)
+):
+    """Page through a client's bookings"""
+    # Ordered by document ID: bookings aren't guaranteed a createdAt field,
+    # and ordering on a missing field would silently drop them
+    query = db.collection(BOOKINGS_COLLECTION).where("clientId", "==", client_id)
+    client_bookings, next_cursor = paginate_query(
+        query, page_size(limit), cursor, fields=parse_fields(fields)
+    )
     
     return {
         "success": True,
         "count": len(client_bookings),
-        "data": client_bookings
+        "data": client_bookings,
+        "next_cursor": next_cursor
     }
 
 
@@ -406,12 +564,9 @@ def confirm_event_completion(booking_id: str, payload: dict):
 def create_review(payload: ReviewCreate):
     """Submit a review for a booking"""
     try:
-        # Verify booking exists and is completed
         booking_ref = db.collection(BOOKINGS_COLLECTION).document(payload.bookingId)
-        booking_doc = booking_ref.get()
-        if not booking_doc.exists:
-            raise HTTPException(status_code=404, detail="Booking not found")
-        
+        creator_ref = db.collection("creators").document(payload.creatorId)
+
         # Create review
         review_id = f"rev_{uuid4().hex[:8]}"
         review_ref = db.collection(REVIEWS_COLLECTION).document(review_id)
@@ -427,17 +582,12 @@ def create_review(payload: ReviewCreate):
             "recommend": payload.recommend,
             "createdAt": int(time.time() * 1000)
         }
-        review_ref.set(review_data)
-
-        # Update booking with review
-        booking_ref.update({
-            "reviewId": review_id,
-            "reviewed": True,
-            "updatedAt": int(time.time() * 1000)
-        })
 
-        # Update creator's average rating
-        _update_creator_rating(payload.creatorId)
+        # Review, booking flag and creator rating aggregates commit together
+        transactional_writes(
+            "review_create", _create_review_transaction, booking_ref, review_ref, creator_ref, review_data
+        )
+        creator_cache.invalidate(payload.creatorId)
 
         return {"success": True, "reviewId": review_id}
     except HTTPException:
@@ -446,43 +596,53 @@ def create_review(payload: ReviewCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def _update_creator_rating(creator_id: str):
-    """Helper to update creator's average rating"""
-    try:
-        # Get all reviews for this creator
-        docs = db.collection(REVIEWS_COLLECTION).where("creatorId", "==", creator_id).stream()
-        
-        creator_reviews = []
-        for doc in docs:
-            creator_reviews.append(doc.to_dict())
-        
-        if creator_reviews:
-            avg_rating = sum(r.get("overallRating", 0) for r in creator_reviews) / len(creator_reviews)
-            
-            # Update in creators collection
-            creator_ref = db.collection("creators").document(creator_id)
-            creator_ref.update({
-                "rating": round(avg_rating, 1),
-                "reviewCount": len(creator_reviews)
-            })
-    except Exception as e:
-        print(f"Failed to update creator rating: {e}")
+@firestore.transactional
+def _create_review_transaction(transaction, booking_ref, review_ref, creator_ref, review_data):
+    # Reads first (Read before Write rule), both in one round trip
+    docs = {doc.reference.path: doc for doc in transaction.get_all([booking_ref, creator_ref])}
+    booking_doc = docs[booking_ref.path]
+    creator_doc = docs[creator_ref.path]
+    if not booking_doc.exists:
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    stats = None
+    if creator_doc.exists:
+        stats = (creator_doc.to_dict() or {}).get(RATING_STATS_FIELD)
+        if stats is None:
+            # Creator not backfilled yet: seed the aggregates from their reviews once
+            query = db.collection(REVIEWS_COLLECTION).where("creatorId", "==", review_data["creatorId"])
+            stats = stats_from_reviews(doc.to_dict() for doc in transaction.get(query))
+
+    transaction.set(review_ref, review_data)
+    transaction.update(booking_ref, {
+        "reviewId": review_data["id"],
+        "reviewed": True,
+        "updatedAt": review_data["createdAt"]
+    })
+
+    # Constant-cost update of the creator's average, histogram and aspect sums
+    if creator_doc.exists:
+        stats = add_review(stats, review_data["overallRating"], review_data["aspects"])
+        transaction.update(creator_ref, rating_fields(stats))
 
 
 @router.get("/api/reviews/creator/{creator_id}")
-def get_creator_reviews(creator_id: str):
-    """Get all reviews for a creator"""
-    docs = db.collection(REVIEWS_COLLECTION).where("creatorId", "==", creator_id).stream()
-    
-    creator_reviews = []
-    for doc in docs:
-        creator_reviews.append(doc.to_dict())
-    
-    # Sort by date descending
-    creator_reviews.sort(key=lambda x: x.get("createdAt", 0), reverse=True)
+def get_creator_reviews(
+    creator_id: str,
+    limit: Optional[int] = Query(None, description="Page size; omit for every row"),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None)
+):
+    """Page through a creator's reviews, newest first"""
+    query = db.collection(REVIEWS_COLLECTION).where("creatorId", "==", creator_id)
+    creator_reviews, next_cursor = paginate_query(
+        query, page_size(limit), cursor,
+        order_field="createdAt", descending=True, fields=parse_fields(fields)
+    )
     
     return {
         "success": True,
         "count": len(creator_reviews),
-        "data": creator_reviews
+        "data": creator_reviews,
+        "next_cursor": next_cursor
     }
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Request
 from models.verification import VerificationRequest, VerificationResponse, VerificationStatus
 from models.Auth import authmeschema
 from auth.get_current_user import get_current_user
 from services.onboard_service import CreatorOnboardingService as service
-from firebase_admin import firestore
 from datetime import datetime, timezone
 from config.clients import db 
+from services.creator_cache import creator_cache
+from fastapi.concurrency import run_in_threadpool
+from firebase_admin import firestore
 from services.claudinary_service import ClaudinaryService
+from services.upload_service import batch_uploader, VERIFICATION_DOCUMENTS, summarize
 
 # Prefix matches your standard API structure
 router = APIRouter(prefix="/api/creator/verification", tags=["Verification"])
@@ -29,19 +32,12 @@ async def submit_verification(request: VerificationRequest, current_user: authme
             "submitted_at": datetime.now(timezone.utc) 
         }
         
-        # 3. Fetch current creator data to manage the document list
-        creator_ref = db.collection("creators").document(creator_email)
-        creator_doc = creator_ref.get()
-        
-        user_data = creator_doc.to_dict() if creator_doc.exists else {}
-        current_docs = user_data.get("verification_documents", [])
-        current_docs.append(verification_entry)
-
-        # 4. Update the 'creators' collection
+        # 3. Update the 'creators' collection
+        # ArrayUnion appends server-side, so a submit on another worker (or a
+        # stale cached copy) can never drop documents already on the profile
         update_data = {
-            "verification_documents": current_docs,
+            "verification_documents": firestore.ArrayUnion([verification_entry]),
             "verification_status": VerificationStatus.PENDING.value,
-            "updated_at": firestore.SERVER_TIMESTAMP,
             "email": creator_email # Ensure email linkage
         }
 
@@ -74,7 +70,7 @@ async def upload_verification_document(
     
     try:
         # We use the document-specific method
-        secure_url = ClaudinaryService.upload_document(file.file)
+        secure_url = await run_in_threadpool(ClaudinaryService.upload_document, file.file)
         
         return {
             "message": "Document uploaded successfully",
@@ -87,6 +83,19 @@ async def upload_verification_document(
             detail="Failed to upload document to storage"
         )
 
+@router.post("/upload-documents")
+async def upload_verification_documents(
+    request: Request,
+    current_user: authmeschema = Depends(get_current_user)
+):
+    """
+    Upload several verification documents (PDFs or images) in one request,
+    concurrently, with a result per file.
+    """
+    print(f"Batch document upload initiated by: {current_user.email}")
+    results = await batch_uploader.upload_request(request, VERIFICATION_DOCUMENTS)
+    return summarize(results)
+
 @router.get("/status")
 async def get_verification_status(current_user: authmeschema = Depends(get_current_user)):
     """
@@ -94,17 +103,15 @@ async def get_verification_status(current_user: authmeschema = Depends(get_curre
     """
     try:
         creator_email = current_user.email
-        creator_doc = db.collection("creators").document(creator_email).get()
+        user_data = await creator_cache.get_async(creator_email)
         
-        if not creator_doc.exists:
+        if user_data is None:
             return {
                 "user_id": creator_email,
                 "verification_status": "not_started",
                 "verification_documents": []
             }
         
-        user_data = creator_doc.to_dict()
-        
         return {
             "user_id": creator_email,
             "verification_status": user_data.get("verification_status", "not_started"),
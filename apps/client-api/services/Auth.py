@@ -1,15 +1,19 @@
-import bcrypt
+from fastapi import HTTPException
 from config.clients import db
+from config.async_db import run_db
 from jwt_handler import create_jwt_token
+from services.password_hasher import password_hasher
 
-def signup_service(name, email, password, role):
+# Only the Firestore calls go through run_db; bcrypt is awaited on its own
+# process pool so a burst of logins can't tie up the Firestore threads.
+async def signup_service(name, email, password, role):
     try:
         users_ref = db.collection("users")
-        existing = users_ref.where("email", "==", email).limit(1).get()
+        existing = await run_db(users_ref.where("email", "==", email).limit(1).get)
         if len(existing) > 0:
             return {"error": "Email already registered"}
         
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed_password = await password_hasher.hash_password(password)
         
         user_data = {
             "name": name,
@@ -18,27 +22,30 @@ def signup_service(name, email, password, role):
             "role": role,
         }
         
-        _, new_user_ref = users_ref.add(user_data)
+        _, new_user_ref = await run_db(users_ref.add, user_data)
         user_id = new_user_ref.id
         
         token = create_jwt_token(email, role)
         # Return all fields needed for authmeschema
         return {"email": email, "token": token, "role": role}
         
+    except HTTPException:
+        # Hashing pool saturated (429/503)
+        raise
     except Exception as e:
         print(f"Creator Signup Error: {e}")
         return {"error": "Internal server error"}
 
-def login_service(email, password):
+async def login_service(email, password):
     try:
-        query = db.collection("users").where("email", "==", email).limit(1).get()
+        query = await run_db(db.collection("users").where("email", "==", email).limit(1).get)
         if not query:
             return {"error": "Invalid email or password"}
 
         user_doc = query[0]
         user_data = user_doc.to_dict()
 
-        if not bcrypt.checkpw(password.encode('utf-8'), user_data["password"].encode('utf-8')):
+        if not await password_hasher.check_password(password, user_data["password"]):
             return {"error": "Invalid email or password"}
 
         role = user_data.get("role")
@@ -46,6 +53,8 @@ def login_service(email, password):
         
         return {"email": email, "token": token, "role": role}
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Creator Login Error: {e}")
         return {"error": "Internal server error"}
\ No newline at end of file
@@ -0,0 +1,385 @@
+# apps/client-api/services/call_status.py
+import asyncio
+import copy
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from firebase_admin import firestore
+
+from config.async_db import get_doc_dict, run_db, stream_query
+from config.clients import db
+from config.env import settings
+from services.exotel_client import exotel_client, ExotelError
+from services.pagination import DOCUMENT_ID
+
+CALLS_COLLECTION = "Calls"
+# One doc per background job; whoever holds the lease runs it
+LEASES_COLLECTION = "Leases"
+RECONCILER_LEASE = "call_reconciler"
+
+# Exotel call states in the order they happen; a state never moves backwards
+ACTIVE_STATUSES = ["initiated", "queued", "ringing", "in-progress"]
+TERMINAL_STATUSES = {"completed", "failed", "busy", "no-answer", "canceled"}
+_STATUS_RANK = {status: rank for rank, status in enumerate(ACTIVE_STATUSES)}
+
+# Exotel bulk call details accept up to 100 sids per request
+RECONCILE_BATCH_SIZE = 100
+# Active calls are scanned in pages of this many until none are left
+RECONCILE_SCAN_PAGE = 500
+
+
+def is_terminal(status: Optional[str]) -> bool:
+    return status in TERMINAL_STATUSES
+
+
+def _rank(status: Optional[str]) -> int:
+    return len(ACTIVE_STATUSES) if is_terminal(status) else _STATUS_RANK.get(status, 0)
+
+
+def _supersedes(status: str, stored: Optional[str]) -> bool:
+    """Whether `status` may replace `stored`: never backwards, and a finished call stays finished"""
+    if is_terminal(stored):
+        return status == stored
+    return _rank(status) >= _rank(stored)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def callbacks_configured() -> bool:
+    return bool(settings.EXOTEL_STATUS_CALLBACK_URL and settings.EXOTEL_CALLBACK_TOKEN)
+
+
+def status_callback_params() -> Dict[str, str]:
+    """Extra connect parameters asking Exotel to post status changes back to us"""
+    if not callbacks_configured():
+        return {}
+    separator = "&" if "?" in settings.EXOTEL_STATUS_CALLBACK_URL else "?"
+    return {
+        "StatusCallback": (
+            f"{settings.EXOTEL_STATUS_CALLBACK_URL}{separator}"
+            f"{urlencode({'token': settings.EXOTEL_CALLBACK_TOKEN})}"
+        ),
+        "StatusCallbackEvents[0]": "answered",
+        "StatusCallbackEvents[1]": "terminal",
+    }
+
+
+class CallStatusCache:
+    """
+    Small LRU of `Calls` records keyed by call sid.
+
+    Finished calls never change, so they are kept for `ttl`. Active calls
+    can be moved on by a callback landing on another worker, so they expire
+    after ACTIVE_TTL and the next read goes back to Firestore.
+    """
+    ACTIVE_TTL = 5.0
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, call_sid: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(call_sid)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[call_sid]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(call_sid)
+            self.hits += 1
+            return copy.deepcopy(entry[0])
+
+    def peek_status(self, call_sid: str) -> Optional[str]:
+        """Last known status without touching hit/miss counters or expiry"""
+        with self._lock:
+            entry = self._entries.get(call_sid)
+            return entry[0].get("status") if entry else None
+
+    def put(self, call_sid: str, record: Dict):
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl if is_terminal(record.get("status")) else min(self.ttl, self.ACTIVE_TTL)
+        with self._lock:
+            self._entries[call_sid] = (copy.deepcopy(record), time.time() + ttl)
+            self._entries.move_to_end(call_sid)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+call_status_cache = CallStatusCache(settings.CALL_STATUS_CACHE_SIZE, settings.CALL_STATUS_CACHE_TTL_SECONDS)
+
+
+# =========================
+# RECORDS
+# =========================
+async def get_call_record(call_sid: str) -> Optional[Dict]:
+    """Our `Calls` record for a sid (cache first); None if we never placed it"""
+    record = call_status_cache.get(call_sid)
+    if record is not None:
+        return record
+    record = await get_doc_dict(db.collection(CALLS_COLLECTION).document(call_sid))
+    if record is not None:
+        call_status_cache.put(call_sid, record)
+    return record
+
+
+def _status_update(status: str, details: Dict, source: str) -> Dict:
+    return {
+        "status": status,
+        "details": details,
+        "status_source": source,
+        "updated_at": _now_ms(),
+    }
+
+
+@firestore.transactional
+def _advance_status(transaction, call_ref, fields: Dict) -> Optional[Dict]:
+    """
+    Compare-and-set on the stored status: the update is written only if it
+    supersedes what Firestore holds, whichever worker wrote that. Returns
+    the resulting record, or None if the update was dropped.
+    """
+    snapshot = call_ref.get(transaction=transaction)
+    if not snapshot.exists:
+        print(f"⚠️ Status for unknown call {call_ref.id} ignored")
+        return None
+    record = snapshot.to_dict() or {}
+    if not _supersedes(fields["status"], record.get("status")):
+        return None
+    transaction.update(call_ref, fields)
+    return {**record, **fields}
+
+
+async def record_status(call_sid: str, status: str, details: Dict, source: str = "callback") -> Optional[Dict]:
+    """
+    Store a status reported by Exotel. Returns the fields written, or None
+    if the update was ignored (the call already reached a later state, or
+    it isn't one of ours).
+    """
+    # Cheap early out; the transaction below is what actually guards the record
+    known = call_status_cache.peek_status(call_sid)
+    if known is not None and not _supersedes(status, known):
+        return None
+
+    fields = _status_update(status, details, source)
+    call_ref = db.collection(CALLS_COLLECTION).document(call_sid)
+    record = await run_db(_advance_status, db.transaction(), call_ref, fields)
+    if record is None:
+        return None
+    call_status_cache.put(call_sid, record)
+    return fields
+
+
+async def get_live_call_record(call_sid: str) -> Optional[Dict]:
+    """
+    get_call_record, kept current without callbacks: when no StatusCallback
+    is configured, an active call is looked up on Exotel (as every status
+    read used to be) and the result stored. With callbacks configured the
+    stored record is already current and Exotel isn't called.
+    """
+    record = await get_call_record(call_sid)
+    if record is None or is_terminal(record.get("status")) or callbacks_configured() or not settings.EXOTEL_SID:
+        return record
+    try:
+        result = await exotel_client.get_call(call_sid)
+    except ExotelError as e:
+        print(f"⚠️ Exotel status lookup failed for {call_sid}: {e.detail}")
+        return record
+    call = result.get("Call", {})
+    status = call.get("Status")
+    if status and status != record.get("status"):
+        fields = await record_status(call_sid, status, call, source="poll")
+        if fields is not None:
+            record = {**record, **fields}
+    return record
+
+
+@firestore.transactional
+def _reconcile_transaction(transaction, changes: List[Tuple[str, Dict]]) -> List[Tuple[str, Dict]]:
+    """Apply the changes that still supersede the stored status; returns (sid, record) for each"""
+    refs = {call_sid: db.collection(CALLS_COLLECTION).document(call_sid) for call_sid, _ in changes}
+    stored = {doc.id: doc for doc in transaction.get_all(list(refs.values()))}
+    applied = []
+    for call_sid, fields in changes:
+        doc = stored.get(call_sid)
+        if doc is None or not doc.exists:
+            continue
+        record = doc.to_dict() or {}
+        if _supersedes(fields["status"], record.get("status")):
+            transaction.update(refs[call_sid], fields)
+            applied.append((call_sid, {**record, **fields}))
+    return applied
+
+
+# =========================
+# RECONCILER
+# =========================
+@firestore.transactional
+def _acquire_lease(transaction, lease_ref, owner: str, duration_ms: int) -> bool:
+    """Take or renew the lease if it is free, expired or already ours"""
+    snapshot = lease_ref.get(transaction=transaction)
+    lease = snapshot.to_dict() if snapshot.exists else {}
+    now = _now_ms()
+    if lease.get("owner") not in (None, owner) and lease.get("expires_at", 0) > now:
+        return False
+    transaction.set(lease_ref, {"owner": owner, "expires_at": now + duration_ms})
+    return True
+
+
+class CallReconciler:
+    """
+    Periodically catches callbacks that never arrived: calls still active
+    in our records after the grace period are looked up with Exotel's bulk
+    call details API (100 sids per request) and every changed status is
+    committed in one transaction per page, re-checked against the stored
+    status so a callback that landed meanwhile is never rolled back.
+
+    Every worker runs the loop, but a pass only happens on the worker
+    holding the Firestore lease. It is renewed each pass and lapses after
+    a few missed intervals, so another worker takes over if its owner dies.
+    """
+    LEASE_INTERVALS = 3
+
+    def __init__(self, interval: float, grace: float):
+        self.interval = interval
+        self.grace = grace
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.checked = 0
+        self.updated = 0
+        self.errors = 0
+        self.last_run_at: Optional[int] = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.leader = False
+
+    async def _hold_lease(self) -> bool:
+        lease_ref = db.collection(LEASES_COLLECTION).document(RECONCILER_LEASE)
+        duration_ms = int(self.interval * self.LEASE_INTERVALS * 1000)
+        leader = await run_db(_acquire_lease, db.transaction(), lease_ref, self.owner, duration_ms)
+        if leader and not self.leader:
+            print(f"📞 Call reconciler lease taken by {self.owner}")
+        self.leader = leader
+        return leader
+
+    def start(self):
+        if self._task is not None or self.interval <= 0 or db is None or not settings.EXOTEL_SID:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        print("📞 Call status reconciler started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            # Jitter spreads the workers' lease checks
+            await asyncio.sleep(self.interval * random.uniform(0.8, 1.2))
+            try:
+                if await self._hold_lease():
+                    await self.run_once()
+            except Exception as e:
+                self.errors += 1
+                print(f"❌ Call reconcile failed: {e}")
+
+    async def _stale_calls(self) -> List[Dict]:
+        """Every active call past the grace period, paged by document ID so none are starved"""
+        cutoff = _now_ms() - int(self.grace * 1000)
+        query = (
+            db.collection(CALLS_COLLECTION)
+            .where("status", "in", ACTIVE_STATUSES)
+            .order_by(DOCUMENT_ID)
+        )
+        stale = []
+        last_id = None
+        while True:
+            page = query.start_after({DOCUMENT_ID: last_id}) if last_id else query
+            docs = await stream_query(page.limit(RECONCILE_SCAN_PAGE))
+            for doc in docs:
+                record = doc.to_dict()
+                if max(record.get("created_at", 0), record.get("updated_at", 0)) <= cutoff:
+                    stale.append({**record, "call_sid": doc.id})
+            if len(docs) < RECONCILE_SCAN_PAGE:
+                return stale
+            last_id = docs[-1].id
+
+    async def run_once(self) -> Dict:
+        """One pass; returns how many calls were checked and updated"""
+        stale = await self._stale_calls()
+        known = {call["call_sid"]: call.get("status") for call in stale}
+        sids = list(known)
+        updated = 0
+
+        for start in range(0, len(sids), RECONCILE_BATCH_SIZE):
+            page = sids[start:start + RECONCILE_BATCH_SIZE]
+            try:
+                calls = await exotel_client.get_calls(page)
+            except ExotelError as e:
+                self.errors += 1
+                print(f"⚠️ Exotel bulk lookup failed: {e.detail}")
+                continue
+
+            changes = []
+            for call in calls:
+                call_sid, status = call.get("Sid"), call.get("Status")
+                if call_sid in known and status and status != known[call_sid] and _supersedes(status, known[call_sid]):
+                    changes.append((call_sid, _status_update(status, call, "reconciler")))
+            if changes:
+                applied = await run_db(_reconcile_transaction, db.transaction(), changes)
+                for call_sid, record in applied:
+                    call_status_cache.put(call_sid, record)
+                updated += len(applied)
+
+        self.runs += 1
+        self.checked += len(sids)
+        self.updated += updated
+        self.last_run_at = _now_ms()
+        if updated:
+            print(f"📞 Reconciled {updated}/{len(sids)} stale calls")
+        return {"checked": len(sids), "updated": updated}
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._task is not None,
+            "leader": self.leader,
+            "interval_seconds": self.interval,
+            "grace_seconds": self.grace,
+            "runs": self.runs,
+            "checked": self.checked,
+            "updated": self.updated,
+            "errors": self.errors,
+            "last_run_at": self.last_run_at,
+        }
+
+
+call_reconciler = CallReconciler(settings.CALL_RECONCILE_INTERVAL_SECONDS, settings.CALL_RECONCILE_GRACE_SECONDS)
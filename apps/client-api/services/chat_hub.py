@@ -0,0 +1,161 @@
+# apps/client-api/services/chat_hub.py
+import asyncio
+import threading
+import time
+from collections import defaultdict, deque
+from typing import AsyncIterator, Dict, Optional, Set
+
+from config.clients import db
+from services.db_usage import firestore_usage
+
+PROJECT_MESSAGES_COLLECTION = "ProjectMessages"
+
+
+class ChatHub:
+    """
+    In-process pub/sub for negotiation chats, one topic per request_id.
+
+    Messages sent through this worker are published directly. While a topic
+    has subscribers, a Firestore listener on the new messages of that thread
+    picks up messages written by other workers, so each message costs one
+    read per worker instead of one full thread read per viewer per poll.
+    """
+    QUEUE_SIZE = 256
+    RECENT_IDS = 512
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._watches: Dict[str, object] = {}
+        self._recent: Dict[str, deque] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    # =========================
+    # SUBSCRIPTIONS
+    # =========================
+    async def subscribe(self, request_id: str) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        with self._lock:
+            first = not self._subscribers[request_id]
+            self._subscribers[request_id].add(queue)
+        if first:
+            self._watch(request_id)
+        return queue
+
+    def unsubscribe(self, request_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(request_id)
+            if subscribers is None:
+                return
+            subscribers.discard(queue)
+            if subscribers:
+                return
+            del self._subscribers[request_id]
+            self._recent.pop(request_id, None)
+            watch = self._watches.pop(request_id, None)
+        if watch is not None:
+            watch.unsubscribe()
+
+    async def listen(self, request_id: str, heartbeat: Optional[float] = None) -> AsyncIterator[Optional[Dict]]:
+        """Yield messages for a thread; yields None every `heartbeat` seconds of silence"""
+        queue = await self.subscribe(request_id)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.unsubscribe(request_id, queue)
+
+    # =========================
+    # PUBLISHING
+    # =========================
+    def publish(self, request_id: str, message: Dict):
+        """Thread-safe; safe to call from sync routes and listener threads"""
+        with self._lock:
+            if not self._subscribers.get(request_id) or self._loop is None:
+                return
+            # The listener echoes messages this worker already published
+            recent = self._recent.setdefault(request_id, deque(maxlen=self.RECENT_IDS))
+            message_id = message.get("id")
+            if message_id is not None:
+                if message_id in recent:
+                    return
+                recent.append(message_id)
+            self.published += 1
+            loop = self._loop
+        try:
+            loop.call_soon_threadsafe(self._fan_out, request_id, message)
+        except RuntimeError:
+            # Event loop already closed (shutdown)
+            pass
+
+    def _fan_out(self, request_id: str, message: Dict):
+        for queue in list(self._subscribers.get(request_id, ())):
+            try:
+                queue.put_nowait(message)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self.dropped += 1
+                print(f"⚠️ Chat subscriber for {request_id} is lagging; dropped a message")
+
+    # =========================
+    # CROSS-WORKER LISTENER
+    # =========================
+    def _watch(self, request_id: str):
+        if db is None:
+            return
+        since = int(time.time() * 1000)
+        query = (
+            db.collection(PROJECT_MESSAGES_COLLECTION)
+            .document(request_id)
+            .collection("messages")
+            .where("timestamp", ">=", since)
+        )
+        try:
+            watch = query.on_snapshot(firestore_usage.count_listener(
+                lambda snapshot, changes, read_time: self._on_snapshot(request_id, changes)
+            ))
+        except Exception as e:
+            print(f"❌ Could not attach chat listener for {request_id}: {e}")
+            return
+        with self._lock:
+            if request_id in self._subscribers and request_id not in self._watches:
+                self._watches[request_id] = watch
+                return
+        # Everyone left (or another listener won) while attaching
+        watch.unsubscribe()
+
+    def _on_snapshot(self, request_id: str, changes):
+        try:
+            for change in changes:
+                if change.type.name == "ADDED":
+                    self.publish(request_id, change.document.to_dict() or {})
+        except Exception as e:
+            print(f"❌ Chat listener error for {request_id}: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "topics": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "listeners": len(self._watches),
+                "published": self.published,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+            }
+
+    def close(self):
+        with self._lock:
+            watches = list(self._watches.values())
+            self._watches.clear()
+        for watch in watches:
+            watch.unsubscribe()
+
+
+chat_hub = ChatHub()
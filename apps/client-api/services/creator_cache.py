@@ -0,0 +1,193 @@
+# apps/client-api/services/creator_cache.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from config.async_db import run_db
+from config.clients import db
+from config.env import settings
+
+CREATORS_COLLECTION = "creators"
+
+# Plain values we can merge into a cached doc ourselves; anything else
+# (SERVER_TIMESTAMP, ArrayUnion, Increment, ...) is resolved by Firestore,
+# so the entry is dropped instead.
+_PLAIN_TYPES = (str, int, float, bool, datetime, type(None))
+
+
+def _is_plain(value) -> bool:
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def merge_into(target: Dict, data: Dict):
+    """set(merge=True) semantics: nested maps merge, everything else replaces"""
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_into(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+class CreatorDocCache:
+    """
+    Read-through LRU + TTL cache of raw `creators` documents keyed by doc id.
+
+    - Our own writes are mirrored with write_through(), which applies the
+      change to the cached copy (or drops it when Firestore computes the
+      final value, e.g. SERVER_TIMESTAMP or ArrayUnion).
+    - apply_snapshot() is fed by the creator catalog's collection listener so
+      edits made by other workers refresh cached entries.
+    - TTL bounds staleness if no listener is running.
+    Missing documents are cached too (as None) so repeat 404s are free.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[Dict], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-key epochs, kept only while a fill for that key is in flight: a
+        # write to the key bumps its epoch so a read that raced it is not cached
+        self._fills: Dict[str, int] = {}
+        self._epochs: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.refreshes = 0
+
+    # =========================
+    # READS
+    # =========================
+    def _lookup(self, creator_id: str) -> Tuple[bool, Optional[Dict]]:
+        with self._lock:
+            entry = self._entries.get(creator_id)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[creator_id]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(creator_id)
+            self.hits += 1
+            data = entry[0]
+        return True, copy.deepcopy(data)
+
+    def _fetch(self, creator_id: str) -> Optional[Dict]:
+        with self._lock:
+            epoch = self._epochs.get(creator_id, 0)
+            self._fills[creator_id] = self._fills.get(creator_id, 0) + 1
+        data, fetched = None, False
+        try:
+            doc = db.collection(CREATORS_COLLECTION).document(creator_id).get()
+            data = doc.to_dict() if doc.exists else None
+            fetched = True
+        finally:
+            with self._lock:
+                if fetched and epoch == self._epochs.get(creator_id, 0):
+                    self._store(creator_id, data)
+                self._fills[creator_id] -= 1
+                if not self._fills[creator_id]:
+                    del self._fills[creator_id]
+                    self._epochs.pop(creator_id, None)
+        return copy.deepcopy(data)
+
+    def _bump(self, creator_id: str):
+        """Caller holds the lock"""
+        if creator_id in self._fills:
+            self._epochs[creator_id] = self._epochs.get(creator_id, 0) + 1
+
+    def get(self, creator_id: str) -> Optional[Dict]:
+        """Creator document as a dict (None if it doesn't exist). Blocking on a miss."""
+        found, data = self._lookup(creator_id)
+        return data if found else self._fetch(creator_id)
+
+    async def get_async(self, creator_id: str) -> Optional[Dict]:
+        """Same as get(), but a miss is read on the Firestore pool"""
+        found, data = self._lookup(creator_id)
+        return data if found else await run_db(self._fetch, creator_id)
+
+    # =========================
+    # WRITES / INVALIDATION
+    # =========================
+    def _store(self, creator_id: str, data: Optional[Dict]):
+        if self.max_size <= 0:
+            return
+        self._entries[creator_id] = (data, time.time() + self.ttl)
+        self._entries.move_to_end(creator_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def write_through(self, creator_id: str, data: Dict, merge: bool = False, update: bool = False):
+        """
+        Mirror a write we just made: set() (merge=False), set(merge=True)
+        (nested maps merge) or update() (top-level fields replace).
+        """
+        if not _is_plain(data) or any("." in key for key in data):
+            # Transforms and dotted field paths are resolved server-side
+            self.invalidate(creator_id)
+            return
+        with self._lock:
+            self._bump(creator_id)
+            entry = self._entries.get(creator_id)
+            if not merge and not update:
+                self._store(creator_id, copy.deepcopy(data))
+            elif entry is not None and entry[0] is not None:
+                if update:
+                    entry[0].update(copy.deepcopy(data))
+                else:
+                    merge_into(entry[0], data)
+                self._entries.move_to_end(creator_id)
+            elif entry is not None and merge:
+                # set(merge=True) on a doc we know is missing creates exactly `data`
+                self._store(creator_id, copy.deepcopy(data))
+            else:
+                # Merging into a doc we don't hold (or believed missing): re-read next time
+                self._entries.pop(creator_id, None)
+
+    def invalidate(self, creator_id: str):
+        with self._lock:
+            self._bump(creator_id)
+            if self._entries.pop(creator_id, None) is not None:
+                self.invalidations += 1
+
+    def apply_snapshot(self, creator_id: str, data: Optional[Dict]):
+        """Listener hook: refresh entries we already hold, ignore the rest"""
+        with self._lock:
+            self._bump(creator_id)
+            if creator_id in self._entries:
+                self._entries[creator_id] = (copy.deepcopy(data), time.time() + self.ttl)
+                self.refreshes += 1
+
+    def clear(self):
+        with self._lock:
+            for creator_id in self._fills:
+                self._bump(creator_id)
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "refreshes": self.refreshes,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+creator_cache = CreatorDocCache(settings.CREATOR_CACHE_SIZE, settings.CREATOR_CACHE_TTL_SECONDS)
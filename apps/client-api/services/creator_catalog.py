@@ -0,0 +1,283 @@
+# apps/client-api/services/creator_catalog.py
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Set
+
+from config.clients import db
+from services.db_usage import firestore_usage
+from services.creators_service import (
+    CREATORS_COLLECTION,
+    ALLOWED_ROLES,
+    transform_creator_data,
+)
+
+
+class _SortedColumn:
+    """Sorted (value, id) pairs answering range lookups with bisect."""
+
+    def __init__(self):
+        self._keys: List[float] = []
+        self._ids: List[str] = []
+        self._values: Dict[str, float] = {}
+
+    def add(self, doc_id: str, value: float):
+        pos = bisect_right(self._keys, value)
+        self._keys.insert(pos, value)
+        self._ids.insert(pos, doc_id)
+        self._values[doc_id] = value
+
+    def remove(self, doc_id: str):
+        value = self._values.pop(doc_id, None)
+        if value is None:
+            return
+        pos = bisect_left(self._keys, value)
+        while self._ids[pos] != doc_id:
+            pos += 1
+        del self._keys[pos]
+        del self._ids[pos]
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> Set[str]:
+        lo = bisect_left(self._keys, low) if low is not None else 0
+        hi = bisect_right(self._keys, high) if high is not None else len(self._keys)
+        return set(self._ids[lo:hi])
+
+
+class CreatorCatalog:
+    """
+    Per-process index of the creators collection.
+    A Firestore on_snapshot listener keeps it current, so discover queries
+    are answered from posting lists and sorted columns without any reads.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._watch = None
+        self._listeners: List[Callable[[str, Optional[Dict]], None]] = []
+        self.version = 0
+        self._reset()
+        self.last_read_time: Optional[datetime] = None
+        self.last_applied_at: Optional[float] = None
+
+    def _reset(self):
+        self._docs: Dict[str, Dict] = {}
+        self._by_role: Dict[str, Set[str]] = defaultdict(set)
+        self._by_city: Dict[str, Set[str]] = defaultdict(set)
+        self._by_style: Dict[str, Set[str]] = defaultdict(set)
+        self._prices = _SortedColumn()
+        self._ratings = _SortedColumn()
+        self._all_cache: Optional[List[Dict]] = None
+
+    # =========================
+    # LISTENER LIFECYCLE
+    # =========================
+    def start(self):
+        """Attach the snapshot listener; the first snapshot primes the index."""
+        if self._watch is not None or db is None:
+            return
+        self._watch = db.collection(CREATORS_COLLECTION).on_snapshot(
+            firestore_usage.count_listener(self._on_snapshot)
+        )
+        print("📇 Creator catalog listener attached")
+
+    def stop(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+        self._ready.clear()
+
+    def add_listener(self, callback: Callable[[str, Optional[Dict]], None]):
+        """Also hand every raw change (doc_id, data or None if removed) to `callback`."""
+        self._listeners.append(callback)
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def _on_snapshot(self, col_snapshot, changes, read_time):
+        try:
+            applied = []
+            with self._lock:
+                for change in changes:
+                    doc = change.document
+                    if change.type.name == "REMOVED":
+                        self._remove(doc.id)
+                        applied.append((doc.id, None))
+                    else:
+                        data = doc.to_dict() or {}
+                        # One malformed creator must not hold back the rest of the batch
+                        if self._upsert_or_skip(doc.id, data):
+                            applied.append((doc.id, data))
+                self.version += 1
+                self.last_read_time = read_time
+                self.last_applied_at = time.time()
+            if not self._ready.is_set():
+                self._ready.set()
+                print(f"✅ Creator catalog primed with {len(self._docs)} creators")
+            for callback in self._listeners:
+                for doc_id, data in applied:
+                    try:
+                        callback(doc_id, data)
+                    except Exception as e:
+                        print(f"⚠️ Creator catalog listener failed on {doc_id}: {e}")
+        except Exception as e:
+            print(f"❌ Creator catalog snapshot error: {e}")
+
+    # =========================
+    # INDEX MAINTENANCE
+    # =========================
+    def load(self, docs: Dict[str, Dict]):
+        """Replace the whole index from raw documents (used without a listener)."""
+        with self._lock:
+            self._reset()
+            for doc_id, doc_data in docs.items():
+                self._upsert_or_skip(doc_id, doc_data)
+            self.version += 1
+            self.last_applied_at = time.time()
+        self._ready.set()
+
+    def _upsert_or_skip(self, doc_id: str, doc_data: Dict) -> bool:
+        """_upsert, logging and dropping a doc that can't be indexed; False if dropped"""
+        try:
+            self._upsert(doc_id, doc_data)
+            return True
+        except Exception as e:
+            # Don't keep serving the previous version of a doc we can no longer read
+            self._remove(doc_id)
+            print(f"⚠️ Creator catalog skipped {doc_id}: {e}")
+            return False
+
+    def _upsert(self, doc_id: str, doc_data: Dict):
+        role = (doc_data.get("role") or "").lower()
+        if role not in ALLOWED_ROLES:
+            self._remove(doc_id)
+            return
+
+        # Everything that can fail on bad data happens before the index is touched
+        transformed = transform_creator_data(doc_data, doc_id)
+        price = float(transformed.get("starting_price") or 0)
+        rating = float(transformed.get("rating") or 0)
+
+        self._remove(doc_id)
+        self._all_cache = None
+        self._docs[doc_id] = transformed
+        self._by_role[role].add(doc_id)
+        self._by_city[(transformed.get("city") or "").lower()].add(doc_id)
+        for style in transformed.get("style_tags") or []:
+            self._by_style[str(style).lower()].add(doc_id)
+        self._prices.add(doc_id, price)
+        self._ratings.add(doc_id, rating)
+
+    def _remove(self, doc_id: str):
+        old = self._docs.pop(doc_id, None)
+        if old is None:
+            return
+        self._all_cache = None
+
+        self._discard(self._by_role, (old.get("role") or "").lower(), doc_id)
+        self._discard(self._by_city, (old.get("city") or "").lower(), doc_id)
+        for style in old.get("style_tags") or []:
+            self._discard(self._by_style, str(style).lower(), doc_id)
+        self._prices.remove(doc_id)
+        self._ratings.remove(doc_id)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], key: str, doc_id: str):
+        ids = postings.get(key)
+        if ids is None:
+            return
+        ids.discard(doc_id)
+        if not ids:
+            del postings[key]
+
+    # =========================
+    # QUERIES
+    # =========================
+    def query(self, filters: Dict = None) -> List[Dict]:
+        """Same filter semantics as creators_service.get_all_creators."""
+        filters = filters or {}
+        with self._lock:
+            candidates: List[Set[str]] = []
+
+            category = (filters.get("category") or "").lower()
+            if category:
+                # The discover "category" is the creator's role
+                candidates.append(self._by_role.get(category, set()))
+
+            location = (filters.get("location") or "").lower()
+            if location:
+                # Distinct cities are few, so a substring scan over the keys is cheap
+                candidates.append(self._union(
+                    ids for city, ids in self._by_city.items() if location in city
+                ))
+
+            styles = filters.get("styles")
+            if styles:
+                candidates.append(self._union(
+                    self._by_style.get(style.lower(), set()) for style in styles
+                ))
+
+            price_min = filters.get("price_min") or None
+            price_max = filters.get("price_max") or None
+            if price_min is not None or price_max is not None:
+                candidates.append(self._prices.range(price_min, price_max))
+
+            if filters.get("rating"):
+                candidates.append(self._ratings.range(filters["rating"], None))
+
+            if not candidates:
+                return self.all()
+
+            candidates.sort(key=len)
+            result = set(candidates[0])
+            for ids in candidates[1:]:
+                if not result:
+                    break
+                result &= ids
+
+            return [self._docs[doc_id] for doc_id in sorted(result)]
+
+    def get(self, doc_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._docs.get(doc_id)
+
+    def all(self) -> List[Dict]:
+        with self._lock:
+            if self._all_cache is None:
+                self._all_cache = [self._docs[doc_id] for doc_id in sorted(self._docs)]
+            return list(self._all_cache)
+
+    @staticmethod
+    def _union(groups) -> Set[str]:
+        result: Set[str] = set()
+        for ids in groups:
+            result |= ids
+        return result
+
+    def status(self) -> Dict:
+        """Freshness info for monitoring listener lag."""
+        with self._lock:
+            read_time = self.last_read_time
+            applied_at = self.last_applied_at
+            return {
+                "ready": self.is_ready(),
+                "listening": self._watch is not None,
+                "creators": len(self._docs),
+                "version": self.version,
+                "read_time": read_time.isoformat() if read_time else None,
+                "applied_at": (
+                    datetime.fromtimestamp(applied_at, tz=timezone.utc).isoformat()
+                    if applied_at else None
+                ),
+                "seconds_since_snapshot": (
+                    round(time.time() - read_time.timestamp(), 3) if read_time else None
+                ),
+            }
+
+
+creator_catalog = CreatorCatalog()
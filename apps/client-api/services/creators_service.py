@@ -1,6 +1,9 @@
 # apps/client-api/services/creators_service.py
 from config.clients import db
-from typing import Optional, Dict, Any, List
+from services.pagination import DOCUMENT_ID, encode_cursor, decode_cursor
+from services.creator_cache import creator_cache
+from services.image_meta import image_meta_by_url
+from typing import Optional, Dict, Any, List, Tuple
 
 CREATORS_COLLECTION = "creators"  # Make sure this matches your Firebase collection name
 ALLOWED_ROLES = ["photographer", "videographer", "both"]
@@ -57,6 +60,9 @@ def transform_creator_data(doc_data: Dict, doc_id: str) -> Dict:
         "portfolio_images": doc_data.get("portfolio_images", []),
         "portfolio_videos": doc_data.get("portfolio_videos", []),
         
+        # Width/height, blur placeholder and dominant colour per image url
+        "imageMeta": image_meta_by_url(doc_data),
+        
         # Verification
         "verified": doc_data.get("verification_status") == "verified",
         "verification_status": doc_data.get("verification_status", "pending"),
@@ -68,6 +74,63 @@ def transform_creator_data(doc_data: Dict, doc_id: str) -> Dict:
         "reviews": doc_data.get("reviews", 0),
     }
 
+# Discover card: one key per value (no name/full_name, profileImage/profile_photo,
+# tags/style_tags, ... pairs) and a short portfolio preview
+CARD_FIELDS = (
+    "id", "name", "role", "specialisation", "profileImage", "city", "categories", "tags",
+    "starting_price", "price", "price_unit", "currency", "negotiable",
+    "rating", "reviews", "verified", "years_experience",
+)
+CARD_PREVIEW_IMAGES = 4
+
+
+def card_view(creator: Dict) -> Dict:
+    """Compact form of a transform_creator_data() result for list pages"""
+    card = {field: creator.get(field) for field in CARD_FIELDS}
+    preview = (creator.get("portfolioImages") or [])[:CARD_PREVIEW_IMAGES]
+    card["portfolioImages"] = preview
+    image_meta = creator.get("imageMeta") or {}
+    card["imageMeta"] = {
+        url: image_meta[url] for url in (creator.get("profileImage"), *preview) if url in image_meta
+    }
+    return card
+
+
+def _matches_filters(transformed: Dict, filters: Dict) -> bool:
+    """Discover filters applied to a transformed creator"""
+    # Category filter
+    if filters.get("category"):
+        if transformed.get("role", "").lower() != filters["category"].lower():
+            return False
+    
+    # Location filter
+    if filters.get("location"):
+        creator_city = transformed.get("city", "").lower()
+        filter_location = filters["location"].lower()
+        if filter_location not in creator_city:
+            return False
+    
+    # Price filters
+    if filters.get("price_min"):
+        if (transformed.get("starting_price") or 0) < filters["price_min"]:
+            return False
+    if filters.get("price_max"):
+        if (transformed.get("starting_price") or 0) > filters["price_max"]:
+            return False
+    
+    # Rating filter
+    if filters.get("rating"):
+        if (transformed.get("rating") or 0) < filters["rating"]:
+            return False
+    
+    # Styles filter
+    if filters.get("styles"):
+        creator_styles = [s.lower() for s in (transformed.get("style_tags") or [])]
+        if not any(style.lower() in creator_styles for style in filters["styles"]):
+            return False
+
+    return True
+
 def get_all_creators(filters: Dict = None) -> List[Dict]:
     """Fetch all creators (photographers/videographers only) from Firebase with optional filters"""
     try:
@@ -86,37 +149,8 @@ def get_all_creators(filters: Dict = None) -> List[Dict]:
             transformed = transform_creator_data(doc_data, doc.id)
             
             # Apply filters if provided
-            if filters:
-                # Category filter
-                if filters.get("category"):
-                    if transformed.get("role", "").lower() != filters["category"].lower():
-                        continue
-                
-                # Location filter
-                if filters.get("location"):
-                    creator_city = transformed.get("city", "").lower()
-                    filter_location = filters["location"].lower()
-                    if filter_location not in creator_city:
-                        continue
-                
-                # Price filters
-                if filters.get("price_min"):
-                    if (transformed.get("starting_price") or 0) < filters["price_min"]:
-                        continue
-                if filters.get("price_max"):
-                    if (transformed.get("starting_price") or 0) > filters["price_max"]:
-                        continue
-                
-                # Rating filter
-                if filters.get("rating"):
-                    if (transformed.get("rating") or 0) < filters["rating"]:
-                        continue
-                
-                # Styles filter
-                if filters.get("styles"):
-                    creator_styles = [s.lower() for s in (transformed.get("style_tags") or [])]
-                    if not any(style.lower() in creator_styles for style in filters["styles"]):
-                        continue
+            if filters and not _matches_filters(transformed, filters):
+                continue
             
             creators.append(transformed)
         
@@ -127,6 +161,35 @@ def get_all_creators(filters: Dict = None) -> List[Dict]:
         print(f"❌ Firestore error in get_all_creators: {e}")
         return []
 
+def get_creators_page(filters: Dict, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of creators in document-ID order, read from Firestore in
+    limit-sized batches with start_after, so reads scale with the page
+    rather than the collection. Returns (creators, next_cursor).
+    """
+    base_query = db.collection(CREATORS_COLLECTION).order_by(DOCUMENT_ID)
+    query = base_query
+    if cursor:
+        query = base_query.start_after({DOCUMENT_ID: decode_cursor(cursor)[0]})
+
+    creators = []
+    while True:
+        docs = list(query.limit(limit).stream())
+        for doc in docs:
+            doc_data = doc.to_dict()
+            if (doc_data.get("role") or "").lower() not in ALLOWED_ROLES:
+                continue
+            transformed = transform_creator_data(doc_data, doc.id)
+            if filters and not _matches_filters(transformed, filters):
+                continue
+            creators.append(transformed)
+            if len(creators) == limit:
+                return creators, encode_cursor([doc.id])
+
+        if len(docs) < limit:
+            return creators, None
+        query = base_query.start_after({DOCUMENT_ID: docs[-1].id})
+
 def get_featured_creators() -> List[Dict]:
     """Fetch all live creators from Firebase"""
     try:
@@ -164,11 +227,9 @@ def get_featured_creators() -> List[Dict]:
 def get_creator_by_id(creator_id: str) -> Optional[Dict]:
     """Fetch a single creator by ID"""
     try:
-        doc_ref = db.collection(CREATORS_COLLECTION).document(creator_id)
-        doc = doc_ref.get()
-        if doc.exists:
-            doc_data = doc.to_dict()
-            return transform_creator_data(doc_data, doc.id)
+        doc_data = creator_cache.get(creator_id)
+        if doc_data is not None:
+            return transform_creator_data(doc_data, creator_id)
         return None
     except Exception as e:
         print(f"❌ get_creator_by_id error: {e}")
@@ -180,6 +241,7 @@ def push_gallery_item(creator_id: str, image_url: str) -> bool:
         from google.cloud.firestore import ArrayUnion
         doc_ref = db.collection(CREATORS_COLLECTION).document(creator_id)
         doc_ref.update({"gallery": ArrayUnion([image_url])})
+        creator_cache.invalidate(creator_id)
         return True
     except Exception as e:
         print("push_gallery_item error:", e)
@@ -189,6 +251,7 @@ def upsert_creator_section(creator_id: str, section: str, value):
     try:
         doc_ref = db.collection(CREATORS_COLLECTION).document(creator_id)
         doc_ref.update({section: value})
+        creator_cache.write_through(creator_id, {section: value}, update=True)
         return True
     except Exception as e:
         print("upsert_creator_section error:", e)
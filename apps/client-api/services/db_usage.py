@@ -0,0 +1,401 @@
+# apps/client-api/services/db_usage.py
+import contextvars
+import json
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+
+from config.env import settings
+from utils_py.metrics import Counter, Histogram, metrics, route_template
+
+# Firestore bills a query that returns nothing as one read
+MIN_QUERY_READS = 1
+READS_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+USAGE_HEADER = b"x-firestore-usage"
+
+
+def _parse_budgets(raw: str) -> Dict[str, int]:
+    """"GET /api/creators/=200,/api/projects/{request_id}=50" -> {key: reads}"""
+    budgets = {}
+    for item in raw.split(","):
+        key, sep, value = item.rpartition("=")
+        if sep and key.strip() and value.strip().isdigit():
+            budgets[key.strip()] = int(value)
+    return budgets
+
+
+class FirestoreUsage:
+    """
+    Documents read, written and RPCs made. One per HTTP request (see
+    FirestoreUsageMiddleware); pool threads working for the request add to
+    it through the context run_db copies, so it is locked.
+    """
+
+    def __init__(self, scope: Optional[Dict] = None, tracker: Optional["FirestoreUsageTracker"] = None):
+        self.scope = scope
+        self.tracker = tracker
+        self.budget_mode = tracker.budget_mode if tracker else "log"
+        self.reads = 0
+        self.writes = 0
+        self.rpcs = 0
+        self.status: Optional[int] = None
+        self._budget: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"] if self.scope else ""
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope) if self.scope else ""
+
+    @property
+    def budget(self) -> int:
+        # Resolved on first use: the route is only known once routing has run
+        if self._budget is None:
+            tracker = self.tracker or firestore_usage
+            self._budget = tracker.budget_for(self.method, self.route) if self.scope else 0
+        return self._budget
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and self.reads > self.budget
+
+    def add(self, reads: int = 0, writes: int = 0, rpcs: int = 0):
+        with self._lock:
+            self.reads += reads
+            self.writes += writes
+            self.rpcs += rpcs
+
+    def as_dict(self) -> Dict:
+        return {"reads": self.reads, "writes": self.writes, "rpcs": self.rpcs}
+
+
+_current: contextvars.ContextVar[Optional[FirestoreUsage]] = contextvars.ContextVar("firestore_usage", default=None)
+
+
+class _CountingStream:
+    """Wraps a streaming RPC's responses, counting documents as they're consumed"""
+
+    def __init__(self, responses, usage: FirestoreUsage, count, minimum: int = 0):
+        self._responses = iter(responses)
+        self._usage = usage
+        self._count = count
+        self._remaining_minimum = minimum
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            response = next(self._responses)
+        except StopIteration:
+            if self._remaining_minimum:
+                self._usage.add(reads=self._remaining_minimum)
+                self._remaining_minimum = 0
+            raise
+        reads = self._count(response)
+        if reads:
+            self._remaining_minimum = max(0, self._remaining_minimum - reads)
+            self._usage.add(reads=reads)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._responses, name)
+
+
+def _batch_get_reads(response) -> int:
+    # Found and missing documents are both billed
+    return 1 if ("found" in response or response.missing) else 0
+
+
+def _query_reads(response) -> int:
+    return 1 if "document" in response else 0
+
+
+def _commit_writes(request) -> int:
+    writes = request.get("writes") if isinstance(request, dict) else getattr(request, "writes", None)
+    return len(writes or [])
+
+
+class FirestoreUsageTracker:
+    """
+    Per-request Firestore accounting.
+
+    instrument(client) wraps the GAPIC methods underneath a firebase_admin
+    Firestore client, so every document read (gets, get_all, queries,
+    transactions) and write (set/update/delete, batches) is counted exactly
+    once, however the handler reached it. Counts go to the usage of the
+    current request, or to `background` for scripts. on_snapshot listeners
+    stream over a separate Watch RPC; wrap their callbacks with
+    count_listener() to count the documents they receive in `background`.
+
+    Per route: firestore_* series on /metrics and a summary in stats().
+    Routes reading more than their budget are logged, or with
+    FIRESTORE_BUDGET_MODE=fail, answered with a 500 instead of the
+    handler's response (see FirestoreUsageMiddleware).
+    """
+
+    def __init__(self, default_budget: int, route_budgets: Dict[str, int], budget_mode: str, header: bool):
+        self.default_budget = default_budget
+        self.route_budgets = route_budgets
+        self.budget_mode = budget_mode
+        self.header = header
+        self.background = FirestoreUsage()
+        self._instrumented = set()
+        self._captures: List["UsageCapture"] = []
+        self._routes: Dict[tuple, Dict] = {}
+        labels = ("method", "route")
+        self.reads = Counter("firestore_reads_total", "Firestore documents read, by route", labels)
+        self.writes = Counter("firestore_writes_total", "Firestore documents written, by route", labels)
+        self.rpcs = Counter("firestore_rpcs_total", "Firestore round trips, by route", labels)
+        self.reads_per_request = Histogram(
+            "firestore_reads_per_request", "Documents read per request", labels, READS_BUCKETS
+        )
+        self.over_budget = Counter("firestore_read_budget_exceeded_total", "Requests over their read budget", labels)
+        metrics.register(self.reads, self.writes, self.rpcs, self.reads_per_request, self.over_budget)
+
+    def budget_for(self, method: str, route: str) -> int:
+        return self.route_budgets.get(f"{method} {route}", self.route_budgets.get(route, self.default_budget))
+
+    # Instrumentation
+    def _usage(self) -> FirestoreUsage:
+        return _current.get() or self.background
+
+    def _wrap(self, call, count=None, minimum: int = 0, writes=None):
+        def wrapper(*args, **kwargs):
+            usage = self._usage()
+            if writes is not None:
+                usage.add(writes=writes(kwargs.get("request", args[0] if args else None)), rpcs=1)
+            else:
+                usage.add(rpcs=1)
+            response = call(*args, **kwargs)
+            if count is None:
+                return response
+            return _CountingStream(response, usage, count, minimum)
+        return wrapper
+
+    def _instrument_local(self, client):
+        # LocalClient (config/local_store.py) makes one call per round trip instead of GAPIC RPCs
+        batch_get, run_query, commit = client._batch_get, client._run_query, client._commit
+
+        def counted_batch_get(paths):
+            snapshots = batch_get(paths)
+            self._usage().add(reads=len(snapshots), rpcs=1)
+            return snapshots
+
+        def counted_run_query(query):
+            snapshots = run_query(query)
+            self._usage().add(reads=max(MIN_QUERY_READS, len(snapshots)), rpcs=1)
+            return snapshots
+
+        def counted_commit(writes, *args, **kwargs):
+            if writes:
+                self._usage().add(writes=len(writes), rpcs=1)
+            return commit(writes, *args, **kwargs)
+
+        client._batch_get, client._run_query, client._commit = counted_batch_get, counted_run_query, counted_commit
+
+    def instrument(self, client):
+        """Count the traffic of a firestore.Client or LocalClient (safe to call more than once)"""
+        if client is None or id(client) in self._instrumented:
+            return
+        if not hasattr(client, "_firestore_api"):
+            self._instrument_local(client)
+            self._instrumented.add(id(client))
+            return
+        api = client._firestore_api
+        api.batch_get_documents = self._wrap(api.batch_get_documents, count=_batch_get_reads)
+        api.run_query = self._wrap(api.run_query, count=_query_reads, minimum=MIN_QUERY_READS)
+        # Aggregations (count()) bill one read per batch of up to 1000 index entries
+        api.run_aggregation_query = self._wrap(api.run_aggregation_query, count=lambda response: 0, minimum=1)
+        api.commit = self._wrap(api.commit, writes=_commit_writes)
+        api.batch_write = self._wrap(api.batch_write, writes=_commit_writes)
+        for name in ("begin_transaction", "rollback", "list_documents", "list_collection_ids", "partition_query"):
+            setattr(api, name, self._wrap(getattr(api, name)))
+        self._instrumented.add(id(client))
+
+    def count_listener(self, callback):
+        """Wrap an on_snapshot callback so each added or modified document counts as a read"""
+        def counted(docs, changes, read_time):
+            reads = sum(1 for change in changes if change.type.name != "REMOVED")
+            self.background.add(reads=reads)
+            return callback(docs, changes, read_time)
+        return counted
+
+    # Per request
+    def record(self, usage: FirestoreUsage):
+        """Called once a request is done (on the event loop)"""
+        labels = (usage.method, usage.route)
+        self.reads.inc(labels, usage.reads)
+        self.writes.inc(labels, usage.writes)
+        self.rpcs.inc(labels, usage.rpcs)
+        self.reads_per_request.observe(labels, usage.reads)
+
+        summary = self._routes.get(labels)
+        if summary is None:
+            summary = self._routes[labels] = {"requests": 0, "reads": 0, "writes": 0, "rpcs": 0, "max_reads": 0, "over_budget": 0}
+        summary["requests"] += 1
+        summary["reads"] += usage.reads
+        summary["writes"] += usage.writes
+        summary["rpcs"] += usage.rpcs
+        summary["max_reads"] = max(summary["max_reads"], usage.reads)
+
+        if usage.over_budget:
+            self.over_budget.inc(labels)
+            summary["over_budget"] += 1
+            print(
+                f"⚠️ Firestore read budget exceeded: {usage.method} {usage.route} "
+                f"read {usage.reads} docs (budget {usage.budget}, {usage.rpcs} RPCs)"
+            )
+
+        for capture in list(self._captures):
+            capture.requests.append(usage)
+
+    def stats(self, top: int = 20) -> Dict:
+        routes = sorted(self._routes.items(), key=lambda item: item[1]["reads"], reverse=True)[:top]
+        return {
+            "budget_mode": self.budget_mode,
+            "default_budget": self.default_budget,
+            "route_budgets": self.route_budgets,
+            "background": self.background.as_dict(),
+            "routes": [
+                {
+                    "method": method,
+                    "route": route,
+                    **summary,
+                    "avg_reads": round(summary["reads"] / summary["requests"], 2),
+                }
+                for (method, route), summary in routes
+            ],
+        }
+
+
+class FirestoreUsageMiddleware:
+    """
+    Pure ASGI middleware: one FirestoreUsage per HTTP request, optional
+    debug header.
+
+    In fail mode the budget is checked when the response starts, which for
+    ordinary responses is after the handler has returned. Handlers that
+    catch Exception and return an empty result can't hide an overrun: the
+    whole response is replaced with a 500. Streaming responses start
+    before they read, so they are only logged.
+    """
+
+    def __init__(self, app, tracker: FirestoreUsageTracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        usage = FirestoreUsage(scope, self.tracker)
+        rejected = False
+
+        def usage_header():
+            return (USAGE_HEADER, f"reads={usage.reads}; writes={usage.writes}; rpcs={usage.rpcs}".encode())
+
+        async def send_wrapper(message):
+            nonlocal rejected
+            if message["type"] == "http.response.start":
+                if usage.budget_mode == "fail" and usage.over_budget:
+                    rejected = True
+                    await self._reject(send, usage, usage_header() if self.tracker.header else None)
+                    return
+                usage.status = message["status"]
+                if self.tracker.header:
+                    message["headers"] = list(message.get("headers", [])) + [usage_header()]
+            elif rejected:
+                # Body of the response that was replaced
+                return
+            await send(message)
+
+        token = _current.set(usage)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self.tracker.record(usage)
+
+    @staticmethod
+    async def _reject(send, usage: FirestoreUsage, header: Optional[tuple]):
+        usage.status = 500
+        body = json.dumps({
+            "detail": f"Firestore read budget exceeded for {usage.route}: {usage.reads} reads (budget {usage.budget})"
+        }).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if header:
+            headers.append(header)
+        await send({"type": "http.response.start", "status": 500, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+firestore_usage = FirestoreUsageTracker(
+    settings.FIRESTORE_READ_BUDGET,
+    _parse_budgets(settings.FIRESTORE_ROUTE_READ_BUDGETS),
+    settings.FIRESTORE_BUDGET_MODE,
+    settings.FIRESTORE_USAGE_HEADER,
+)
+
+
+def install_firestore_usage(app: FastAPI, client):
+    """Count `client`'s reads/writes per request; summary at GET /api/db-usage/stats"""
+    firestore_usage.instrument(client)
+    app.add_middleware(FirestoreUsageMiddleware, tracker=firestore_usage)
+
+    @app.get("/api/db-usage/stats", include_in_schema=False)
+    async def firestore_usage_stats():
+        return {"success": True, **firestore_usage.stats()}
+
+
+# =========================
+# TEST HELPERS
+# =========================
+@contextmanager
+def track_usage():
+    """Usage of the Firestore calls made inside the block (this context only)"""
+    usage = FirestoreUsage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+
+
+class UsageCapture:
+    def __init__(self):
+        self.requests: List[FirestoreUsage] = []
+
+    def for_route(self, route: str, method: Optional[str] = None) -> List[FirestoreUsage]:
+        return [u for u in self.requests if u.route == route and (method is None or u.method == method)]
+
+    def assert_max_reads(self, route: str, max_reads: int, method: Optional[str] = None):
+        matched = self.for_route(route, method)
+        assert matched, f"No requests captured for {route}"
+        worst = max(u.reads for u in matched)
+        assert worst <= max_reads, f"{route} read {worst} Firestore docs (expected at most {max_reads})"
+
+
+@contextmanager
+def capture_requests(tracker: Optional[FirestoreUsageTracker] = None):
+    """
+    Collects the usage of every request finished inside the block, from any
+    thread (TestClient runs the app on its own loop):
+
+        with capture_requests() as captured:
+            client.get(f"/api/creators/{creator_id}")
+        captured.assert_max_reads("/api/creators/{creator_id}", 2)
+    """
+    tracker = tracker or firestore_usage
+    capture = UsageCapture()
+    tracker._captures.append(capture)
+    try:
+        yield capture
+    finally:
+        tracker._captures.remove(capture)
@@ -0,0 +1,76 @@
+# apps/client-api/services/doc_loader.py
+import threading
+from typing import Dict, List, Optional
+
+from config.async_db import run_db
+from config.clients import db
+
+
+class DocLoader:
+    """
+    Request-scoped document loader.
+
+    Every document a handler asks for is read at most once per request, and
+    all refs passed to one load_many() call are fetched with a single
+    `db.get_all` RPC instead of one get() per document:
+
+        request_snap, creator_snap = await loader.load_many_async(request_ref, creator_ref)
+
+    Use one loader per request (see get_doc_loader); it holds snapshots, so
+    it must not outlive the request or be shared between users.
+    """
+
+    def __init__(self, client=None):
+        self._db = client or db
+        self._snapshots: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.rpcs = 0
+        self.docs_read = 0
+        self.deduped = 0
+
+    def load_many(self, *refs) -> List:
+        """Snapshots for `refs`, in order; missing docs come back with exists=False"""
+        with self._lock:
+            wanted = {}
+            for ref in refs:
+                if ref.path in self._snapshots or ref.path in wanted:
+                    self.deduped += 1
+                else:
+                    wanted[ref.path] = ref
+
+        if wanted:
+            snapshots = list(self._db.get_all(list(wanted.values())))
+            with self._lock:
+                self.rpcs += 1
+                self.docs_read += len(snapshots)
+                for snapshot in snapshots:
+                    self._snapshots[snapshot.reference.path] = snapshot
+
+        with self._lock:
+            return [self._snapshots[ref.path] for ref in refs]
+
+    def get(self, ref):
+        return self.load_many(ref)[0]
+
+    def get_dict(self, ref) -> Optional[Dict]:
+        snapshot = self.get(ref)
+        return snapshot.to_dict() if snapshot.exists else None
+
+    async def load_many_async(self, *refs) -> List:
+        """load_many() on the Firestore pool"""
+        return await run_db(self.load_many, *refs)
+
+    async def get_async(self, ref):
+        return (await self.load_many_async(ref))[0]
+
+    async def get_dict_async(self, ref) -> Optional[Dict]:
+        snapshot = await self.get_async(ref)
+        return snapshot.to_dict() if snapshot.exists else None
+
+    def stats(self) -> Dict:
+        return {"rpcs": self.rpcs, "docs_read": self.docs_read, "deduped": self.deduped}
+
+
+def get_doc_loader() -> DocLoader:
+    """FastAPI dependency: a fresh loader per request, shared by its sub-dependencies"""
+    return DocLoader()
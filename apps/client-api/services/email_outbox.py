@@ -0,0 +1,251 @@
+# apps/client-api/services/email_outbox.py
+import asyncio
+import random
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+
+from config.env import settings
+
+
+class _Outgoing:
+    def __init__(self, message: EmailMessage):
+        self.message = message
+        self.attempts = 0
+
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx replies for this message (bad recipient, rejected content) won't succeed on retry"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class EmailOutbox:
+    """
+    Outbound mail queue.
+
+    Routes enqueue a message and return at once; one worker task drains
+    the bounded queue in batches over a single authenticated SMTP session
+    (EHLO/STARTTLS/AUTH once, not per message). The session is reopened
+    when the server drops it and closed after `idle_timeout` without mail.
+    Temporary failures are retried with full-jitter backoff up to
+    `max_retries` times; permanent (5xx) rejections are dropped.
+
+    smtplib is blocking, so the session lives on a dedicated thread.
+    """
+    BACKOFF_BASE = 2.0
+    BACKOFF_MAX = 120.0
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        user: str = "",
+        password: str = "",
+        starttls: bool = True,
+        timeout: float = 10.0,
+        queue_size: int = 1000,
+        batch_size: int = 20,
+        max_retries: int = 5,
+        idle_timeout: float = 60.0,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.idle_timeout = idle_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._retrying = 0
+        self.enqueued = 0
+        self.sent = 0
+        self.retried = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.batches = 0
+        self.connections = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.host)
+
+    def start(self):
+        if self._task is not None or not self.configured:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        print("📧 Email outbox started")
+
+    def enqueue(self, message: EmailMessage) -> bool:
+        """False when mail isn't configured or the queue is full"""
+        if self._queue is None:
+            self.rejected += 1
+            return False
+        try:
+            self._queue.put_nowait(_Outgoing(message))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """Give queued mail a few seconds to go out, then close the session"""
+        if self._task is None:
+            return
+        deadline = time.monotonic() + drain_timeout
+        while (not self._queue.empty() or self._retrying) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=False)
+        if not self._queue.empty():
+            print(f"⚠️ Email outbox stopped with {self._queue.qsize()} unsent messages")
+        self._task = None
+        self._queue = None
+
+    # Worker
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                first = await asyncio.wait_for(self._queue.get(), timeout=self.idle_timeout)
+            except asyncio.TimeoutError:
+                await loop.run_in_executor(self._executor, self._close)
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                failed = await loop.run_in_executor(self._executor, self._send_batch, batch)
+            except Exception as e:
+                # Couldn't open a session at all: the whole batch is retried
+                print(f"❌ SMTP connection failed: {e}")
+                await loop.run_in_executor(self._executor, self._close)
+                failed = batch
+
+            for item in failed:
+                self._schedule_retry(item)
+
+    def _schedule_retry(self, item: _Outgoing):
+        item.attempts += 1
+        if item.attempts > self.max_retries:
+            self.dropped += 1
+            print(f"❌ Email to {item.message['To']} dropped after {self.max_retries} retries")
+            return
+        self.retried += 1
+        self._retrying += 1
+        delay = random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (item.attempts - 1)))
+        asyncio.get_running_loop().call_later(delay, self._requeue, item)
+
+    def _requeue(self, item: _Outgoing):
+        self._retrying -= 1
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    # SMTP session (smtp thread only)
+    def _connect(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                smtp.ehlo()
+                if self.starttls:
+                    smtp.starttls()
+                    smtp.ehlo()
+                if self.user:
+                    smtp.login(self.user, self.password)
+            except Exception:
+                smtp.close()
+                raise
+            self._smtp = smtp
+            self.connections += 1
+        return self._smtp
+
+    def _close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                self._smtp.close()
+            self._smtp = None
+
+    def _send_one(self, message: EmailMessage):
+        try:
+            self._connect().send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Server closed an idle session: reconnect once and resend
+            self._close()
+            self._connect().send_message(message)
+
+    def _send_batch(self, batch: List[_Outgoing]) -> List[_Outgoing]:
+        """Sends over the shared session; returns the messages worth retrying"""
+        self.batches += 1
+        failed = []
+        for item in batch:
+            try:
+                self._send_one(item.message)
+                self.sent += 1
+            except Exception as e:
+                if _is_permanent(e):
+                    self.dropped += 1
+                    print(f"❌ Email to {item.message['To']} rejected: {e}")
+                    continue
+                print(f"⚠️ Email send failed, will retry: {e}")
+                if not isinstance(e, smtplib.SMTPResponseException):
+                    # Connection-level trouble: start the next message on a fresh session
+                    self._close()
+                failed.append(item)
+        return failed
+
+    def stats(self) -> Dict:
+        return {
+            "configured": self.configured,
+            "running": self._task is not None,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "retrying": self._retrying,
+            "connected": self._smtp is not None,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "connections": self.connections,
+        }
+
+
+email_outbox = EmailOutbox(
+    settings.SMTP_HOST,
+    port=settings.SMTP_PORT,
+    user=settings.SMTP_USER,
+    password=settings.SMTP_PASSWORD,
+    starttls=settings.SMTP_STARTTLS,
+    timeout=settings.SMTP_TIMEOUT_SECONDS,
+    queue_size=settings.EMAIL_QUEUE_SIZE,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    max_retries=settings.EMAIL_MAX_RETRIES,
+    idle_timeout=settings.EMAIL_IDLE_SECONDS,
+)
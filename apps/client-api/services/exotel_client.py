@@ -0,0 +1,171 @@
+# apps/client-api/services/exotel_client.py
+import asyncio
+import random
+from typing import Dict, List, Optional
+
+import httpx
+
+from config.env import settings
+
+# Retried for any request: the gateway answered without the call being placed
+GATEWAY_ERRORS = {502, 503, 504}
+
+
+def _error_detail(response: httpx.Response):
+    try:
+        return response.json() if response.text else "Unknown error"
+    except ValueError:
+        return response.text
+
+
+class ExotelError(Exception):
+    def __init__(self, detail, status_code: Optional[int] = None):
+        super().__init__(str(detail))
+        self.detail = detail
+        self.status_code = status_code
+
+
+class ExotelClient:
+    """
+    Shared async client for the Exotel REST API.
+
+    One keep-alive connection pool per worker (no TLS handshake per call),
+    explicit connect/read timeouts, at most `max_concurrency` requests in
+    flight, and bounded retries with full-jitter backoff. Status reads
+    retry on any 5xx or timeout; connect (which places a real call) only
+    retries when the request provably wasn't processed: connection errors
+    and 502/503/504.
+    """
+    BACKOFF_BASE = 0.2
+    BACKOFF_MAX = 2.0
+
+    def __init__(
+        self,
+        base_url: str,
+        sid: str,
+        api_key: str,
+        api_token: str,
+        max_connections: int = 20,
+        max_concurrency: int = 20,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        verify=True,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.sid = sid
+        self._auth = (api_key, api_token)
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.verify = verify
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=self._auth,
+                timeout=self.timeout,
+                verify=self.verify,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** attempt))
+
+    async def _request(self, method: str, path: str, idempotent: bool, **kwargs) -> Dict:
+        client = self._ensure_client()
+        retryable = (lambda code: code >= 500) if idempotent else (lambda code: code in GATEWAY_ERRORS)
+
+        attempt = 0
+        while True:
+            self.requests += 1
+            try:
+                async with self._semaphore:
+                    response = await client.request(method, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                # Never reached Exotel: always safe to retry
+                error = ExotelError(f"Could not reach Exotel: {e}")
+            except httpx.TimeoutException as e:
+                error = ExotelError(f"Exotel timed out: {e}")
+                if not idempotent:
+                    self.failures += 1
+                    raise error
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                detail = _error_detail(response)
+                error = ExotelError(detail, response.status_code)
+                if not retryable(response.status_code):
+                    self.failures += 1
+                    raise error
+
+            if attempt >= self.max_retries:
+                self.failures += 1
+                raise error
+            self.retries += 1
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    # =========================
+    # API
+    # =========================
+    async def connect_call(self, from_number: str, to_number: str, caller_id: str, **extra) -> Dict:
+        """Bridge two numbers through the masked caller id (Calls/connect)"""
+        data = {"From": from_number, "To": to_number, "CallerId": caller_id, **extra}
+        return await self._request(
+            "POST", f"/v1/Accounts/{self.sid}/Calls/connect.json", idempotent=False, data=data
+        )
+
+    async def get_call(self, call_sid: str) -> Dict:
+        return await self._request("GET", f"/v1/Accounts/{self.sid}/Calls/{call_sid}.json", idempotent=True)
+
+    async def get_calls(self, call_sids: List[str]) -> List[Dict]:
+        """Bulk call details for up to 100 sids in one request"""
+        result = await self._request(
+            "GET",
+            f"/v1/Accounts/{self.sid}/Calls.json",
+            idempotent=True,
+            params={"Sid": ",".join(call_sids), "PageSize": len(call_sids)},
+        )
+        return result.get("Calls", [])
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "max_connections": self.max_connections,
+            "max_concurrency": self.max_concurrency,
+        }
+
+
+exotel_client = ExotelClient(
+    base_url=settings.EXOTEL_BASE_URL,
+    sid=settings.EXOTEL_SID,
+    api_key=settings.EXOTEL_API_KEY,
+    api_token=settings.EXOTEL_API_TOKEN,
+    max_connections=settings.EXOTEL_MAX_CONNECTIONS,
+    max_concurrency=settings.EXOTEL_MAX_CONCURRENCY,
+    connect_timeout=settings.EXOTEL_CONNECT_TIMEOUT,
+    read_timeout=settings.EXOTEL_READ_TIMEOUT,
+    max_retries=settings.EXOTEL_MAX_RETRIES,
+)
@@ -1,12 +1,17 @@
-import smtplib
 from email.message import EmailMessage
-from config.email import email_settings
+from config.env import settings
+from services.email_outbox import email_outbox
+
+def build_contact_email(name: str, email: str, message: str) -> EmailMessage:
+    recipient = settings.CONTACT_EMAIL_TO or settings.SMTP_USER
+    # Header values can't hold CR/LF (EmailMessage raises), so fold the name onto one line
+    subject_name = " ".join(name.split())
 
-def send_contact_email(name: str, email: str, message: str):
     msg = EmailMessage()
-    msg["Subject"] = f"New Contact Form Message from {name}"
-    msg["From"] = email_settings.SMTP_USER
-    msg["To"] = email_settings.SMTP_USER
+    msg["Subject"] = f"New Contact Form Message from {subject_name}"
+    msg["From"] = settings.SMTP_USER or recipient
+    msg["To"] = recipient
+    msg["Reply-To"] = email
 
     msg.set_content(
         f"""
@@ -19,15 +24,8 @@ def send_contact_email(name: str, email: str, message: str):
         {message}
         """
     )
+    return msg
 
-    try:
-        with smtplib.SMTP(email_settings.SMTP_HOST, email_settings.SMTP_PORT) as smtp:
-            smtp.starttls()
-            smtp.login(email_settings.SMTP_USER, email_settings.SMTP_PASSWORD)
-            smtp.send_message(msg)
-
-        return True
-    
-    except Exception as e:
-        print("Email error:", e)
-        return False
\ No newline at end of file
+def send_contact_email(name: str, email: str, message: str) -> bool:
+    """Queues the message for the outbox worker; False if it can't be accepted"""
+    return email_outbox.enqueue(build_contact_email(name, email, message))
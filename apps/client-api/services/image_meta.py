@@ -0,0 +1,124 @@
+# apps/client-api/services/image_meta.py
+import base64
+import io
+from typing import Dict, List, Optional
+
+from firebase_admin import firestore
+from PIL import Image, ImageOps
+
+from config.async_db import run_db
+from config.clients import db
+from config.env import settings
+from services.creator_cache import creator_cache, CREATORS_COLLECTION
+
+# Field on the creator doc: one entry per uploaded image, matched by url
+IMAGE_META_FIELD = "image_meta"
+
+PLACEHOLDER_SIZE = 16     # longest side of the blurred preview, in px
+PLACEHOLDER_QUALITY = 30
+DECODE_SIZE = 64          # JPEGs are decoded at roughly this size (draft mode)
+PALETTE_SIZE = 5
+
+# Entries kept for uploads not (yet) saved to the profile, newest first.
+# One full batch upload fits, so a portfolio save never misses its metadata.
+PENDING_IMAGE_META = settings.UPLOAD_MAX_FILES
+
+
+def _dominant_colour(image: Image.Image) -> str:
+    """Most common colour of a small median-cut palette, as #rrggbb"""
+    sample = image.copy()
+    sample.thumbnail((DECODE_SIZE, DECODE_SIZE))
+    quantized = sample.quantize(colors=PALETTE_SIZE, method=Image.Quantize.MEDIANCUT)
+    count, index = max(quantized.getcolors())
+    r, g, b = quantized.getpalette()[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _placeholder(image: Image.Image) -> str:
+    """Tiny WebP preview as a data URI (~100 bytes), for blur-up while the image loads"""
+    preview = image.copy()
+    preview.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = io.BytesIO()
+    preview.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def extract_image_meta(file) -> Optional[Dict]:
+    """
+    Width/height (as displayed, after EXIF rotation), a blur placeholder and
+    the dominant colour of an uploaded image. Leaves the file at position 0.
+    Returns None for formats Pillow can't read.
+    """
+    try:
+        file.seek(0)
+        image = Image.open(file)
+        width, height = image.size
+        orientation = image.getexif().get(0x0112, 1)
+        if orientation in (5, 6, 7, 8):
+            width, height = height, width
+        # Only the preview is needed, so let the JPEG decoder skip detail
+        image.draft("RGB", (DECODE_SIZE, DECODE_SIZE))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        return {
+            "width": width,
+            "height": height,
+            "placeholder": _placeholder(image),
+            "color": _dominant_colour(image),
+        }
+    except Exception as e:
+        print(f"⚠️ Image metadata skipped: {e}")
+        return None
+    finally:
+        file.seek(0)
+
+
+async def save_image_meta(creator_id: str, entries: List[Dict]):
+    """
+    Record {url, width, height, placeholder, color} entries on the creator
+    doc, one per url, dropping old entries for images that were uploaded but
+    never made it into the profile.
+    """
+    if not entries:
+        return
+    ref = db.collection(CREATORS_COLLECTION).document(creator_id)
+    await run_db(_save_image_meta_transaction, db.transaction(), ref, entries)
+    creator_cache.invalidate(creator_id)
+
+
+def prune_image_meta(creator_data: Optional[Dict], urls: List[str], pending: int = 0) -> List[Dict]:
+    """
+    Entries for the images still in use (latest entry per url), plus up to
+    `pending` of the most recent entries for other urls
+    """
+    keep = {url for url in urls if url}
+    by_url = {}
+    for entry in (creator_data or {}).get(IMAGE_META_FIELD, []) or []:
+        if entry.get("url"):
+            # Re-inserting moves a re-uploaded url to the end (newest)
+            by_url.pop(entry["url"], None)
+            by_url[entry["url"]] = entry
+    others = [url for url in by_url if url not in keep]
+    dropped = set(others[:-pending] if pending else others)
+    return [entry for url, entry in by_url.items() if url not in dropped]
+
+
+@firestore.transactional
+def _save_image_meta_transaction(transaction, creator_ref, entries: List[Dict]):
+    snapshot = creator_ref.get(transaction=transaction)
+    current = snapshot.to_dict() if snapshot.exists else {}
+    in_profile = [current.get("profile_photo"), *(current.get("portfolio_images") or [])]
+    merged = {IMAGE_META_FIELD: [*(current.get(IMAGE_META_FIELD) or []), *entries]}
+    transaction.set(
+        creator_ref,
+        {IMAGE_META_FIELD: prune_image_meta(merged, in_profile, PENDING_IMAGE_META)},
+        merge=True,
+    )
+
+
+def image_meta_by_url(doc_data: Dict) -> Dict[str, Dict]:
+    """url -> {width, height, placeholder, color} for API responses"""
+    return {
+        entry["url"]: {k: entry.get(k) for k in ("width", "height", "placeholder", "color")}
+        for entry in doc_data.get(IMAGE_META_FIELD, []) or []
+        if entry.get("url")
+    }
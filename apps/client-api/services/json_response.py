@@ -0,0 +1,74 @@
+# apps/client-api/services/json_response.py
+import gzip
+from typing import Any, Optional
+
+import brotli
+import orjson
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from config.env import settings
+
+# Bodies above this are compressed off the event loop
+OFFLOAD_BYTES = 64 * 1024
+# Preferred first when the client accepts several at the same q
+ENCODINGS = ("br", "gzip")
+
+
+def render_json(content: Any) -> bytes:
+    """
+    orjson, skipping FastAPI's jsonable_encoder pass over the whole payload.
+    Anything orjson can't take natively (e.g. Firestore timestamps) falls
+    back to jsonable_encoder for just that value.
+    """
+    return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best of br/gzip the client accepts ("br;q=0" opts out), or None"""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name.strip()] = q
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.RESPONSE_GZIP_LEVEL)
+
+
+async def json_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """
+    Serialized with orjson and, once it's worth it, compressed with the
+    best encoding the client accepts (Accept-Encoding: br, then gzip).
+    """
+    body = render_json(content)
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = None
+    if len(body) >= settings.RESPONSE_COMPRESS_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding:
+        if len(body) > OFFLOAD_BYTES:
+            body = await run_in_threadpool(compress, body, encoding)
+        else:
+            body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,354 @@
+# apps/client-api/services/match_engine.py
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from services.creator_catalog import creator_catalog
+
+# Relative weight of each feature in the final match score
+WEIGHTS = {
+    "style": 0.30,
+    "category": 0.20,
+    "service": 0.15,
+    "location": 0.15,
+    "budget": 0.10,
+    "rating": 0.07,
+    "experience": 0.03,
+}
+
+# Wizard budget buckets (see client-web BudgetStep) in INR
+BUDGET_RANGES = {
+    "economy": (10_000, 25_000),
+    "standard": (25_000, 75_000),
+    "premium": (75_000, 200_000),
+    "luxury": (200_000, None),
+}
+
+# Wizard serviceType -> creator role codes that can deliver it, with partial credit
+SERVICE_ROLES = {
+    "photography": {"photographer": 1.0, "both": 1.0},
+    "videography": {"videographer": 1.0, "both": 1.0},
+    "both": {"both": 1.0, "photographer": 0.5, "videographer": 0.5},
+}
+
+MAX_EXPERIENCE_YEARS = 10
+
+# Feature vectors cached per query term on each engine (each is one float32 per creator)
+FEATURE_CACHE_SIZE = 32
+
+
+def _norm(value) -> str:
+    return str(value or "").strip().lower()
+
+
+def parse_budget(budget: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """Turn a wizard budget bucket or a free-form "₹25K - ₹75K" string into (low, high)"""
+    key = _norm(budget)
+    if not key:
+        return None, None
+    if key in BUDGET_RANGES:
+        return BUDGET_RANGES[key]
+
+    amounts = []
+    for number, suffix in re.findall(r"(\d+(?:\.\d+)?)\s*([kl]?)", key.replace(",", "")):
+        amount = float(number)
+        if suffix == "k":
+            amount *= 1_000
+        elif suffix == "l":
+            amount *= 100_000
+        amounts.append(amount)
+
+    # A zero bound ("0", "₹0 - ₹25K") means no bound on that side
+    amounts = [amount for amount in amounts if amount > 0]
+    if not amounts:
+        return None, None
+    if len(amounts) == 1:
+        return (amounts[0], None) if "+" in key else (None, amounts[0])
+    return min(amounts), max(amounts)
+
+
+class MatchEngine:
+    """
+    Creator features precomputed as NumPy arrays so a wizard payload is
+    scored against every creator in one vectorized pass.
+    Multi-valued features (styles, categories, operating locations) are kept
+    as per-term arrays of creator indices, so memory stays proportional to
+    the tags actually set and a query only touches the terms it mentions.
+    """
+
+    def __init__(self, creators: List[Dict]):
+        self.creators = creators
+        self.size = n = len(creators)
+
+        self.style_vocab, self.styles = self._postings(c.get("style_tags") for c in creators)
+        self.category_vocab, self.categories = self._postings(c.get("categories") for c in creators)
+        self.location_vocab, self.locations = self._postings(c.get("operating_locations") for c in creators)
+
+        # Single-valued terms are codes; -1 (unknown) indexes the spare slot of a lookup table
+        self.city_vocab = self._vocab([c.get("city")] for c in creators)
+        self.role_vocab = self._vocab([c.get("role")] for c in creators)
+        self.city = np.fromiter((self.city_vocab.get(_norm(c.get("city")), -1) for c in creators), np.int32, n)
+        self.role = np.fromiter((self.role_vocab.get(_norm(c.get("role")), -1) for c in creators), np.int32, n)
+
+        self.price = np.fromiter((float(c.get("starting_price") or 0) for c in creators), np.float32, n)
+        self.has_price = self.price > 0
+        self.rating_score = np.clip(
+            np.fromiter((float(c.get("rating") or 0) for c in creators), np.float32, n) / 5.0, 0, 1
+        )
+        self.experience_score = np.clip(
+            np.fromiter((float(c.get("years_experience") or 0) for c in creators), np.float32, n)
+            / MAX_EXPERIENCE_YEARS, 0, 1
+        )
+        self._feature_cache: Dict[Tuple, np.ndarray] = {}
+        # /match scores on threadpool threads that share one engine
+        self._feature_lock = threading.Lock()
+
+    def _cached(self, key: Tuple, compute) -> np.ndarray:
+        """
+        Wizard payloads reuse a handful of terms (three service types, four
+        budget buckets, a few dozen cities), so per-term vectors are memoized.
+        Vectors are computed outside the lock; a race only computes one twice.
+        """
+        with self._feature_lock:
+            vector = self._feature_cache.get(key)
+        if vector is None:
+            vector = compute()
+            vector.flags.writeable = False
+            with self._feature_lock:
+                if key not in self._feature_cache and len(self._feature_cache) >= FEATURE_CACHE_SIZE:
+                    self._feature_cache.pop(next(iter(self._feature_cache)))
+                self._feature_cache[key] = vector
+        return vector
+
+    @staticmethod
+    def _vocab(value_lists) -> Dict[str, int]:
+        vocab: Dict[str, int] = {}
+        for values in value_lists:
+            for value in values or []:
+                key = _norm(value)
+                if key and key not in vocab:
+                    vocab[key] = len(vocab)
+        return vocab
+
+    @staticmethod
+    def _postings(value_lists) -> Tuple[Dict[str, int], List[np.ndarray]]:
+        vocab: Dict[str, int] = {}
+        postings: List[List[int]] = []
+        for idx, values in enumerate(value_lists):
+            for key in {_norm(v) for v in values or []}:
+                if not key:
+                    continue
+                row = vocab.get(key)
+                if row is None:
+                    row = vocab[key] = len(postings)
+                    postings.append([])
+                postings[row].append(idx)
+        return vocab, [np.asarray(p, dtype=np.int32) for p in postings]
+
+    @staticmethod
+    def _matching_terms(vocab: Dict[str, int], query: str) -> List[int]:
+        """Vocab rows whose term contains, or is contained in, the query string"""
+        return [row for term, row in vocab.items() if term in query or query in term]
+
+    def _lookup(self, vocab: Dict[str, int], codes: np.ndarray, credit: Dict[int, float]) -> np.ndarray:
+        table = np.zeros(len(vocab) + 1, dtype=np.float32)
+        for row, value in credit.items():
+            table[row] = value
+        return table[codes]
+
+    def _any_of(self, postings: List[np.ndarray], rows: List[int]) -> np.ndarray:
+        hit = np.zeros(self.size, dtype=np.float32)
+        for row in rows:
+            hit[postings[row]] = 1.0
+        return hit
+
+    # =========================
+    # SCORING
+    # =========================
+    def _style_feature(self, requested: frozenset) -> np.ndarray:
+        hits = np.zeros(self.size, dtype=np.float32)
+        for style in requested:
+            row = self.style_vocab.get(style)
+            if row is not None:
+                hits[self.styles[row]] += 1.0
+        hits *= 1.0 / len(requested)
+        return hits
+
+    def _category_feature(self, category: str) -> np.ndarray:
+        rows = [row for term, row in self.category_vocab.items()
+                if term.replace("-", " ") == category]
+        return self._any_of(self.categories, rows)
+
+    def _service_feature(self, service: str) -> np.ndarray:
+        credit = {
+            self.role_vocab[role]: value
+            for role, value in SERVICE_ROLES[service].items() if role in self.role_vocab
+        }
+        return self._lookup(self.role_vocab, self.role, credit)
+
+    def _location_feature(self, location: str) -> np.ndarray:
+        operates = self._any_of(self.locations, self._matching_terms(self.location_vocab, location))
+        operates *= 0.8
+        in_city = self._lookup(
+            self.city_vocab, self.city,
+            {row: 1.0 for row in self._matching_terms(self.city_vocab, location)}
+        )
+        return np.maximum(in_city, operates, out=in_city)
+
+    def _budget_feature(self, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        budget = np.ones(self.size, dtype=np.float32)
+        if high is not None:
+            over = (self.price - high) / high
+            budget -= np.clip(over, 0, 1, out=over)
+        if low is not None:
+            # Cheaper than the bracket is a softer mismatch than pricier
+            under = (low - self.price) / low
+            budget -= 0.3 * np.clip(under, 0, 1, out=under)
+        # Creators without a listed price get neutral credit
+        budget[~self.has_price] = 0.5
+        return np.clip(budget, 0, 1, out=budget)
+
+    def score(self, preferences: Dict) -> Dict[str, np.ndarray]:
+        """Per-feature scores in [0, 1] for every creator; unset preferences score 1"""
+        ones = self._cached(("ones",), lambda: np.ones(self.size, dtype=np.float32))
+        features: Dict[str, np.ndarray] = {}
+
+        # Share of requested styles the creator lists
+        requested = frozenset(_norm(s) for s in preferences.get("styles") or []) - {""}
+        features["style"] = (
+            self._cached(("style", requested), lambda: self._style_feature(requested))
+            if requested else ones
+        )
+
+        category = _norm(preferences.get("category")).replace("-", " ")
+        features["category"] = (
+            self._cached(("category", category), lambda: self._category_feature(category))
+            if category else ones
+        )
+
+        service = _norm(preferences.get("serviceType"))
+        features["service"] = (
+            self._cached(("service", service), lambda: self._service_feature(service))
+            if service in SERVICE_ROLES else ones
+        )
+
+        location = _norm(preferences.get("location"))
+        features["location"] = (
+            self._cached(("location", location), lambda: self._location_feature(location))
+            if location else ones
+        )
+
+        low, high = parse_budget(preferences.get("budget"))
+        features["budget"] = (
+            self._cached(("budget", low, high), lambda: self._budget_feature(low, high))
+            if low is not None or high is not None else ones
+        )
+
+        features["rating"] = self.rating_score
+        features["experience"] = self.experience_score
+        return features
+
+    def match(self, preferences: Dict, limit: int = 20) -> List[Dict]:
+        n = self.size
+        if n == 0 or limit <= 0:
+            return []
+
+        features = self.score(preferences)
+        total = np.zeros(n, dtype=np.float32)
+        for name, weight in WEIGHTS.items():
+            total += np.float32(weight) * features[name]
+
+        k = min(limit, n)
+        if k < n:
+            top = np.argpartition(total, n - k)[n - k:]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-total[top], kind="stable")]
+
+        results = []
+        for idx in top.tolist():
+            results.append({
+                **self.creators[idx],
+                "match_score": round(float(total[idx]) * 100, 1),
+                "score_breakdown": {
+                    name: round(float(features[name][idx]), 3) for name in WEIGHTS
+                },
+            })
+        return results
+
+
+class _EngineCache:
+    """
+    Keeps the engine in step with the creator catalog. Only the first build
+    blocks a request; after that a catalog change rebuilds the engine on a
+    background thread and requests keep scoring against the previous one
+    until the new engine is swapped in.
+
+    Until the catalog's first snapshot arrives, requests get a 503 rather
+    than each scanning the creators collection on its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._first_build = threading.Lock()
+        self._engine: Optional[MatchEngine] = None
+        self._version = None
+        self._rebuilding = False
+        self.rebuilds = 0
+        self.warming_up = 0
+
+    def get(self) -> MatchEngine:
+        if not creator_catalog.is_ready():
+            self.warming_up += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Creator matching is warming up, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        with self._lock:
+            engine = self._engine
+            if engine is not None and self._version != creator_catalog.version and not self._rebuilding:
+                self._rebuilding = True
+                threading.Thread(target=self._rebuild, name="match-engine-rebuild", daemon=True).start()
+        if engine is not None:
+            return engine
+
+        with self._first_build:
+            if self._engine is None:
+                self._build()
+            return self._engine
+
+    def _build(self):
+        # Version is read first: a change during the build just triggers another one
+        version = creator_catalog.version
+        engine = MatchEngine(creator_catalog.all())
+        with self._lock:
+            self._engine, self._version = engine, version
+            self.rebuilds += 1
+
+    def _rebuild(self):
+        while True:
+            try:
+                self._build()
+            except Exception as e:
+                print(f"❌ Match engine rebuild failed: {e}")
+                with self._lock:
+                    self._rebuilding = False
+                return
+            with self._lock:
+                # Catch up with changes that landed while building
+                if self._version == creator_catalog.version:
+                    self._rebuilding = False
+                    return
+
+
+match_engine_cache = _EngineCache()
+
+
+def match_creators(preferences: Dict, limit: int = 20) -> List[Dict]:
+    """Top-K creators for a wizard payload, with per-feature score breakdowns"""
+    return match_engine_cache.get().match(preferences, limit)
@@ -1,5 +1,9 @@
+from datetime import datetime, timezone
+from typing import Optional
 from firebase_admin import firestore
 from config.clients import db
+from config.async_db import run_db
+from services.creator_cache import creator_cache, merge_into
 
 class CreatorOnboardingService:
     @staticmethod
@@ -8,29 +12,38 @@ class CreatorOnboardingService:
 
     @staticmethod
     async def get_user_data(user_id: str):
-        doc = CreatorOnboardingService.get_user_ref(user_id).get()
-        return doc.to_dict() if doc.exists else {}
+        return await creator_cache.get_async(user_id) or {}
+
+    @staticmethod
+    async def _commit_step(user_id: str, payload: dict, must_exist: bool = False) -> Optional[int]:
+        """
+        One transaction per step: read the stored profile, merge the payload
+        together with the completeness computed from the merged state, and
+        write it back. Concurrent steps (or the same step on another worker)
+        are serialized by Firestore, so completeness always matches the
+        saved profile. With must_exist, a missing profile isn't created
+        and None is returned.
+        """
+        completeness = await run_db(
+            _commit_step_transaction, db.transaction(),
+            CreatorOnboardingService.get_user_ref(user_id), payload, must_exist
+        )
+        # Two steps can finish in either order, so re-read rather than mirror
+        creator_cache.invalidate(user_id)
+        return completeness
 
     @staticmethod
     async def update_step_data(user_id: str, data: dict, next_step: int, flag_name: str):
         """Updates user data, advances step, and sets completion flag."""
-        ref = CreatorOnboardingService.get_user_ref(user_id)
-        
         update_payload = {
             **data,
             "current_step": next_step,
             flag_name: True,
-            "updated_at": firestore.SERVER_TIMESTAMP
+            "updated_at": datetime.now(timezone.utc)
         }
         
-        ref.set(update_payload, merge=True)
-        
-        # Recalculate profile completeness for the Dashboard ring
-        user_data = ref.get().to_dict()
-        completeness = CreatorOnboardingService.calculate_completeness(user_data)
-        ref.update({"profile_completeness": completeness})
-        
-        return completeness
+        # Recalculate profile completeness for the Dashboard ring in the same write
+        return await CreatorOnboardingService._commit_step(user_id, update_payload)
 
     @staticmethod
     def calculate_completeness(data: dict) -> int:
@@ -40,28 +53,36 @@ class CreatorOnboardingService:
         return int((filled / len(fields)) * 100)
 
     @staticmethod
-    async def finalize_profile(user_id: str):
+    async def finalize_profile(user_id: str) -> bool:
         """
         Finalizes the onboarding process.
         Marks the profile as live and status as completed.
+        False if the creator has no profile to finalize.
         """
-        ref = CreatorOnboardingService.get_user_ref(user_id)
+        now = datetime.now(timezone.utc)
         
         # Final update payload
         final_payload = {
             "onboarding_status": "completed",
             "profile_live": True,
             "current_step": 4,  # Stay at step 4
-            "completed_at": firestore.SERVER_TIMESTAMP,
-            "updated_at": firestore.SERVER_TIMESTAMP
+            "completed_at": now,
+            "updated_at": now
         }
         
-        # Set merge=True to preserve all previous onboarding data
-        ref.set(final_payload, merge=True)
+        # Merge preserves all previous onboarding data; completeness goes in the same write
+        completeness = await CreatorOnboardingService._commit_step(user_id, final_payload, must_exist=True)
         
-        # Final completeness recalculation
-        user_data = ref.get().to_dict()
-        completeness = CreatorOnboardingService.calculate_completeness(user_data)
-        ref.update({"profile_completeness": completeness})
-        
-        return True
\ No newline at end of file
+        return completeness is not None
+
+
+@firestore.transactional
+def _commit_step_transaction(transaction, user_ref, payload: dict, must_exist: bool = False):
+    snapshot = user_ref.get(transaction=transaction)
+    if must_exist and not snapshot.exists:
+        return None
+    merged = snapshot.to_dict() if snapshot.exists else {}
+    merge_into(merged, payload)
+    completeness = CreatorOnboardingService.calculate_completeness(merged)
+    transaction.set(user_ref, {**payload, "profile_completeness": completeness}, merge=True)
+    return completeness
@@ -0,0 +1,212 @@
+# apps/client-api/services/pagination.py
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Firestore's pseudo-field for the document ID, used as the ordering tie-breaker
+DOCUMENT_ID = "__name__"
+
+
+def sort_key(value) -> Tuple:
+    """
+    Firestore's cross-type ordering (null < bool < number < timestamp <
+    string < bytes < reference < array < map), so rows whose order field
+    holds mixed types (or is missing) sort the way the query would.
+    """
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value.timestamp())
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, bytes):
+        return (5, value)
+    if isinstance(value, (list, tuple)):
+        return (8, tuple(sort_key(v) for v in value))
+    if isinstance(value, dict):
+        return (9, tuple(sorted((k, sort_key(v)) for k, v in value.items())))
+    # DocumentReference (by path), GeoPoint
+    return (6, str(getattr(value, "path", value)))
+
+
+# Cursor values JSON can't carry (timestamps, bytes) are tagged; maps are
+# wrapped so a stored map can't be mistaken for a tag
+def _encode_value(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return {"$ts": value.isoformat()}
+    if isinstance(value, bytes):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+    if isinstance(value, dict):
+        return {"$map": {k: _encode_value(v) for k, v in value.items()}}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    if isinstance(value, dict):
+        (tag, inner), = value.items()
+        if tag == "$ts":
+            return datetime.fromisoformat(inner)
+        if tag == "$bytes":
+            return base64.b64decode(inner)
+        if tag == "$map":
+            return {k: _decode_value(v) for k, v in inner.items()}
+        raise ValueError(f"unknown cursor value tag {tag}")
+    return value
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque cursor: the last row's order-by values, base64url-encoded"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list):
+            raise ValueError("cursor must decode to a list")
+        return [_decode_value(v) for v in values]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """`fields=a,b,c` -> ["a", "b", "c"]; None means every field"""
+    if not fields:
+        return None
+    parsed = [f.strip() for f in fields.split(",") if f.strip()]
+    return parsed or None
+
+
+def page_size(limit: Optional[int], default: Optional[int] = None) -> Optional[int]:
+    """
+    Clamp a requested page size. No `limit` keeps the list endpoints'
+    original contract of returning every row (None), unless a default is given.
+    """
+    if limit is None:
+        return default
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginate_query(
+    query,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    order_field: Optional[str] = None,
+    descending: bool = False,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Run one page of a Firestore query using order_by + start_after + limit.
+
+    Results are ordered by `order_field` (when given) and then by document
+    ID so the cursor is stable across ties. Only `limit + 1` documents are
+    read, however large the result set. An equality filter combined with an
+    order_field needs a composite index (filter field, order_field, __name__).
+
+    limit=None returns every matching row (after the cursor, if any). With
+    no cursor either, the query runs unordered as it always did, so rows
+    missing the order field aren't dropped and no composite index is
+    needed, and the rows are sorted here instead.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    selected = None
+    if fields:
+        # The order field must come back with the rows to sort them / build the next cursor
+        selected = list(dict.fromkeys(fields + ([order_field] if order_field else [])))
+
+    if limit is None and not cursor:
+        if selected:
+            query = query.select(selected)
+        rows = [doc.to_dict() for doc in query.stream()]
+        if order_field:
+            rows.sort(key=lambda row: sort_key(row.get(order_field)), reverse=descending)
+        return rows, None
+
+    direction = "DESCENDING" if descending else "ASCENDING"
+    order_keys = ([order_field] if order_field else []) + [DOCUMENT_ID]
+    for key in order_keys:
+        query = query.order_by(key, direction=direction)
+
+    if selected:
+        query = query.select(selected)
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(order_keys):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.start_after(dict(zip(order_keys, values)))
+
+    if limit is None:
+        docs = list(query.stream())
+        has_more = False
+    else:
+        docs = list(query.limit(limit + 1).stream())
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+
+    rows = [doc.to_dict() for doc in docs]
+    next_cursor = None
+    if has_more and docs:
+        last = docs[-1]
+        values = ([last.get(order_field)] if order_field else []) + [last.id]
+        next_cursor = encode_cursor(values)
+    return rows, next_cursor
+
+
+def paginate_list(
+    rows: List[Dict],
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    key: str = "id",
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Same cursor contract over an in-memory list already sorted by `key`
+    (e.g. the creator catalog). limit=None returns everything after the cursor.
+    """
+    start = 0
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != 1:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # Rows are sorted by key, so the resume point is a binary search away
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rows[mid].get(key) <= values[0]:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = lo
+
+    if limit is None:
+        return rows[start:], None
+    page = rows[start:start + limit]
+    has_more = start + limit < len(rows)
+    next_cursor = encode_cursor([page[-1].get(key)]) if has_more and page else None
+    return page, next_cursor
+
+
+def project(row: Dict, fields: Optional[List[str]]) -> Dict:
+    """Keep only the requested top-level keys of an already-fetched row"""
+    if not fields:
+        return row
+    return {f: row[f] for f in fields if f in row}
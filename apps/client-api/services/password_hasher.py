@@ -0,0 +1,139 @@
+# apps/client-api/services/password_hasher.py
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+import bcrypt
+from fastapi import HTTPException
+
+from config.env import settings
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated process pool so logins never burn CPU on
+    the API worker. Admission is bounded: once `workers + queue_size`
+    hashes are in flight, new ones are rejected with 429 immediately, and
+    a hash that can't finish within `timeout` seconds returns 503. A hash
+    that already started keeps running after its timeout, so it holds its
+    slot until the worker is done with it.
+    Hashes are awaited on the event loop, so a queue of logins never
+    holds a Firestore pool thread.
+    """
+
+    def __init__(self, workers: int, rounds: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.rounds = rounds
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(workers + queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.hashes_per_second: Optional[float] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the parent has gRPC threads from the Firestore client.
+                # Workers only ever import bcrypt (its functions are submitted directly).
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _run(self, fn, *args):
+        if self._slots.locked():
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many sign-in attempts in progress, please retry",
+                headers={"Retry-After": "1"},
+            )
+        await self._slots.acquire()
+        try:
+            job = self._pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Released when the job is done (or cancelled while still queued), not when we stop waiting
+        job.add_done_callback(self._releaser(asyncio.get_running_loop()))
+        try:
+            # wait_for cancels the wrapped future, which cancels the job if it hasn't started
+            result = await asyncio.wait_for(asyncio.wrap_future(job), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Authentication is busy, please retry",
+                headers={"Retry-After": "2"},
+            )
+        self.completed += 1
+        return result
+
+    def _releaser(self, loop: asyncio.AbstractEventLoop):
+        def release(job):
+            # Done callbacks run on the pool's management thread; the semaphore belongs to the loop
+            try:
+                loop.call_soon_threadsafe(self._slots.release)
+            except RuntimeError:
+                pass  # loop already closed
+        return release
+
+    # =========================
+    # PUBLIC API (await from the event loop)
+    # =========================
+    async def hash_password(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return (await self._run(bcrypt.hashpw, password.encode("utf-8"), salt)).decode("utf-8")
+
+    async def check_password(self, password: str, hashed: str) -> bool:
+        return await self._run(bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def benchmark(self, samples: Optional[int] = None) -> float:
+        """Hashes/sec at the configured work factor with every worker busy (also warms the pool)"""
+        samples = samples or self.workers * 2
+        pool = self._pool()
+        # Start every worker process before timing
+        list(pool.map(bcrypt.gensalt, [4] * self.workers))
+
+        password = b"benchmark-password"
+        salts = [bcrypt.gensalt(rounds=self.rounds) for _ in range(samples)]
+        start = time.perf_counter()
+        list(pool.map(bcrypt.hashpw, [password] * samples, salts))
+        self.hashes_per_second = samples / (time.perf_counter() - start)
+        print(f"🔐 bcrypt (rounds={self.rounds}, workers={self.workers}): "
+              f"{self.hashes_per_second:.1f} hashes/sec")
+        return self.hashes_per_second
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "rounds": self.rounds,
+            "queue_size": self.queue_size,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "hashes_per_second": round(self.hashes_per_second, 1) if self.hashes_per_second else None,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.BCRYPT_WORKERS or os.cpu_count() or 1,
+    rounds=settings.BCRYPT_ROUNDS,
+    queue_size=settings.BCRYPT_QUEUE_SIZE,
+    timeout=settings.BCRYPT_TIMEOUT_SECONDS,
+)
@@ -1,5 +1,8 @@
 import razorpay
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Dict, Any
 from fastapi import HTTPException
@@ -8,6 +11,7 @@ from google.cloud import firestore
 from config.env import settings
 from config.clients import db
 from models.payment import Payment, PaymentStatus
+from services.projects_service import transactional_writes
 
 
 # Initialize Razorpay client
@@ -16,6 +20,113 @@ razorpay_client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZOR
 # Collection names
 PAYMENTS_COLLECTION = "Payments"
 USERS_COLLECTION = "Users"  # Assuming users collection name
+PROJECT_REQUESTS_COLLECTION = "ProjectRequests"
+# Razorpay order / payment id -> our payment id, so lookups are point reads
+PAYMENT_LOOKUPS_COLLECTION = "PaymentLookups"
+
+# Field on the ProjectRequests doc pointing at its latest payment
+LATEST_PAYMENT_FIELD = "latestPayment"
+BACKFILL_BATCH_SIZE = 400
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _created_at_ms(payment: Dict[str, Any]) -> int:
+    """created_at as epoch ms; older payments stored an ISO string"""
+    created_at = payment.get("created_at")
+    if isinstance(created_at, (int, float)):
+        return int(created_at)
+    try:
+        return int(datetime.fromisoformat(created_at).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _latest_payment_pointer(payment: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        LATEST_PAYMENT_FIELD: {
+            "id": payment["id"],
+            "status": payment["status"],
+            "created_at": _created_at_ms(payment),
+        }
+    }
+
+
+def _read_request(transaction, request_id: Optional[str]):
+    """The payment's request, read in the transaction before any write (None without one)"""
+    if not request_id:
+        return None
+    return db.collection(PROJECT_REQUESTS_COLLECTION).document(request_id).get(transaction=transaction)
+
+
+def _point_request_at(transaction, request_snapshot, payment: Dict[str, Any]):
+    """
+    Move the request's latest-payment pointer to `payment`, unless the
+    request is gone or already points at a newer payment
+    """
+    if request_snapshot is None or not request_snapshot.exists:
+        return
+    current = (request_snapshot.to_dict() or {}).get(LATEST_PAYMENT_FIELD) or {}
+    if current.get("id") not in (None, payment["id"]) and current.get("created_at", 0) > _created_at_ms(payment):
+        return
+    transaction.update(request_snapshot.reference, _latest_payment_pointer(payment))
+
+
+class _LookupCache:
+    """Bounded map of Razorpay ids to payment ids; the mapping never changes"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, external_id: str) -> Optional[str]:
+        with self._lock:
+            payment_id = self._entries.get(external_id)
+            if payment_id is not None:
+                self._entries.move_to_end(external_id)
+            return payment_id
+
+    def put(self, external_id: str, payment_id: str):
+        with self._lock:
+            self._entries[external_id] = payment_id
+            self._entries.move_to_end(external_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+_lookup_cache = _LookupCache()
+
+
+def _resolve_payment_id(external_id: str) -> Optional[str]:
+    """Our payment id for a Razorpay order or payment id (cache, then lookup doc)"""
+    payment_id = _lookup_cache.get(external_id)
+    if payment_id is not None:
+        return payment_id
+    doc = db.collection(PAYMENT_LOOKUPS_COLLECTION).document(external_id).get()
+    if doc.exists:
+        payment_id = doc.to_dict().get("payment_id")
+    else:
+        # Payments created before lookup docs existed (until backfill_payment_lookups has run)
+        payment_id = None
+        field = "razorpay_payment_id" if external_id.startswith("pay_") else "razorpay_order_id"
+        for d in db.collection(PAYMENTS_COLLECTION).where(field, "==", external_id).limit(1).stream():
+            payment_id = d.id
+    if payment_id:
+        _lookup_cache.put(external_id, payment_id)
+    return payment_id
+
+
+def _find_payment(external_id: str):
+    """(doc_ref, data) for a Razorpay id, or (None, None)"""
+    payment_id = _resolve_payment_id(external_id)
+    if not payment_id:
+        return None, None
+    doc_ref = db.collection(PAYMENTS_COLLECTION).document(payment_id)
+    doc = doc_ref.get()
+    return (doc_ref, doc.to_dict()) if doc.exists else (None, None)
 
 
 def generate_payment_id() -> str:
@@ -61,14 +172,14 @@ def create_razorpay_order(
             "creator_id": creator_id,
             "amount": amount,
             "status": PaymentStatus.PENDING,
-            "created_at": datetime.now().isoformat(),
+            "created_at": _now_ms(),
             "razorpay_order_id": razorpay_order_id,
             "description": description
         }
         
-        # Save to Firestore
-        db.collection(PAYMENTS_COLLECTION).document(payment_id).set(payment_data)
-        # Also map order_id to payment (optional, or just query by order_id later)
+        # Save the payment, its order lookup and the request's latest-payment pointer together
+        transactional_writes("payment_create", _save_payment_transaction, payment_data, razorpay_order_id)
+        _lookup_cache.put(razorpay_order_id, payment_id)
         
         print(f"Razorpay order created: {razorpay_order_id}")
         
@@ -98,17 +209,7 @@ def verify_razorpay_payment(
     Verify Razorpay payment signature and mark as escrowed.
     """
     # Find payment by Razorpay Order ID
-    payments_ref = db.collection(PAYMENTS_COLLECTION)
-    query = payments_ref.where("razorpay_order_id", "==", razorpay_order_id).limit(1)
-    docs = query.stream()
-    
-    payment_doc_ref = None
-    payment_data = None
-    
-    for doc in docs:
-        payment_doc_ref = doc.reference
-        payment_data = doc.to_dict()
-        break
+    payment_doc_ref, payment_data = _find_payment(razorpay_order_id)
     
     if not payment_data:
         raise HTTPException(status_code=404, detail="Order not found")
@@ -129,11 +230,15 @@ def verify_razorpay_payment(
              "razorpay_payment_id": razorpay_payment_id,
              "updated_at": datetime.now().isoformat()
         }
-        payment_doc_ref.update(update_data)
-        
         # Update local object for response
         payment_data.update(update_data)
         
+        # Payment, its Razorpay payment-id lookup and the request pointer in one commit
+        transactional_writes(
+            "payment_verify", _save_payment_transaction, payment_data, razorpay_payment_id, update_data
+        )
+        _lookup_cache.put(razorpay_payment_id, payment_data["id"])
+        
         print(f" Payment verified and escrowed: {payment_data['id']}")
         
         return {
@@ -150,25 +255,39 @@ def verify_razorpay_payment(
         raise HTTPException(status_code=500, detail=f"Payment verification error: {str(e)}")
 
 
+@firestore.transactional
+def _save_payment_transaction(transaction, payment_data, external_id, update_data=None):
+    """
+    Write a payment (whole, or just `update_data` for an existing one), the
+    lookup doc for its Razorpay id, and the request pointer if this is
+    still the request's newest payment
+    """
+    request_snapshot = _read_request(transaction, payment_data.get("request_id"))
+    payment_ref = db.collection(PAYMENTS_COLLECTION).document(payment_data["id"])
+    if update_data is None:
+        transaction.set(payment_ref, payment_data)
+    else:
+        transaction.update(payment_ref, update_data)
+    transaction.set(
+        db.collection(PAYMENT_LOOKUPS_COLLECTION).document(external_id),
+        {"payment_id": payment_data["id"], "request_id": payment_data.get("request_id")},
+    )
+    _point_request_at(transaction, request_snapshot, payment_data)
+
+
 def check_payment_status(order_id_or_payment_id: str) -> Dict[str, Any]:
     """Check payment status by order ID or payment ID"""
     
-    # Try finding by Payment ID first
-    doc_ref = db.collection(PAYMENTS_COLLECTION).document(order_id_or_payment_id)
-    doc = doc_ref.get()
-    
     payment_data = None
     
-    if doc.exists:
-        payment_data = doc.to_dict()
+    if order_id_or_payment_id.startswith("PAY"):
+        # Our own payment ID: one point read
+        doc = db.collection(PAYMENTS_COLLECTION).document(order_id_or_payment_id).get()
+        if doc.exists:
+            payment_data = doc.to_dict()
     else:
-        # Try finding by Razorpay Order ID
-        query = db.collection(PAYMENTS_COLLECTION).where("razorpay_order_id", "==", order_id_or_payment_id).limit(1)
-        docs = query.stream()
-        for d in docs:
-            doc_ref = d.reference
-            payment_data = d.to_dict()
-            break
+        # Razorpay order / payment ID: resolved through the lookup docs
+        _, payment_data = _find_payment(order_id_or_payment_id)
             
     if not payment_data:
          raise HTTPException(status_code=404, detail="Payment not found")
@@ -186,30 +305,23 @@ def check_payment_status(order_id_or_payment_id: str) -> Dict[str, Any]:
 
 
 def get_payment_by_request(request_id: str) -> Optional[Dict[str, Any]]:
-    """Find the latest payment for a request ID"""
+    """Find the latest payment for a request ID via the pointer on the request"""
+    request_doc = db.collection(PROJECT_REQUESTS_COLLECTION).document(request_id).get()
+    pointer = (request_doc.to_dict() or {}).get(LATEST_PAYMENT_FIELD) if request_doc.exists else None
     
-    # Query for payments with this request ID, ordered by creation (newest first)
-    # Note: Firestore queries require composite index for complex ordering, 
-    # so we'll just filter in python if needed or simpler query
+    if pointer:
+        return get_payment(pointer["id"])
     
-    query = db.collection(PAYMENTS_COLLECTION).where("request_id", "==", request_id)
-    docs = query.stream()
-    
-    # Get the most recent one
+    # Requests paid before the pointer existed (until backfill_payment_lookups has run)
+    return _latest_payment_by_scan(request_id)
+
+
+def _latest_payment_by_scan(request_id: str) -> Optional[Dict[str, Any]]:
     latest_payment = None
-    latest_time = None
-    
-    for doc in docs:
+    for doc in db.collection(PAYMENTS_COLLECTION).where("request_id", "==", request_id).stream():
         data = doc.to_dict()
-        # Parse created_at string to compare
-        try:
-            created_at = datetime.fromisoformat(data["created_at"])
-            if latest_time is None or created_at > latest_time:
-                latest_time = created_at
-                latest_payment = data
-        except:
-            continue
-            
+        if latest_payment is None or _created_at_ms(data) > _created_at_ms(latest_payment):
+            latest_payment = data
     return latest_payment
 
 
@@ -237,7 +349,7 @@ def confirm_and_release_payment(payment_id: str) -> Dict[str, Any]:
     
     # Run transaction to ensure atomicity
     transaction = db.transaction()
-    _release_funds_transaction(transaction, doc_ref, creator_id, amount)
+    _release_funds_transaction(transaction, doc_ref, creator_id, amount, payment_data)
     
     # Refresh data
     payment_data["status"] = PaymentStatus.COMPLETED
@@ -253,10 +365,11 @@ def confirm_and_release_payment(payment_id: str) -> Dict[str, Any]:
     }
 
 @firestore.transactional
-def _release_funds_transaction(transaction, payment_ref, creator_id, amount):
+def _release_funds_transaction(transaction, payment_ref, creator_id, amount, payment_data):
     # Read balance first (Read before Write rule)
     balance_ref = db.collection("balances").document(creator_id)
     snapshot = balance_ref.get(transaction=transaction)
+    request_snapshot = _read_request(transaction, payment_data.get("request_id"))
 
     # Update payment status
     transaction.update(payment_ref, {
@@ -271,6 +384,8 @@ def _release_funds_transaction(transaction, payment_ref, creator_id, amount):
     else:
         transaction.set(balance_ref, {"amount": amount, "updated_at": datetime.now().isoformat()})
 
+    _point_request_at(transaction, request_snapshot, {**payment_data, "status": PaymentStatus.COMPLETED})
+
 
 def get_payment(payment_id: str) -> Optional[Dict[str, Any]]:
     """Get payment by ID"""
@@ -286,3 +401,50 @@ def get_user_balance(user_id: str) -> float:
     if doc.exists:
         return doc.get("amount")
     return 0
+
+
+def backfill_payment_lookups():
+    """
+    One-off backfill for payments created before lookup docs: numeric
+    created_at, Razorpay id lookups and the latest-payment pointer per request.
+    """
+    writes = []  # (kind, ref, data)
+    latest: Dict[str, Dict[str, Any]] = {}
+
+    for doc in db.collection(PAYMENTS_COLLECTION).stream():
+        payment = doc.to_dict()
+        payment.setdefault("id", doc.id)
+        if not isinstance(payment.get("created_at"), (int, float)):
+            payment["created_at"] = _created_at_ms(payment)
+            writes.append(("update", doc.reference, {"created_at": payment["created_at"]}))
+        for external_id in (payment.get("razorpay_order_id"), payment.get("razorpay_payment_id")):
+            if external_id:
+                writes.append((
+                    "set",
+                    db.collection(PAYMENT_LOOKUPS_COLLECTION).document(external_id),
+                    {"payment_id": doc.id, "request_id": payment.get("request_id")},
+                ))
+        request_id = payment.get("request_id")
+        if request_id and (request_id not in latest or payment["created_at"] > latest[request_id]["created_at"]):
+            latest[request_id] = payment
+
+    pointers = 0
+    for request_id, payment in latest.items():
+        request_ref = db.collection(PROJECT_REQUESTS_COLLECTION).document(request_id)
+        if request_ref.get().exists:
+            writes.append(("merge", request_ref, _latest_payment_pointer(payment)))
+            pointers += 1
+
+    for start in range(0, len(writes), BACKFILL_BATCH_SIZE):
+        batch = db.batch()
+        for kind, ref, data in writes[start:start + BACKFILL_BATCH_SIZE]:
+            if kind == "update":
+                batch.update(ref, data)
+            else:
+                batch.set(ref, data, merge=kind == "merge")
+        batch.commit()
+    print(f"✅ Backfilled payment lookups; latest-payment pointers on {pointers} requests")
+
+
+if __name__ == "__main__":
+    backfill_payment_lookups()
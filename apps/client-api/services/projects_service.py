@@ -1,9 +1,14 @@
 # services/projects_service.py
 from config.clients import db
+from firebase_admin import firestore
+from contextlib import contextmanager
+from collections import defaultdict
+import threading
 import uuid, time
 from typing import Dict
 
 PROJECTS_COLLECTION = "ProjectRequests"
+PROJECT_MESSAGES_COLLECTION = "ProjectMessages"
 
 ALLOWED_FIELDS = {
     "clientId",
@@ -39,3 +44,138 @@ def create_project_request(request_data: Dict) -> Dict:
     except Exception as e:
         print("create_project_request error:", e)
         return {"error": "Failed to create project request"}
+
+
+
+# =========================
+# BATCHED WRITES
+# =========================
+_write_stats: Dict[str, Dict] = defaultdict(lambda: {"commits": 0, "writes": 0, "total_ms": 0.0})
+_write_stats_lock = threading.Lock()
+
+
+class _CountingBatch:
+    """WriteBatch wrapper that counts the writes queued on it"""
+
+    def __init__(self, batch):
+        self._batch = batch
+        self.writes = 0
+
+    def set(self, ref, data, merge=False):
+        self.writes += 1
+        return self._batch.set(ref, data, merge=merge)
+
+    def update(self, ref, data):
+        self.writes += 1
+        return self._batch.update(ref, data)
+
+    def delete(self, ref):
+        self.writes += 1
+        return self._batch.delete(ref)
+
+
+@contextmanager
+def batched_writes(flow: str):
+    """
+    Group every write of one API call into a single WriteBatch commit:
+
+        with batched_writes("negotiation") as batch:
+            batch.set(message_ref, message_data)
+            batch.update(request_ref, {...})
+
+    Nothing is written if the block raises. Commit latency is recorded per flow.
+    """
+    batch = _CountingBatch(db.batch())
+    yield batch
+    if not batch.writes:
+        return
+    start = time.perf_counter()
+    batch._batch.commit()
+    _record_commit(flow, batch.writes, (time.perf_counter() - start) * 1000)
+
+
+def transactional_writes(flow: str, fn, *args):
+    """
+    Run a @firestore.transactional function on a new transaction and record
+    its commit under `flow`, like batched_writes:
+
+        transactional_writes("review_create", _create_review_transaction, booking_ref, ...)
+
+    The latency covers the transaction's reads (and any retries) as well as
+    the commit, since they can't be separated.
+    """
+    transaction = db.transaction()
+    commit = transaction._commit
+    queued = []
+
+    def counting_commit():
+        # Writes are cleared on commit, so count them just before
+        queued.append(len(transaction))
+        return commit()
+
+    transaction._commit = counting_commit
+    start = time.perf_counter()
+    result = fn(transaction, *args)
+    if queued and queued[-1]:
+        _record_commit(flow, queued[-1], (time.perf_counter() - start) * 1000)
+    return result
+
+
+def _record_commit(flow: str, writes: int, elapsed_ms: float):
+    with _write_stats_lock:
+        stats = _write_stats[flow]
+        stats["commits"] += 1
+        stats["writes"] += writes
+        stats["total_ms"] += elapsed_ms
+
+
+def write_stats() -> Dict[str, Dict]:
+    with _write_stats_lock:
+        return {
+            flow: {
+                "commits": s["commits"],
+                "writes": s["writes"],
+                "avg_commit_ms": round(s["total_ms"] / s["commits"], 2) if s["commits"] else 0.0,
+            }
+            for flow, s in _write_stats.items()
+        }
+
+
+# =========================
+# MIGRATIONS
+# =========================
+@firestore.transactional
+def _backfill_watermark(transaction, request_ref) -> bool:
+    snapshot = request_ref.get(transaction=transaction)
+    if not snapshot.exists:
+        return False
+    messages_query = (
+        db.collection(PROJECT_MESSAGES_COLLECTION).document(request_ref.id)
+        .collection("messages").order_by("timestamp")
+    )
+    messages = [doc.to_dict() for doc in transaction.get(messages_query)]
+    last = messages[-1] if messages else {}
+    transaction.update(request_ref, {
+        "lastMessageId": last.get("id"),
+        "lastMessageAt": last.get("timestamp", 0),
+        "messageCount": len(messages),
+    })
+    return True
+
+
+def backfill_message_watermarks():
+    """
+    One-off: give every negotiation thread the lastMessageId / lastMessageAt /
+    messageCount watermark that GET /messages builds its ETag from. Counts
+    are recomputed from the messages, so threads that were incremented from
+    a missing counter are corrected too. Safe to re-run.
+    """
+    updated = 0
+    for doc in db.collection(PROJECTS_COLLECTION).select([]).stream():
+        if _backfill_watermark(db.transaction(), doc.reference):
+            updated += 1
+    print(f"✅ Message watermarks backfilled for {updated} requests")
+
+
+if __name__ == "__main__":
+    backfill_message_watermarks()
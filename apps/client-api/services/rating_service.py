@@ -0,0 +1,96 @@
+# apps/client-api/services/rating_service.py
+import copy
+import math
+from typing import Dict, Iterable, Optional
+
+from firebase_admin import firestore
+
+from config.clients import db
+
+REVIEWS_COLLECTION = "Reviews"
+CREATORS_COLLECTION = "creators"
+
+# Map on the creator doc holding the running aggregates
+RATING_STATS_FIELD = "ratingStats"
+
+def empty_stats() -> Dict:
+    return {
+        "sum": 0,
+        "count": 0,
+        "histogram": {str(star): 0 for star in range(1, 6)},
+        "aspects": {},  # {aspect: {"sum": x, "count": n}}
+    }
+
+
+def add_review(stats: Optional[Dict], overall_rating: float, aspects: Optional[Dict] = None) -> Dict:
+    """Return new aggregates with one more review folded in"""
+    stats = copy.deepcopy(stats) if stats else empty_stats()
+    stats["sum"] += overall_rating
+    stats["count"] += 1
+
+    # Half up (2.5 -> 3); round() would send 2.5 to the 2-star bucket
+    star = str(min(5, max(1, math.floor(overall_rating + 0.5))))
+    stats["histogram"][star] = stats["histogram"].get(star, 0) + 1
+
+    for aspect, value in (aspects or {}).items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        entry = stats["aspects"].setdefault(aspect, {"sum": 0, "count": 0})
+        entry["sum"] += value
+        entry["count"] += 1
+    return stats
+
+
+def stats_from_reviews(reviews: Iterable[Dict]) -> Dict:
+    stats = empty_stats()
+    for review in reviews:
+        stats = add_review(stats, review.get("overallRating", 0), review.get("aspects"))
+    return stats
+
+
+def rating_fields(stats: Dict) -> Dict:
+    """Creator doc fields derived from the aggregates (rating/reviewCount stay for readers)"""
+    count = stats["count"]
+    return {
+        RATING_STATS_FIELD: stats,
+        "rating": round(stats["sum"] / count, 1) if count else 0,
+        "reviewCount": count,
+    }
+
+
+@firestore.transactional
+def _rebuild_creator_transaction(transaction, creator_ref) -> bool:
+    """
+    Recompute one creator's aggregates from their reviews. A review
+    submitted meanwhile updates the same creator doc, so Firestore
+    serializes it with this rebuild instead of one overwriting the other.
+    """
+    creator = creator_ref.get(transaction=transaction)
+    if not creator.exists:
+        return False
+    query = db.collection(REVIEWS_COLLECTION).where("creatorId", "==", creator_ref.id)
+    stats = stats_from_reviews(doc.to_dict() or {} for doc in transaction.get(query))
+    transaction.update(creator_ref, rating_fields(stats))
+    return True
+
+
+def rebuild_creator_ratings():
+    """One-off backfill: rebuild every reviewed creator's aggregates, one transaction per creator"""
+    creator_ids = set()
+    for doc in db.collection(REVIEWS_COLLECTION).select(["creatorId"]).stream():
+        creator_id = (doc.to_dict() or {}).get("creatorId")
+        if creator_id:
+            creator_ids.add(creator_id)
+
+    updated = 0
+    for creator_id in sorted(creator_ids):
+        creator_ref = db.collection(CREATORS_COLLECTION).document(creator_id)
+        if _rebuild_creator_transaction(db.transaction(), creator_ref):
+            updated += 1
+        else:
+            print(f"⚠️ Skipping reviews for missing creator {creator_id}")
+    print(f"✅ Rebuilt rating aggregates for {updated} creators")
+
+
+if __name__ == "__main__":
+    rebuild_creator_ratings()
@@ -0,0 +1,136 @@
+# apps/client-api/services/style_embeddings.py
+import base64
+import io
+import re
+from typing import Dict, Optional, Type
+from urllib.parse import urlparse
+
+import numpy as np
+import requests
+from PIL import Image
+
+from config.env import settings
+
+# Portfolio images are downloaded at most this large before decoding
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+FETCH_TIMEOUT = (5, 15)  # (connect, read) seconds
+EMBED_SIZE = 128
+
+
+class Embedder:
+    """
+    Turns an image into a fixed-length, L2-normalised style vector.
+    Subclass and register in EMBEDDERS to plug in another model.
+    """
+    name = "base"
+    dim = 0
+
+    def embed(self, image: Image.Image) -> np.ndarray:
+        raise NotImplementedError
+
+
+class HistogramEmbedder(Embedder):
+    """
+    CPU-only colour/texture descriptor: an HSV colour histogram plus
+    gradient magnitude and orientation histograms of the luminance.
+    """
+    name = "histogram"
+    H_BINS, S_BINS, V_BINS = 8, 4, 4
+    TEXTURE_BINS = 8
+    dim = H_BINS * S_BINS * V_BINS + 2 * TEXTURE_BINS
+
+    def embed(self, image: Image.Image) -> np.ndarray:
+        image = image.convert("RGB")
+        image.thumbnail((EMBED_SIZE, EMBED_SIZE))
+
+        hsv = np.asarray(image.convert("HSV"), dtype=np.uint16)
+        h = hsv[..., 0] * self.H_BINS // 256
+        s = hsv[..., 1] * self.S_BINS // 256
+        v = hsv[..., 2] * self.V_BINS // 256
+        colour_bins = (h * self.S_BINS + s) * self.V_BINS + v
+        colour = np.bincount(
+            colour_bins.ravel(), minlength=self.H_BINS * self.S_BINS * self.V_BINS
+        ).astype(np.float32)
+        colour /= max(colour.sum(), 1.0)
+
+        gray = np.asarray(image.convert("L"), dtype=np.float32) / 255.0
+        gy, gx = np.gradient(gray)
+        magnitude = np.hypot(gx, gy)
+        orientation = np.mod(np.arctan2(gy, gx), np.pi)
+
+        # Magnitude spread captures smooth vs. detailed; orientation captures structure
+        mag_hist, _ = np.histogram(magnitude, bins=self.TEXTURE_BINS, range=(0.0, 0.5))
+        ori_hist, _ = np.histogram(
+            orientation, bins=self.TEXTURE_BINS, range=(0.0, np.pi), weights=magnitude
+        )
+        mag_hist = mag_hist.astype(np.float32) / max(mag_hist.sum(), 1.0)
+        ori_hist = ori_hist.astype(np.float32) / max(ori_hist.sum(), 1e-6)
+
+        # Hellinger mapping so dot products behave like histogram similarity
+        vector = np.sqrt(np.concatenate([colour, mag_hist, ori_hist]))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+EMBEDDERS: Dict[str, Type[Embedder]] = {
+    HistogramEmbedder.name: HistogramEmbedder,
+}
+
+
+def get_embedder(name: str) -> Embedder:
+    if name not in EMBEDDERS:
+        raise ValueError(f"Unknown style embedder '{name}'. Available: {', '.join(EMBEDDERS)}")
+    return EMBEDDERS[name]()
+
+
+def _thumbnail_url(url: str) -> str:
+    """Ask Cloudinary for a small rendition; the descriptor never needs full resolution"""
+    if "res.cloudinary.com" in url and "/image/upload/" in url:
+        return url.replace("/image/upload/", f"/image/upload/c_limit,w_{EMBED_SIZE * 2},h_{EMBED_SIZE * 2}/", 1)
+    return url
+
+
+def is_fetchable_url(url: str) -> bool:
+    """
+    Only our own Cloudinary uploads are downloaded. Reference images come
+    from clients, so anything else (internal hosts, metadata endpoints)
+    must never be requested from the server.
+    """
+    parsed = urlparse(url)
+    return (
+        parsed.scheme == "https"
+        and parsed.hostname == "res.cloudinary.com"
+        and parsed.port is None
+        and parsed.username is None
+        and parsed.path.startswith(f"/{settings.CLOUDINARY_CLOUD_NAME}/image/upload/")
+    )
+
+
+def load_image(url: str) -> Optional[Image.Image]:
+    """Decode a data: URL or fetch one of our Cloudinary images as a PIL image; None if it can't be read"""
+    try:
+        if url.startswith("data:image/"):
+            match = re.match(r"data:image/[\w.+-]+;base64,(.*)", url, re.DOTALL)
+            if not match:
+                return None
+            return Image.open(io.BytesIO(base64.b64decode(match.group(1))))
+
+        if not is_fetchable_url(url):
+            # Includes blob: URLs from the browser, which never reach the server as bytes
+            print(f"⚠️ Not fetching image outside our Cloudinary account: {url[:200]}")
+            return None
+
+        with requests.get(_thumbnail_url(url), timeout=FETCH_TIMEOUT, stream=True, allow_redirects=False) as response:
+            response.raise_for_status()
+            data = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                data.extend(chunk)
+                if len(data) > MAX_IMAGE_BYTES:
+                    print(f"⚠️ Skipping oversized image: {url}")
+                    return None
+        image = Image.open(io.BytesIO(bytes(data)))
+        image.load()
+        return image
+    except Exception as e:
+        print(f"⚠️ Could not load image {url}: {e}")
+        return None
@@ -0,0 +1,437 @@
+# apps/client-api/services/style_index.py
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.env import settings
+from services.style_embeddings import Embedder, get_embedder, load_image
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so the index can't be shared between workers
+    fcntl = None
+
+# Below this many vectors a brute-force scan is already sub-millisecond
+TRAIN_MIN_VECTORS = 512
+# Retrain the coarse quantizer once the index has grown this much since the last training
+RETRAIN_GROWTH = 4
+KMEANS_ITERATIONS = 8
+DEFAULT_NPROBE = 8
+# Snapshot to disk at most this often while vectors are being added
+SAVE_INTERVAL_SECONDS = 30
+FETCH_WORKERS = 8
+
+
+def _kmeans(vectors: np.ndarray, k: int, iterations: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on L2-normalised vectors"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        # Per-cluster sums in one pass: group rows by cluster, then reduce each run
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=k)
+        nonempty = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+        sums = np.add.reduceat(vectors[order], starts, axis=0)
+        norms = np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        centroids[nonempty] = sums / norms
+        # Re-seed empty clusters from random vectors
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            centroids[empty] = vectors[rng.integers(len(vectors), size=empty.size)]
+    return centroids
+
+
+class StyleIndex:
+    """
+    Inverted-file (IVF) approximate nearest-neighbour index over portfolio
+    image style vectors, persisted under settings.STYLE_INDEX_DIR.
+
+    Each vector is keyed by (creator_id, image_url). Queries only scan the
+    `nprobe` inverted lists closest to the query instead of every vector.
+    Vectors are added and removed incrementally; the coarse quantizer is
+    retrained only when the index has grown substantially.
+
+    Several API workers share the directory. Saves are serialized with a
+    file lock, and each one first takes any creator another worker has
+    written more recently (per-creator timestamps), so workers never drop
+    each other's updates. Before a search, a worker merges the saved files
+    again if another worker has replaced them since it last looked.
+    Sharing relies on flock, so on Windows run a single worker.
+    """
+
+    def __init__(self, directory: str, embedder: Embedder):
+        self.directory = directory
+        self.embedder = embedder
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._last_save = 0.0
+        # (inode, mtime) of the meta file as last read or written by this worker
+        self._disk_version: Optional[Tuple[int, int]] = None
+        self._clear()
+
+    def _clear(self):
+        self._vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._size = 0
+        self._keys: List[Tuple[str, str]] = []
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._by_creator: Dict[str, set] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._lists: List[set] = []
+        self._trained_size = 0
+        # creator_id -> time.time() of the last change, merged across workers on save
+        self._updated: Dict[str, float] = {}
+
+    # =========================
+    # PERSISTENCE
+    # =========================
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.directory, "style_index.npz")
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.directory, "style_index.json")
+
+    @property
+    def _lock_path(self):
+        return os.path.join(self.directory, "style_index.lock")
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive across processes; held while the files are read-merged-written"""
+        os.makedirs(self.directory, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _stat_meta(self) -> Optional[Tuple[int, int]]:
+        """Changes whenever a save replaces the files (os.replace gives a new inode)"""
+        try:
+            stat = os.stat(self._meta_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _read_files(self) -> Optional[Tuple[Dict, np.ndarray, np.ndarray]]:
+        """(meta, vectors, centroids) from disk, or None if missing or built by another embedder"""
+        if not (os.path.exists(self._vectors_path) and os.path.exists(self._meta_path)):
+            return None
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        if meta.get("embedder") != self.embedder.name or meta.get("dim") != self.embedder.dim:
+            print("⚠️ Style index was built with a different embedder; ignoring it")
+            return None
+        with np.load(self._vectors_path) as arrays:
+            return meta, arrays["vectors"], arrays["centroids"]
+
+    def load(self):
+        with self._lock:
+            self._clear()
+            try:
+                with self._file_lock():
+                    files = self._read_files()
+                    self._disk_version = self._stat_meta()
+                if files is None:
+                    return
+                meta, vectors, centroids = files
+                for (creator_id, url), vector in zip(meta["keys"], vectors):
+                    self._append(creator_id, url, vector)
+                if centroids.size:
+                    self._set_centroids(centroids)
+                    self._trained_size = meta.get("trained_size", self._size)
+                self._updated = dict(meta.get("updated", {}))
+                self._last_save = time.time()
+                print(f"✅ Style index loaded: {self._size} vectors")
+            except Exception as e:
+                print(f"❌ Failed to load style index: {e}")
+                self._clear()
+
+    def _merge_from_disk(self):
+        """Take every creator the saved index has a newer version of"""
+        try:
+            files = self._read_files()
+        except Exception as e:
+            print(f"⚠️ Could not read saved style index for merging: {e}")
+            return
+        if files is None:
+            return
+        meta, vectors, _ = files
+        saved = meta.get("updated", {})
+        newer = {creator_id for creator_id, at in saved.items() if at > self._updated.get(creator_id, 0.0)}
+        if not newer:
+            return
+        theirs: Dict[str, Dict[str, np.ndarray]] = {creator_id: {} for creator_id in newer}
+        for (creator_id, url), vector in zip(meta["keys"], vectors):
+            if creator_id in newer:
+                theirs[creator_id][url] = vector
+        for creator_id, creator_vectors in theirs.items():
+            self._replace_creator(creator_id, creator_vectors)
+            self._updated[creator_id] = saved[creator_id]
+        self._maybe_train()
+
+    def refresh(self):
+        """Merge in what other workers have saved since this worker last read or wrote the files"""
+        if self._stat_meta() == self._disk_version:
+            return
+        with self._lock, self._file_lock():
+            version = self._stat_meta()
+            if version != self._disk_version:
+                self._merge_from_disk()
+                self._disk_version = version
+
+    def save(self):
+        with self._lock, self._file_lock():
+            self._merge_from_disk()
+            centroids = self._centroids if self._centroids is not None else np.zeros((0, self.embedder.dim))
+            # Per-process temp names, then an atomic rename over the shared files
+            suffix = f".{os.getpid()}.tmp"
+            tmp_vectors = self._vectors_path + suffix + ".npz"
+            tmp_meta = self._meta_path + suffix
+            np.savez(tmp_vectors, vectors=self._vectors[:self._size], centroids=centroids)
+            with open(tmp_meta, "w") as f:
+                json.dump({
+                    "embedder": self.embedder.name,
+                    "dim": self.embedder.dim,
+                    "trained_size": self._trained_size,
+                    "keys": self._keys,
+                    "updated": self._updated,
+                }, f)
+            os.replace(tmp_vectors, self._vectors_path)
+            os.replace(tmp_meta, self._meta_path)
+            self._disk_version = self._stat_meta()
+            self._dirty = False
+            self._last_save = time.time()
+
+    def save_if_dirty(self, force: bool = False):
+        with self._lock:
+            if self._dirty and (force or time.time() - self._last_save >= SAVE_INTERVAL_SECONDS):
+                self.save()
+
+    # =========================
+    # INDEX MAINTENANCE
+    # =========================
+    def _append(self, creator_id: str, url: str, vector: np.ndarray):
+        if self._size == len(self._vectors):
+            grown = np.zeros((max(64, 2 * self._size), self.embedder.dim), dtype=np.float32)
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+            assign = np.zeros(len(grown), dtype=np.int32)
+            assign[:self._size] = self._assign[:self._size]
+            self._assign = assign
+
+        row = self._size
+        self._vectors[row] = vector
+        self._size += 1
+        key = (creator_id, url)
+        self._keys.append(key)
+        self._rows[key] = row
+        self._by_creator.setdefault(creator_id, set()).add(row)
+        if self._centroids is not None:
+            cluster = int(np.argmax(self._centroids @ vector))
+            self._assign[row] = cluster
+            self._lists[cluster].add(row)
+
+    def _delete_row(self, row: int):
+        """Swap-remove so vectors stay contiguous"""
+        last = self._size - 1
+        key = self._keys[row]
+        self._by_creator[key[0]].discard(row)
+        if not self._by_creator[key[0]]:
+            del self._by_creator[key[0]]
+        del self._rows[key]
+        if self._centroids is not None:
+            self._lists[self._assign[row]].discard(row)
+
+        if row != last:
+            moved_key = self._keys[last]
+            self._vectors[row] = self._vectors[last]
+            self._keys[row] = moved_key
+            self._rows[moved_key] = row
+            self._by_creator[moved_key[0]].discard(last)
+            self._by_creator[moved_key[0]].add(row)
+            if self._centroids is not None:
+                cluster = self._assign[last]
+                self._lists[cluster].discard(last)
+                self._lists[cluster].add(row)
+                self._assign[row] = cluster
+
+        self._keys.pop()
+        self._size -= 1
+
+    def _set_centroids(self, centroids: np.ndarray):
+        self._centroids = centroids.astype(np.float32)
+        self._lists = [set() for _ in range(len(centroids))]
+        if self._size:
+            assign = np.argmax(self._vectors[:self._size] @ self._centroids.T, axis=1).astype(np.int32)
+            self._assign[:self._size] = assign
+            for row, cluster in enumerate(assign.tolist()):
+                self._lists[cluster].add(row)
+
+    def _maybe_train(self):
+        if self._size < TRAIN_MIN_VECTORS:
+            return
+        if self._centroids is not None and self._size < RETRAIN_GROWTH * self._trained_size:
+            return
+        k = int(min(1024, max(8, np.sqrt(self._size))))
+        started = time.perf_counter()
+        self._set_centroids(_kmeans(self._vectors[:self._size], k, KMEANS_ITERATIONS))
+        self._trained_size = self._size
+        print(f"📐 Style index trained: {k} lists over {self._size} vectors "
+              f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _replace_creator(self, creator_id: str, vectors: Dict[str, np.ndarray]):
+        for row in sorted(self._by_creator.get(creator_id, set()), reverse=True):
+            if self._keys[row][1] not in vectors:
+                self._delete_row(row)
+        for url, vector in vectors.items():
+            row = self._rows.get((creator_id, url))
+            if row is not None:
+                if np.array_equal(self._vectors[row], vector):
+                    continue
+                self._delete_row(row)
+            self._append(creator_id, url, vector)
+
+    def upsert_creator(self, creator_id: str, vectors: Dict[str, np.ndarray]):
+        """Make the creator's indexed images exactly `vectors` (url -> vector)"""
+        with self._lock:
+            self._replace_creator(creator_id, vectors)
+            self._updated[creator_id] = time.time()
+            self._maybe_train()
+            self._dirty = True
+
+    def indexed_urls(self, creator_id: str) -> set:
+        with self._lock:
+            return {self._keys[row][1] for row in self._by_creator.get(creator_id, set())}
+
+    def get_vectors(self, creator_id: str) -> Dict[str, np.ndarray]:
+        with self._lock:
+            return {
+                self._keys[row][1]: self._vectors[row].copy()
+                for row in self._by_creator.get(creator_id, set())
+            }
+
+    # =========================
+    # QUERIES
+    # =========================
+    def search(self, query: np.ndarray, k: int = 50, nprobe: int = DEFAULT_NPROBE) -> List[Tuple[str, str, float]]:
+        """Nearest image vectors to one query as (creator_id, url, cosine similarity)"""
+        with self._lock:
+            if self._size == 0:
+                return []
+            if self._centroids is None:
+                rows = np.arange(self._size)
+            else:
+                probes = np.argsort(-(self._centroids @ query))[:nprobe]
+                rows = np.fromiter(
+                    (row for cluster in probes for row in self._lists[cluster]), dtype=np.int64
+                )
+                if rows.size == 0:
+                    return []
+            sims = self._vectors[rows] @ query
+            top = min(k, len(rows))
+            best = np.argpartition(-sims, top - 1)[:top]
+            best = best[np.argsort(-sims[best])]
+            return [
+                (self._keys[rows[i]][0], self._keys[rows[i]][1], float(sims[i]))
+                for i in best.tolist()
+            ]
+
+    def search_creators(self, queries: List[np.ndarray], limit: int = 20,
+                        nprobe: int = DEFAULT_NPROBE) -> List[Tuple[str, float]]:
+        """
+        Creators whose portfolio looks like the reference images: each creator
+        scores the mean over references of their best-matching image.
+        """
+        if not queries:
+            return []
+        scores: Dict[str, float] = {}
+        for query in queries:
+            best: Dict[str, float] = {}
+            for creator_id, _, sim in self.search(query, k=limit * 10, nprobe=nprobe):
+                if sim > best.get(creator_id, -1.0):
+                    best[creator_id] = sim
+            for creator_id, sim in best.items():
+                scores[creator_id] = scores.get(creator_id, 0.0) + sim / len(queries)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "embedder": self.embedder.name,
+                "dim": self.embedder.dim,
+                "vectors": self._size,
+                "creators": len(self._by_creator),
+                "lists": len(self._lists),
+                "trained_size": self._trained_size,
+            }
+
+
+style_index = StyleIndex(settings.STYLE_INDEX_DIR, get_embedder(settings.STYLE_EMBEDDER))
+
+
+def embed_urls(urls: List[str]) -> Dict[str, np.ndarray]:
+    """Download and embed images concurrently; unreadable URLs are left out"""
+    def _embed(url):
+        image = load_image(url)
+        return url, (style_index.embedder.embed(image) if image is not None else None)
+
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(urls))) as pool:
+        return {url: vector for url, vector in pool.map(_embed, urls) if vector is not None}
+
+
+def index_creator_portfolio(creator_id: str, image_urls: List[str]) -> bool:
+    """
+    Incrementally index a creator's portfolio: only URLs not already in the
+    index are downloaded and embedded. True when every image is indexed.
+    """
+    wanted = [url for url in dict.fromkeys(image_urls or []) if url]
+    known = style_index.get_vectors(creator_id)
+    new_vectors = embed_urls([url for url in wanted if url not in known])
+
+    vectors = {url: known[url] if url in known else new_vectors.get(url) for url in wanted}
+    vectors = {url: vector for url, vector in vectors.items() if vector is not None}
+    style_index.upsert_creator(creator_id, vectors)
+    style_index.save_if_dirty()
+    return len(vectors) == len(wanted)
+
+
+def find_similar_creators(reference_urls: List[str], limit: int = 20) -> List[Tuple[str, float]]:
+    queries = list(embed_urls([url for url in reference_urls if url]).values())
+    style_index.refresh()
+    return style_index.search_creators(queries, limit)
+
+
+def reindex_all_creators():
+    """One-off (re)build over every creator's saved portfolio_images"""
+    from config.clients import db
+    from services.creators_service import CREATORS_COLLECTION
+
+    style_index.load()
+    for doc in db.collection(CREATORS_COLLECTION).select(["portfolio_images"]).stream():
+        urls = (doc.to_dict() or {}).get("portfolio_images") or []
+        ok = index_creator_portfolio(doc.id, urls)
+        print(f"{'✅' if ok else '⚠️'} {doc.id}: {len(urls)} images")
+    style_index.save()
+    print(f"Style index: {style_index.stats()}")
+
+
+if __name__ == "__main__":
+    reindex_all_creators()
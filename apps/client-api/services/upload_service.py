@@ -0,0 +1,318 @@
+# apps/client-api/services/upload_service.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from config.env import settings
+from services.claudinary_service import ClaudinaryService
+from services.image_meta import extract_image_meta
+
+# Parts are kept in memory up to this size, then spooled to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+# Multipart framing allowance per file when checking Content-Length up front
+PART_OVERHEAD = 16 * 1024
+SNIFF_BYTES = 12
+
+
+def _sniff(head: bytes) -> Optional[str]:
+    """Content type from the leading bytes of a file"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1"):
+        return "image/heic"
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    return None
+
+
+class UploadPolicy:
+    def __init__(self, name: str, allowed_types: set, max_bytes: int, folder: str, resource_type: str):
+        self.name = name
+        self.allowed_types = allowed_types
+        self.max_bytes = max_bytes
+        self.folder = folder
+        self.resource_type = resource_type
+
+
+IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif", "image/heic"}
+
+PORTFOLIO_IMAGES = UploadPolicy(
+    "portfolio_images",
+    IMAGE_TYPES,
+    settings.UPLOAD_MAX_IMAGE_MB * 1024 * 1024,
+    folder="portfolio_images",
+    resource_type="image",
+)
+VERIFICATION_DOCUMENTS = UploadPolicy(
+    "verification_documents",
+    IMAGE_TYPES | {"application/pdf"},
+    settings.UPLOAD_MAX_DOCUMENT_MB * 1024 * 1024,
+    folder="verification_documents",
+    resource_type="auto",
+)
+
+
+def cloudinary_upload(file, policy: UploadPolicy) -> str:
+    if policy.resource_type == "image":
+        return ClaudinaryService.upload_image(file, folder=policy.folder)
+    return ClaudinaryService.upload_document(file, folder=policy.folder)
+
+
+class _Part:
+    def __init__(self, index: int):
+        self.index = index
+        self.headers: Dict[bytes, bytes] = {}
+        self.filename: Optional[str] = None
+        self.declared_type = ""
+        self.file: Optional[SpooledTemporaryFile] = None
+        self.head = b""
+        self.size = 0
+        self.error: Optional[str] = None
+        self.future: Optional[asyncio.Future] = None
+
+
+class _BatchReader:
+    """
+    Multipart callbacks for one request. Each file is checked as its bytes
+    arrive: the declared type when its headers end, the real type from the
+    first bytes, the size on every chunk. A rejected file's remaining bytes
+    are discarded, and an accepted one is handed to the upload pool as soon
+    as its part ends, while later files are still being received.
+    """
+
+    def __init__(self, service: "BatchUploadService", policy: UploadPolicy):
+        self.service = service
+        self.policy = policy
+        self.loop = asyncio.get_running_loop()
+        self.parts: List[_Part] = []
+        self.current: Optional[_Part] = None
+        self._header_name = b""
+        self._header_value = b""
+        self._pending_writes: List = []
+
+    # Header parsing
+    def on_part_begin(self):
+        self.current = _Part(len(self.parts))
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self.current.headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        part = self.current
+        _, options = parse_options_header(part.headers.get(b"content-disposition"))
+        if b"filename" not in options:
+            # Plain form field: ignored
+            self.current = None
+            return
+        part.filename = options[b"filename"].decode("utf-8", "replace")
+        part.declared_type = parse_options_header(part.headers.get(b"content-type"))[0].decode("latin-1").lower()
+        self.parts.append(part)
+
+        if len(self.parts) > self.service.max_files:
+            part.error = f"Too many files (max {self.service.max_files})"
+        elif part.declared_type not in self.policy.allowed_types:
+            part.error = f"Unsupported file type: {part.declared_type or 'unknown'}"
+        else:
+            part.file = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    # Body streaming
+    def on_part_data(self, data: bytes, start: int, end: int):
+        part = self.current
+        if part is None or part.error:
+            return
+        chunk = data[start:end]
+        part.size += len(chunk)
+        if part.size > self.policy.max_bytes:
+            self._reject(part, f"File exceeds {self.policy.max_bytes / (1024 * 1024):g}MB limit")
+            return
+        if len(part.head) < SNIFF_BYTES:
+            part.head += chunk[:SNIFF_BYTES - len(part.head)]
+            if len(part.head) >= SNIFF_BYTES and not self._type_matches(part):
+                return
+        self._pending_writes.append((part, chunk))
+
+    def on_part_end(self):
+        part = self.current
+        self.current = None
+        if part is None or part.error:
+            return
+        if part.size == 0:
+            self._reject(part, "Empty file")
+            return
+        if len(part.head) < SNIFF_BYTES and not self._type_matches(part):
+            return
+        self._pending_writes.append((part, None))
+
+    def _type_matches(self, part: _Part) -> bool:
+        if _sniff(part.head) != part.declared_type:
+            self._reject(part, "File content does not match its type")
+            return False
+        return True
+
+    def _reject(self, part: _Part, error: str):
+        part.error = error
+        self._pending_writes = [(p, c) for p, c in self._pending_writes if p is not part]
+        if part.file is not None:
+            part.file.close()
+            part.file = None
+
+    def flush(self) -> List[_Part]:
+        """Write buffered chunks (may touch disk, so runs in the threadpool)"""
+        writes, self._pending_writes = self._pending_writes, []
+        finished = []
+        for part, chunk in writes:
+            if chunk is None:
+                part.file.seek(0)
+                finished.append(part)
+            else:
+                part.file.write(chunk)
+        return finished
+
+    def submit(self, finished: List[_Part]):
+        for part in finished:
+            part.future = self.loop.run_in_executor(
+                self.service._executor, self.service._upload, part.file, self.policy
+            )
+
+    def close(self):
+        """Drop files not yet handed to the pool (the pool closes its own)"""
+        for part in self.parts:
+            if part.file is not None and part.future is None:
+                part.file.close()
+
+
+class BatchUploadService:
+    """
+    Multi-file uploads streamed straight from the request body to storage
+    on a bounded pool of upload workers (UPLOAD_WORKERS per process).
+    `uploader(file, policy) -> url` defaults to Cloudinary.
+    """
+
+    def __init__(self, workers: int, max_files: int, uploader: Callable = cloudinary_upload):
+        self.workers = workers
+        self.max_files = max_files
+        self.uploader = uploader
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="uploads")
+        self.files_uploaded = 0
+        self.files_rejected = 0
+        self.files_failed = 0
+        self.bytes_uploaded = 0
+
+    def _upload(self, file, policy: UploadPolicy):
+        """(url, image meta or None); meta is read from the local copy before upload"""
+        try:
+            meta = extract_image_meta(file) if policy.resource_type == "image" else None
+            return self.uploader(file, policy), meta
+        finally:
+            file.close()
+
+    async def upload_request(self, request: Request, policy: UploadPolicy) -> List[Dict]:
+        """Per-file results, in request order, for a multipart/form-data body"""
+        content_type, params = parse_options_header(request.headers.get("content-type"))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            if int(content_length) > self.max_files * (policy.max_bytes + PART_OVERHEAD):
+                raise HTTPException(status_code=413, detail="Upload too large")
+
+        reader = _BatchReader(self, policy)
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": reader.on_part_begin,
+            "on_part_data": reader.on_part_data,
+            "on_part_end": reader.on_part_end,
+            "on_header_field": reader.on_header_field,
+            "on_header_value": reader.on_header_value,
+            "on_header_end": reader.on_header_end,
+            "on_headers_finished": reader.on_headers_finished,
+        })
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                if reader._pending_writes:
+                    reader.submit(await run_in_threadpool(reader.flush))
+            parser.finalize()
+        except Exception:
+            reader.close()
+            raise
+
+        if not reader.parts:
+            raise HTTPException(status_code=400, detail="No files in upload")
+        # A truncated body leaves the last part without an end (and so never submitted)
+        for part in reader.parts:
+            if part.future is None and not part.error:
+                reader._reject(part, "Upload incomplete")
+
+        futures = [part.future for part in reader.parts if part.future is not None]
+        await asyncio.gather(*futures, return_exceptions=True)
+
+        results = []
+        for part in reader.parts:
+            result = {"filename": part.filename, "size": part.size, "success": False}
+            if part.error:
+                self.files_rejected += 1
+                result["error"] = part.error
+            elif part.future.exception() is not None:
+                self.files_failed += 1
+                print(f"Upload Error ({part.filename}): {part.future.exception()}")
+                result["error"] = "Upload to storage failed"
+            else:
+                self.files_uploaded += 1
+                self.bytes_uploaded += part.size
+                url, meta = part.future.result()
+                result.update(success=True, url=url)
+                if meta:
+                    result["meta"] = meta
+            results.append(result)
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "max_files": self.max_files,
+            "files_uploaded": self.files_uploaded,
+            "files_rejected": self.files_rejected,
+            "files_failed": self.files_failed,
+            "bytes_uploaded": self.bytes_uploaded,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+batch_uploader = BatchUploadService(settings.UPLOAD_WORKERS, settings.UPLOAD_MAX_FILES)
+
+
+def summarize(results: List[Dict]) -> Dict:
+    uploaded = [r for r in results if r["success"]]
+    return {
+        "success": len(uploaded) == len(results),
+        "uploaded": len(uploaded),
+        "failed": len(results) - len(uploaded),
+        "urls": [r["url"] for r in uploaded],
+        "results": results,
+    }
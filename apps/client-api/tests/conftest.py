@@ -0,0 +1,19 @@
+# apps/client-api/tests/conftest.py
+import os
+import sys
+
+# Importing the config package connects the shared client; never reach a real project from tests
+os.environ["STORAGE_BACKEND"] = "memory"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from config.local_store import connect  # noqa: E402
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def client(request, tmp_path):
+    """A LocalClient on each backend, empty for every test"""
+    local = connect(request.param, str(tmp_path / "local.db"))
+    yield local
+    local.close()
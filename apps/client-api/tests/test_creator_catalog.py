@@ -0,0 +1,86 @@
+# apps/client-api/tests/test_creator_catalog.py
+"""
+The in-process creator catalog against creators_service.get_all_creators,
+fed by the LocalClient snapshot listener.
+
+Run (from apps/client-api):
+    python -m pytest tests
+"""
+import time
+
+import pytest
+
+from services import creator_catalog as catalog_module
+from services import creators_service
+from services.creator_catalog import CreatorCatalog
+
+CREATORS = {
+    "a": {"full_name": "A", "role": "photographer", "city": "Pune", "starting_price": 5000, "rating": 4.8,
+          "style_tags": ["Candid"], "categories": ["wedding"]},
+    "b": {"full_name": "B", "role": "Videographer", "city": "Navi Mumbai", "starting_price": 12000, "rating": 4.1,
+          "style_tags": ["cinematic"], "categories": ["wedding", "corporate"]},
+    "c": {"full_name": "C", "role": "both", "city": "Mumbai", "starting_price": 8000,
+          "style_tags": ["candid", "cinematic"], "categories": ["portrait"]},
+    "d": {"full_name": "D", "role": "client", "city": "Pune"},
+}
+
+
+def _wait_for_snapshot(catalog, version):
+    deadline = time.monotonic() + 5
+    while catalog.version <= version:
+        assert time.monotonic() < deadline, "no snapshot applied"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def catalog(client, monkeypatch):
+    """A catalog listening to `client`, with get_all_creators reading the same store"""
+    monkeypatch.setattr(creators_service, "db", client)
+    monkeypatch.setattr(catalog_module, "db", client)
+    for doc_id, data in CREATORS.items():
+        client.collection("creators").document(doc_id).set(data)
+    catalog = CreatorCatalog()
+    catalog.start()
+    assert catalog.wait_until_ready(timeout=5)
+    yield catalog
+    catalog.stop()
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"category": "photographer"},
+    {"category": "VIDEOGRAPHER"},
+    # Portfolio categories aren't roles, so like get_all_creators nothing matches
+    {"category": "wedding"},
+    {"location": "mumbai"},
+    {"price_min": 6000},
+    {"price_min": 5000, "price_max": 8000},
+    {"rating": 4.5},
+    {"styles": ["CANDID"]},
+    {"styles": ["cinematic"], "location": "mumbai", "price_max": 10000},
+])
+def test_query_matches_get_all_creators(catalog, filters):
+    expected = sorted(creator["id"] for creator in creators_service.get_all_creators(filters))
+    assert [creator["id"] for creator in catalog.query(filters)] == expected
+
+
+def test_malformed_creator_is_skipped(catalog, client):
+    creators = client.collection("creators")
+    version = catalog.version
+
+    # The malformed doc and a valid one arrive in the same batch
+    batch = client.batch()
+    batch.update(creators.document("a"), {"starting_price": "on request"})
+    batch.set(creators.document("e"), {"full_name": "E", "role": "photographer", "city": "Goa"})
+    batch.commit()
+    _wait_for_snapshot(catalog, version)
+
+    assert catalog.get("a") is None
+    assert catalog.get("e") is not None
+    assert [creator["id"] for creator in catalog.query({"location": "pune"})] == []
+
+    # Fixing the doc puts it back
+    version = catalog.version
+    creators.document("a").update({"starting_price": 5000})
+    _wait_for_snapshot(catalog, version)
+    assert [creator["id"] for creator in catalog.query({"location": "pune"})] == ["a"]
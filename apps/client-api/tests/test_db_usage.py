@@ -0,0 +1,89 @@
+# apps/client-api/tests/test_db_usage.py
+"""
+Per-request Firestore usage and read budgets, counted on a LocalClient.
+
+Run (from apps/client-api):
+    python -m pytest tests
+"""
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from services.db_usage import FirestoreUsageMiddleware, FirestoreUsageTracker, capture_requests
+
+
+def _app(client, tracker):
+    app = FastAPI()
+    app.add_middleware(FirestoreUsageMiddleware, tracker=tracker)
+
+    @app.get("/creators")
+    def list_creators():
+        # Like get_all_creators: any error becomes an empty list
+        try:
+            return [doc.id for doc in client.collection("creators").stream()]
+        except Exception:
+            return []
+
+    @app.get("/creators/{creator_id}")
+    def get_creator(creator_id: str):
+        return client.collection("creators").document(creator_id).get().to_dict()
+
+    return app
+
+
+@pytest.fixture
+def creators(client):
+    for i in range(5):
+        client.collection("creators").document(f"c{i}").set({"full_name": f"C{i}"})
+    return client
+
+
+@pytest.mark.parametrize("budget_mode", ["log", "fail"])
+def test_reads_are_counted_per_route(creators, budget_mode):
+    tracker = FirestoreUsageTracker(10, {}, budget_mode, header=True)
+    tracker.instrument(creators)
+
+    with TestClient(_app(creators, tracker)) as http, capture_requests(tracker) as captured:
+        listed = http.get("/creators")
+        http.get("/creators/c1")
+
+    assert listed.status_code == 200 and len(listed.json()) == 5
+    assert listed.headers["x-firestore-usage"] == "reads=5; writes=0; rpcs=1"
+    captured.assert_max_reads("/creators", 5)
+    captured.assert_max_reads("/creators/{creator_id}", 1)
+
+
+def test_fail_mode_rejects_after_handler_swallows(creators):
+    tracker = FirestoreUsageTracker(2, {}, "fail", header=False)
+    tracker.instrument(creators)
+
+    with TestClient(_app(creators, tracker)) as http, capture_requests(tracker) as captured:
+        listed = http.get("/creators")
+        single = http.get("/creators/c1")
+
+    assert listed.status_code == 500
+    assert listed.json() == {"detail": "Firestore read budget exceeded for /creators: 5 reads (budget 2)"}
+    assert single.status_code == 200
+    assert [u.status for u in captured.for_route("/creators")] == [500]
+
+
+def test_listener_reads_count_as_background(creators):
+    tracker = FirestoreUsageTracker(10, {}, "log", header=False)
+    tracker.instrument(creators)
+    received = []
+
+    watch = creators.collection("creators").on_snapshot(
+        tracker.count_listener(lambda docs, changes, read_time: received.append(len(changes)))
+    )
+    creators.collection("creators").document("c1").update({"full_name": "Renamed"})
+    creators.collection("creators").document("c2").delete()
+    deadline = time.monotonic() + 5
+    while len(received) < 3:
+        assert time.monotonic() < deadline, "listener didn't fire"
+        time.sleep(0.01)
+    watch.unsubscribe()
+
+    # 5 initial documents and 1 modified; removals aren't billed
+    assert tracker.background.reads == 6
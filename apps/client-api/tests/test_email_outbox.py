@@ -0,0 +1,131 @@
+# apps/client-api/tests/test_email_outbox.py
+"""
+EmailOutbox against a local SMTP server (aiosmtpd): enqueue, delivery over
+one session, retry of temporary failures, drop of permanent ones.
+
+Run (from apps/client-api):
+    python -m pytest tests
+"""
+import asyncio
+import socket
+import time
+from email import message_from_bytes
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller  # noqa: E402
+
+from services.email_outbox import EmailOutbox  # noqa: E402
+from services.homePage_service import build_contact_email  # noqa: E402
+
+
+class Server:
+    """aiosmtpd handler: answers DATA from `replies` first, then 250"""
+
+    def __init__(self, replies=()):
+        self.replies = list(replies)
+        self.sessions = 0
+        self.delivered = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        self.sessions += 1
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.replies:
+            return self.replies.pop(0)
+        self.delivered.append(message_from_bytes(envelope.content))
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    servers = []
+
+    def start(replies=()):
+        handler = Server(replies)
+        controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+        controller.start()
+        servers.append(controller)
+        return handler, controller.port
+
+    yield start
+    for controller in servers:
+        controller.stop()
+
+
+def _message(i: int):
+    msg = build_contact_email(f"Visitor {i}", f"visitor{i}@example.com", "Hello")
+    msg.replace_header("From", "site@example.com")
+    msg.replace_header("To", "owner@example.com")
+    return msg
+
+
+def _run(outbox: EmailOutbox, messages, until):
+    async def flow():
+        outbox.start()
+        accepted = [outbox.enqueue(message) for message in messages]
+        deadline = time.monotonic() + 5
+        while not until() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        await outbox.stop()
+        return accepted
+
+    return asyncio.run(flow())
+
+
+def _outbox(port: int, **kwargs) -> EmailOutbox:
+    outbox = EmailOutbox("127.0.0.1", port=port, starttls=False, timeout=2, **kwargs)
+    outbox.BACKOFF_BASE = 0.01
+    return outbox
+
+
+def test_delivers_queued_mail_over_one_session(smtp_server):
+    server, port = smtp_server()
+    outbox = _outbox(port)
+
+    accepted = _run(outbox, [_message(i) for i in range(5)], lambda: outbox.sent == 5)
+
+    assert accepted == [True] * 5
+    assert [m["Reply-To"] for m in server.delivered] == [f"visitor{i}@example.com" for i in range(5)]
+    assert server.sessions == 1 and outbox.connections == 1
+
+
+def test_temporary_failure_is_retried(smtp_server):
+    server, port = smtp_server(replies=["451 Try again later"])
+    outbox = _outbox(port)
+
+    _run(outbox, [_message(0)], lambda: outbox.sent == 1)
+
+    assert len(server.delivered) == 1
+    assert outbox.stats()["retried"] == 1 and outbox.stats()["dropped"] == 0
+
+
+def test_permanent_failure_and_exhausted_retries_are_dropped(smtp_server):
+    server, port = smtp_server(replies=["550 No such user", "451 Busy", "451 Busy"])
+    outbox = _outbox(port, max_retries=1)
+
+    _run(outbox, [_message(0), _message(1)], lambda: outbox.dropped == 2)
+
+    assert server.delivered == []
+    assert outbox.stats()["dropped"] == 2 and outbox.stats()["retried"] == 1
+
+
+def test_enqueue_without_a_running_worker_is_rejected():
+    outbox = EmailOutbox("")
+    assert outbox.enqueue(_message(0)) is False
+    assert outbox.stats()["rejected"] == 1
+
+
+def test_subject_keeps_a_multiline_name_on_one_line():
+    msg = build_contact_email("Mallory\r\nBcc: victim@example.com", "m@example.com", "Hi")
+    assert msg["Subject"] == "New Contact Form Message from Mallory Bcc: victim@example.com"
+    assert msg["Bcc"] is None
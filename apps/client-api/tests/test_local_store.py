@@ -0,0 +1,306 @@
+# apps/client-api/tests/test_local_store.py
+"""
+LocalClient against the Firestore behaviour the routers and services rely
+on. Every test runs on both the memory and the SQLite store.
+
+Run (from apps/client-api):
+    python -m pytest tests
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists, NotFound
+
+from config.local_store import connect
+from services.pagination import paginate_query
+
+
+def _ids(snapshots):
+    return [s.id for s in snapshots]
+
+
+# =========================
+# DOCUMENTS AND TRANSFORMS
+# =========================
+def test_set_merge_update_delete(client):
+    ref = client.collection("creators").document("a")
+    ref.set({"name": "A", "pricing": {"day": 100, "hour": 20}})
+
+    ref.set({"pricing": {"day": 150}}, merge=True)
+    assert ref.get().to_dict() == {"name": "A", "pricing": {"day": 150, "hour": 20}}
+
+    # update() takes field paths, and a map value replaces the whole map
+    ref.update({"pricing.hour": 25, "city": "Pune"})
+    assert ref.get().to_dict()["pricing"] == {"day": 150, "hour": 25}
+    ref.update({"pricing": {"day": 1}})
+    assert ref.get().to_dict()["pricing"] == {"day": 1}
+
+    with pytest.raises(AlreadyExists):
+        ref.create({"name": "again"})
+    with pytest.raises(NotFound):
+        client.collection("creators").document("missing").update({"x": 1})
+
+    ref.delete()
+    assert not ref.get().exists
+
+
+def test_transforms(client):
+    ref = client.collection("creators").document("a")
+    ref.set({"reviews": 1, "tags": ["wedding"], "old": True})
+    ref.update({
+        "reviews": firestore.Increment(2),
+        "tags": firestore.ArrayUnion(["wedding", "portrait"]),
+        "old": firestore.DELETE_FIELD,
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    })
+    data = ref.get().to_dict()
+    assert data["reviews"] == 3
+    assert data["tags"] == ["wedding", "portrait"]
+    assert "old" not in data
+    assert isinstance(data["updated_at"], datetime)
+
+    ref.update({"tags": firestore.ArrayRemove(["wedding"]), "missing_counter": firestore.Increment(1)})
+    data = ref.get().to_dict()
+    assert data["tags"] == ["portrait"]
+    assert data["missing_counter"] == 1
+
+
+def test_array_union_of_maps_appends_once(client):
+    ref = client.collection("creators").document("a")
+    ref.set({"verification_documents": []})
+    entry = {"verification_type": "pan", "submitted_at": datetime(2024, 1, 1)}
+    for _ in range(2):
+        ref.set({"verification_documents": firestore.ArrayUnion([entry])}, merge=True)
+    assert ref.get().to_dict()["verification_documents"] == [entry]
+
+
+# =========================
+# QUERIES AND CURSORS
+# =========================
+@pytest.fixture
+def requests(client):
+    col = client.collection("ProjectRequests")
+    rows = {
+        "r1": {"clientId": "c1", "createdAt": 300, "tags": ["a"]},
+        "r2": {"clientId": "c1", "createdAt": 100, "tags": ["a", "b"]},
+        "r3": {"clientId": "c1", "createdAt": 300},
+        "r4": {"clientId": "c2", "createdAt": 200, "tags": ["b"]},
+        "r5": {"clientId": "c1"},  # no createdAt: never returned by a query ordered on it
+    }
+    for doc_id, data in rows.items():
+        col.document(doc_id).set(data)
+    return col
+
+
+def test_filters(requests):
+    assert _ids(requests.where("clientId", "==", "c1").stream()) == ["r1", "r2", "r3", "r5"]
+    assert _ids(requests.where("clientId", "in", ["c2", "c3"]).stream()) == ["r4"]
+    assert _ids(requests.where("tags", "array_contains", "b").stream()) == ["r2", "r4"]
+    assert _ids(requests.where("createdAt", ">", 100).stream()) == ["r4", "r1", "r3"]
+
+
+def test_order_by_skips_missing_and_breaks_ties_by_id(requests):
+    query = requests.where("clientId", "==", "c1")
+    assert _ids(query.order_by("createdAt").stream()) == ["r2", "r1", "r3"]
+    assert _ids(query.order_by("createdAt", direction="DESCENDING").order_by("__name__", direction="DESCENDING").stream()) == ["r3", "r1", "r2"]
+
+
+def test_cursors(requests):
+    query = requests.order_by("createdAt").order_by("__name__")
+    assert _ids(query.start_after({"createdAt": 300, "__name__": "r1"}).stream()) == ["r3"]
+    anchor = requests.document("r4").get()
+    assert _ids(query.start_after(anchor).stream()) == ["r1", "r3"]
+    assert _ids(query.start_at(anchor).limit(2).stream()) == ["r4", "r1"]
+    assert _ids(query.end_before(anchor).stream()) == ["r2"]
+
+
+def test_select_projects_fields(requests):
+    snapshot = next(iter(requests.where("clientId", "==", "c2").select(["createdAt"]).stream()))
+    assert snapshot.id == "r4"
+    assert snapshot.to_dict() == {"createdAt": 200}
+
+
+def test_paginate_query_walks_every_page_in_order(client):
+    col = client.collection("ProjectRequests")
+    for i in range(23):
+        # Plenty of createdAt ties, so the __name__ tie-breaker decides page boundaries
+        col.document(f"r{i:02d}").set({"id": f"r{i:02d}", "clientId": "c1", "createdAt": i // 4})
+    query = col.where("clientId", "==", "c1")
+
+    pages, cursor = [], None
+    while True:
+        rows, cursor = paginate_query(query, 5, cursor, order_field="createdAt", descending=True)
+        pages.append([row["id"] for row in rows])
+        if cursor is None:
+            break
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert sum(pages, []) == sorted((f"r{i:02d}" for i in range(23)), key=lambda id_: (int(id_[1:]) // 4, id_), reverse=True)
+
+    # No limit: every row, newest first, without needing the query ordered server-side
+    rows, cursor = paginate_query(query, None, order_field="createdAt", descending=True)
+    assert cursor is None
+    assert [row["createdAt"] for row in rows] == sorted((i // 4 for i in range(23)), reverse=True)
+
+
+def test_paginate_query_timestamps_and_mixed_types(client):
+    col = client.collection("ProjectRequests")
+    start = datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    for i in range(7):
+        col.document(f"r{i}").set({"id": f"r{i}", "createdAt": start + timedelta(minutes=i // 2)})
+
+    # Timestamp cursors survive the JSON round trip
+    pages, cursor = [], None
+    while True:
+        rows, cursor = paginate_query(col, 3, cursor, order_field="createdAt", descending=True)
+        pages.append([row["id"] for row in rows])
+        if cursor is None:
+            break
+    assert sum(pages, []) == ["r6", "r5", "r4", "r3", "r2", "r1", "r0"]
+
+    # Unordered path: mixed and missing values sort in Firestore's type order
+    col.document("r7").set({"id": "r7", "createdAt": 1700000000000})
+    col.document("r8").set({"id": "r8", "createdAt": "yesterday"})
+    col.document("r9").set({"id": "r9"})
+    rows, _ = paginate_query(col, None, order_field="createdAt")
+    assert [row["id"] for row in rows] == ["r9", "r7", "r0", "r1", "r2", "r3", "r4", "r5", "r6", "r8"]
+
+
+# =========================
+# BATCHES AND TRANSACTIONS
+# =========================
+def test_batch_is_all_or_nothing(client):
+    batch = client.batch()
+    batch.set(client.collection("ProjectMessages").document("m1"), {"text": "hi"})
+    batch.update(client.collection("ProjectRequests").document("missing"), {"messageCount": firestore.Increment(1)})
+    with pytest.raises(NotFound):
+        batch.commit()
+    assert not client.collection("ProjectMessages").document("m1").get().exists
+
+
+def test_transactions_serialize_read_modify_write(client):
+    ref = client.collection("balances").document("creator")
+    ref.set({"amount": 0})
+
+    @firestore.transactional
+    def deposit(transaction):
+        snapshot = ref.get(transaction=transaction)
+        transaction.update(ref, {"amount": snapshot.get("amount") + 1})
+
+    def worker():
+        for _ in range(10):
+            deposit(client.transaction())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert ref.get().to_dict()["amount"] == 80
+
+
+def test_transaction_rolls_back_on_error(client):
+    ref = client.collection("balances").document("creator")
+    ref.set({"amount": 5})
+
+    @firestore.transactional
+    def fail_midway(transaction):
+        transaction.update(ref, {"amount": 0})
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        fail_midway(client.transaction())
+    assert ref.get().to_dict()["amount"] == 5
+    # The store is usable again afterwards
+    ref.update({"amount": 6})
+    assert ref.get().to_dict()["amount"] == 6
+
+
+def test_transaction_reads_queries_and_get_all(client):
+    col = client.collection("reviews")
+    col.document("a").set({"creatorId": "c", "rating": 4})
+    col.document("b").set({"creatorId": "c", "rating": 2})
+
+    @firestore.transactional
+    def summarize(transaction):
+        ratings = [doc.get("rating") for doc in transaction.get(col.where("creatorId", "==", "c"))]
+        docs = list(transaction.get_all([col.document("a"), col.document("zz")]))
+        transaction.set(client.collection("creators").document("c"), {"rating": sum(ratings) / len(ratings)})
+        return [doc.exists for doc in docs]
+
+    assert summarize(client.transaction()) == [True, False]
+    assert client.collection("creators").document("c").get().to_dict() == {"rating": 3.0}
+
+
+# =========================
+# LISTENERS AND PERSISTENCE
+# =========================
+def test_on_snapshot_reports_changes(client):
+    col = client.collection("creators")
+    col.document("a").set({"profile_live": True})
+    events = []
+    received = threading.Condition()
+
+    def on_snapshot(docs, changes, read_time):
+        with received:
+            events.append([(change.type.name, change.document.id) for change in changes])
+            received.notify_all()
+
+    def wait_for(count):
+        with received:
+            assert received.wait_for(lambda: len(events) >= count, timeout=5)
+
+    watch = col.where("profile_live", "==", True).on_snapshot(on_snapshot)
+    wait_for(1)
+    col.document("b").set({"profile_live": True})
+    wait_for(2)
+    col.document("a").update({"profile_live": False})
+    wait_for(3)
+    watch.unsubscribe()
+
+    assert events == [[("ADDED", "a")], [("ADDED", "b")], [("REMOVED", "a")]]
+
+
+def test_sqlite_store_survives_reopen(tmp_path):
+    path = str(tmp_path / "local.db")
+    first = connect("sqlite", path)
+    first.collection("creators").document("a").set({"joined": datetime(2024, 5, 1), "tags": ["x"]})
+    first.close()
+
+    second = connect("sqlite", path)
+    try:
+        data = second.collection("creators").document("a").get().to_dict()
+        assert data == {"joined": datetime(2024, 5, 1), "tags": ["x"]}
+        assert _ids(second.collection("creators").where("tags", "array_contains", "x").stream()) == ["a"]
+    finally:
+        second.close()
+
+
+def test_sqlite_transactions_across_clients(tmp_path):
+    """Two API workers sharing one database file"""
+    path = str(tmp_path / "local.db")
+    workers = [connect("sqlite", path), connect("sqlite", path)]
+    workers[0].collection("balances").document("creator").set({"amount": 0})
+
+    def deposit_loop(local):
+        ref = local.collection("balances").document("creator")
+
+        @firestore.transactional
+        def deposit(transaction):
+            snapshot = ref.get(transaction=transaction)
+            transaction.update(ref, {"amount": snapshot.get("amount") + 1})
+
+        for _ in range(20):
+            deposit(local.transaction())
+
+    threads = [threading.Thread(target=deposit_loop, args=(local,)) for local in workers for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert workers[1].collection("balances").document("creator").get().to_dict()["amount"] == 80
+    finally:
+        for local in workers:
+            local.close()
@@ -13,7 +13,7 @@ import Link from 'next/link';
 import { useRouter, useParams } from 'next/navigation';
 import { Header } from '@/components/layout/Header';
 import { verifySession } from '@/services/clientAuth';
-import { getRequest, counterOffer, acceptOffer, sendNegotiationMessage, getNegotiationMessages } from '@/services/creatorProfile';
+import { getRequest, counterOffer, acceptOffer, sendNegotiationMessage, getNegotiationMessages, subscribeToNegotiation } from '@/services/creatorProfile';
 import { cn } from '@vision-match/utils-js';
 import { toast } from 'react-hot-toast';
 import { palette, themeClasses } from '@/utils/theme';
@@ -180,28 +180,30 @@ export default function ChatPage() {
     if (clientId && requestId) {
       fetchRequestDetails();
       
-      // Poll for new messages every 3 seconds
-      const interval = setInterval(async () => {
-        try {
+      const toMessage = (m: any): Message => ({
+        id: m.id,
+        sender: m.sender,
+        type: m.type || 'text',
+        text: m.message,
+        price: m.price,
+        deliverables: m.deliverables,
+        timestamp: new Date(m.timestamp),
+        status: m.status || 'sent',
+      });
+
+      // New messages are pushed over the negotiation channel
+      return subscribeToNegotiation(
+        requestId,
+        (m: any) => {
+          setMessages((prev) => (prev.some((p) => p.id === m.id) ? prev : [...prev, toMessage(m)]));
+        },
+        async () => {
           const messagesData = await getNegotiationMessages(requestId);
           if (messagesData?.length) {
-            setMessages(messagesData.map((m: any) => ({
-              id: m.id,
-              sender: m.sender,
-              type: m.type || 'text',
-              text: m.message,
-              price: m.price,
-              deliverables: m.deliverables,
-              timestamp: new Date(m.timestamp),
-              status: m.status || 'sent',
-            })));
+            setMessages(messagesData.map(toMessage));
           }
-        } catch (err) {
-          console.error('Error polling messages:', err);
         }
-      }, 3000);
-      
-      return () => clearInterval(interval);
+      );
     }
   }, [clientId, requestId, fetchRequestDetails]);
 
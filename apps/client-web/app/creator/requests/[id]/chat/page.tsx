@@ -15,7 +15,7 @@ import {
 } from 'lucide-react';
 import { useRouter, useParams } from 'next/navigation';
 import { verifySession } from '@/services/clientAuth';
-import { getRequest } from '@/services/creatorProfile';
+import { getRequest, subscribeToNegotiation } from '@/services/creatorProfile';
 import axiosInstance from '@/utils/axiosInstance';
 import { Header } from '@/components/layout/Header';
 import { cn } from '@vision-match/utils-js';
@@ -87,7 +87,7 @@ export default function CreatorChatPage() {
         setRequest(requestData);
         
         // Fetch messages - correct response path is .messages
-        const messagesRes = await axiosInstance.get(`/projects/${requestId}/messages`);
+        const messagesRes = await axiosInstance.get(`/api/projects/${requestId}/messages`);
         setMessages(messagesRes.data?.messages || []);
       } catch (err: unknown) {
         console.error('Error:', err);
@@ -98,17 +98,21 @@ export default function CreatorChatPage() {
     };
     fetchData();
     
-    // Poll for new messages every 3 seconds
-    const interval = setInterval(async () => {
-      try {
-        const messagesRes = await axiosInstance.get(`/projects/${requestId}/messages`);
-        setMessages(messagesRes.data?.messages || []);
-      } catch (err: unknown) {
-        console.error('Error polling messages:', err);
+    // New messages are pushed over the negotiation channel
+    return subscribeToNegotiation(
+      requestId,
+      (message: Message) => {
+        setMessages((prev) => (prev.some((m) => m.id === message.id) ? prev : [...prev, message]));
+      },
+      async () => {
+        try {
+          const messagesRes = await axiosInstance.get(`/api/projects/${requestId}/messages`);
+          setMessages(messagesRes.data?.messages || []);
+        } catch (err: unknown) {
+          console.error('Error reloading messages:', err);
+        }
       }
-    }, 3000);
-    
-    return () => clearInterval(interval);
+    );
   }, [requestId, router]);
 
   // Send Message
@@ -117,7 +121,7 @@ export default function CreatorChatPage() {
     
     setSending(true);
     try {
-      await axiosInstance.post(`/projects/${requestId}/messages`, {
+      await axiosInstance.post(`/api/projects/${requestId}/messages`, {
         sender: 'creator',
         senderId: userId,
         message: messageInput,
@@ -127,7 +131,7 @@ export default function CreatorChatPage() {
       setMessageInput('');
       
       // Refresh messages - correct response path is .messages
-      const messagesRes = await axiosInstance.get(`/projects/${requestId}/messages`);
+      const messagesRes = await axiosInstance.get(`/api/projects/${requestId}/messages`);
       setMessages(messagesRes.data?.messages || []);
     } catch (err: unknown) {
       console.error('Failed to send message:', err);
@@ -142,7 +146,7 @@ export default function CreatorChatPage() {
     
     setSending(true);
     try {
-      await axiosInstance.post(`/projects/${requestId}/messages`, {
+      await axiosInstance.post(`/api/projects/${requestId}/messages`, {
         sender: 'creator',
         senderId: userId,
         message: `I'd like to propose the following offer:`,
@@ -156,7 +160,7 @@ export default function CreatorChatPage() {
       setShowOfferForm(false);
       
       // Refresh messages - correct response path is .messages
-      const messagesRes = await axiosInstance.get(`/projects/${requestId}/messages`);
+      const messagesRes = await axiosInstance.get(`/api/projects/${requestId}/messages`);
       setMessages(messagesRes.data?.messages || []);
     } catch (err: unknown) {
       console.error('Failed to send offer:', err);
@@ -170,7 +174,7 @@ export default function CreatorChatPage() {
     try {
       setSending(true);
       // Send an "accepted" type message
-      await axiosInstance.post(`/projects/${requestId}/messages`, {
+      await axiosInstance.post(`/api/projects/${requestId}/messages`, {
         sender: 'creator',
         senderId: userId,
         message: 'Offer accepted! We have a deal.',
@@ -182,7 +186,7 @@ export default function CreatorChatPage() {
       // Refresh request and messages
       const requestData = await getRequest(requestId);
       setRequest(requestData);
-      const messagesRes = await axiosInstance.get(`/projects/${requestId}/messages`);
+      const messagesRes = await axiosInstance.get(`/api/projects/${requestId}/messages`);
       setMessages(messagesRes.data?.messages || []);
     } catch (err: unknown) {
       console.error('Failed to accept offer:', err);
@@ -232,6 +232,61 @@ export const getNegotiationMessages = async (requestId: string) => {
   }
 };
 
+/**
+ * Subscribe to new negotiation messages (pushed, no polling).
+ * Uses the WebSocket channel and falls back to Server-Sent Events when
+ * WebSockets can't connect. `onReconnect` fires after a dropped socket
+ * comes back so the caller can reload anything it missed.
+ * Returns an unsubscribe function.
+ */
+export const subscribeToNegotiation = (
+  requestId: string,
+  onMessage: (message: any) => void,
+  onReconnect?: () => void
+) => {
+  const baseUrl = axiosInstance.defaults.baseURL || 'http://localhost:8000';
+  let closed = false;
+  let socket: WebSocket | null = null;
+  let events: EventSource | null = null;
+  let retry: ReturnType<typeof setTimeout> | null = null;
+
+  const openEvents = () => {
+    if (closed || typeof EventSource === 'undefined') return;
+    events = new EventSource(`${baseUrl}/api/projects/${requestId}/events`, { withCredentials: true });
+    events.addEventListener('message', (event) => onMessage(JSON.parse((event as MessageEvent).data)));
+  };
+
+  const openSocket = (reconnecting = false) => {
+    if (closed) return;
+    let opened = false;
+    socket = new WebSocket(`${baseUrl.replace(/^http/, 'ws')}/api/projects/${requestId}/ws`);
+    socket.onopen = () => {
+      opened = true;
+      if (reconnecting) onReconnect?.();
+    };
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.type === 'message') onMessage(data.message);
+    };
+    socket.onclose = () => {
+      if (closed) return;
+      // Never connected: WebSockets are blocked on this network, use SSE instead
+      if (!opened && !reconnecting) openEvents();
+      else retry = setTimeout(() => openSocket(true), 3000);
+    };
+  };
+
+  if (typeof WebSocket !== 'undefined') openSocket();
+  else openEvents();
+
+  return () => {
+    closed = true;
+    if (retry) clearTimeout(retry);
+    socket?.close();
+    events?.close();
+  };
+};
+
 /**
  * Accept negotiation offer
  */
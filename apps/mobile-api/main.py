@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers import user_router
 from config import settings
+from utils_py.metrics import install_metrics
 
 app = FastAPI(title="Mobile API")
 
@@ -14,6 +15,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, status codes, in-flight requests and loop lag at /metrics
+install_metrics(app)
+
 # Include routers
 app.include_router(user_router.router)
 
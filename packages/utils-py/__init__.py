@@ -1,4 +1,4 @@
-from .formatters import format_date, format_currency, truncate_text
+from .formatter import format_date, format_currency, truncate_text
 from .validators import is_valid_email, is_strong_password
 
 __all__ = [
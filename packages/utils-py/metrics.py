@@ -0,0 +1,200 @@
+# packages/utils-py/metrics.py
+# Prometheus metrics shared by client-api, admin-api and mobile-api:
+#     from utils_py.metrics import install_metrics
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+# Seconds; le="+Inf" is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+LOOP_LAG_INTERVAL = 0.5
+
+# Requests that match no route share one label, so random paths can't grow the series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # labels -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple, List[float]] = {}
+
+    def observe(self, labels: Tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {count}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, inf)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set(self, labels: Tuple, value: float):
+        self._values[labels] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class Metrics:
+    """
+    In-process Prometheus metrics for one API worker.
+
+    Every HTTP request is labelled with its route template (/api/x/{id},
+    not the raw path), so the series stay bounded. All updates happen on
+    the event loop thread, so no locking is needed. With several uvicorn
+    workers each one keeps its own numbers; Prometheus scrapes them
+    individually and aggregates.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.request_latency = Histogram(
+            "http_request_duration_seconds", "Request latency by route", ("method", "route"), LATENCY_BUCKETS
+        )
+        self.requests = Counter("http_requests_total", "Requests by route and status code", ("method", "route", "status"))
+        self.in_flight = Gauge("http_requests_in_flight", "Requests currently being handled", ("method",))
+        self.loop_lag = Histogram("event_loop_lag_seconds", "Event loop scheduling delay", (), LOOP_LAG_BUCKETS)
+        self.loop_lag_max = Gauge("event_loop_lag_max_seconds", "Largest event loop delay since start")
+        self._lag_task: Optional[asyncio.Task] = None
+        self._max_lag = 0.0
+        self._collectors: List = []
+
+    def register(self, *collectors):
+        """Add series kept elsewhere (anything with render() -> lines) to /metrics"""
+        self._collectors.extend(collectors)
+
+    def start_loop_monitor(self):
+        if self._lag_task is None:
+            self._lag_task = asyncio.get_running_loop().create_task(self._watch_loop())
+
+    async def _watch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            lag = max(0.0, loop.time() - expected)
+            self.loop_lag.observe((), lag)
+            if lag > self._max_lag:
+                self._max_lag = lag
+                self.loop_lag_max.set((), lag)
+
+    def render(self) -> str:
+        lines = []
+        for metric in (self.request_latency, self.requests, self.in_flight, self.loop_lag, self.loop_lag_max):
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector.render())
+        lines.extend([
+            "# HELP process_uptime_seconds Seconds since this worker started",
+            "# TYPE process_uptime_seconds gauge",
+            f"process_uptime_seconds{_labels(('pid',), (os.getpid(),))} {time.time() - self.started_at:.3f}",
+        ])
+        return "\n".join(lines) + "\n"
+
+
+def route_template(scope) -> str:
+    """
+    Route template for a handled request, e.g. /api/creators/{creator_id}.
+    Routing leaves the matched route in the ASGI scope, so this doesn't
+    depend on the path parameter values or on how the routers are nested.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware overhead) recording each HTTP request"""
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.metrics.start_loop_monitor()
+        method = scope["method"]
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        self.metrics.in_flight.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Routing has put the matched route on the shared scope by now
+            labels = (method, route_template(scope))
+            self.metrics.request_latency.observe(labels, time.perf_counter() - started)
+            self.metrics.requests.inc(labels + (status[0],))
+            self.metrics.in_flight.inc((method,), -1)
+
+
+metrics = Metrics()
+
+
+def install_metrics(app: FastAPI):
+    """Record every request and serve the numbers at GET /metrics"""
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    # async so rendering runs on the loop thread, never mid-update
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")